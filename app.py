@@ -1,104 +1,279 @@
-import json
-from google.cloud import secretmanager
-from flask import Flask, request, jsonify, render_template, url_for, session, redirect
+from flask import Flask, Response, request, jsonify, render_template, url_for, session, redirect, stream_with_context
 from authlib.integrations.flask_client import OAuth
-import os
+import threading
 from dotenv import load_dotenv
-from functions import validate_user, save_application_data, get_master_data, delete_application, get_modules, get_dimension, search_hcm_id, insert_enroll_administrator_function, delete_administrator, retrieve_administrator_details_to_gridview, load_administrators, log_api_activity
-import sys
-import traceback
+from auth import invalidate_admin, issue_claim, read_claim
+from grid import MAX_LIMIT, query_admins, query_apps, select_admins, select_apps
+from fanout import fetch_concurrently
+from secrets_provider import SecretUnavailable, secret_store
+import assets
+import bulk_import
+import cache
+import compression
+import export
+import metrics
+import session_store
+import templating
+import timing
+from etags import conditional, page_etag
+from templating import stream_page
+from logs import get_logger
+from functions import validate_user, administrators_grid, admin_enrolled, save_application_data, get_master_data, master_data_version, expand_app_rows, get_app, prefetch_app_details, delete_application, delete_applications, get_modules, get_dimension, search_hcm_id, insert_enroll_administrator_function, delete_administrator, delete_administrators, BATCH_DELETE_MAX, get_administrators, administrators_version, administrators_index, search_employees, import_administrators, log_export
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'
 
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
+metrics.init_app(app)
+timing.init_app(app)
+session_store.init_app(app)
+assets.init_app(app)
+compression.init_app(app)
+cache.init_app(app)
+templating.init_app(app)
 
-def get_oauth_config_from_secret(project_id: str, secret_id: str) -> dict:
-    secret_client = secretmanager.SecretManagerServiceClient()
-    secret_name = f"projects/{project_id}/secrets/{secret_id}/versions/latest"
 
-    response = secret_client.access_secret_version(
-        request={"name": secret_name})
-    secret_payload = response.payload.data.decode("UTF-8")
+oauth = OAuth(app)
+_google_lock = threading.Lock()
+
+
+def get_google():
+    # The OAuth client is registered on first login rather than at import, so a slow or
+    # failing Secret Manager never blocks the worker from booting. A rotated client
+    # secret is applied to the registered client in place.
+    oauth_secrets = secret_store.get_json("google-oauth")
+    client_id = oauth_secrets["GOOGLE_CLIENT_ID"]
+    client_secret = oauth_secrets["GOOGLE_CLIENT_SECRET"]
+
+    with _google_lock:
+        google = oauth.create_client('google')
+        if google is None:
+            redirect_uri = oauth_secrets["GOOGLE_REDIRECT_URI"]
+            logger.info("Registering Google OAuth client", extra={
+                "client_id": client_id, "redirect_uri": redirect_uri})
+            google = oauth.register(
+                name='google',
+                client_id=client_id,
+                client_secret=client_secret,
+                server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+                client_kwargs={
+                    'scope': 'openid email profile'
+                },
+                redirect_uri=redirect_uri,
+            )
+        elif google.client_id != client_id or google.client_secret != client_secret:
+            google.client_id = client_id
+            google.client_secret = client_secret
+    return google
+
+
+secret_store.prefetch("google-oauth")
+
+
+# Endpoints reachable without a validated administrator claim
+PUBLIC_ENDPOINTS = {'login', 'callback', 'logout', 'static', 'assets', 'metrics'}
+
+
+def deny_access(error, status_code):
+    if request.method != 'GET' or request.is_json or request.path.startswith('/api/'):
+        return jsonify({"status": "error", "message": error}), status_code
+    return render_template('noaccess.html', error=error), status_code
+
+
+@app.before_request
+@timing.timed("auth")
+def require_administrator():
+    if request.endpoint is None or request.endpoint in PUBLIC_ENDPOINTS:
+        return None
+
+    user = session.get('user')
+    if not user:
+        if request.endpoint == 'home':
+            return render_template('index.html')
+        return deny_access("Please sign in first.", 401)
+
+    user_email = user.get('email') if isinstance(user, dict) else None
+    grid, grid_version = administrators_grid()
+    claim = read_claim(session.get('admin_claim'), user_email)
+    if claim:
+        admin_details = {'hcm_id': claim['hcm_id'],
+                         'role_type': claim['role_type']}
+        # Once the cached grid has changed since the claim was issued (the administrator
+        # may have been removed in another worker or instance), it must still list them.
+        # With no grid cached the claim stands until it expires.
+        if grid_version is None or claim.get('grid') == grid_version or admin_enrolled(grid, admin_details):
+            if session.get('admin_details') != admin_details:
+                session['admin_details'] = admin_details
+            return None
+        logger.info("Administrator claim no longer matches the administrators grid",
+                    extra={"email": user_email})
+        invalidate_admin(user_email)
+        session.pop('admin_claim', None)
+
+    if validate_user(user):
+        session['admin_claim'] = issue_claim(
+            user_email, session['admin_details'], grid_version)
+        return None
+
+    session.pop('admin_claim', None)
+    return deny_access("User validation failed.", 403)
+
+
+def _args_key():
+    return sorted(request.args.items(multi=True))
 
-    # Parse the JSON string into a dictionary
-    oauth_config = json.loads(secret_payload)
-    return oauth_config
 
+@app.route('/')
+def home():
+    try:
+        user_details = get_user_details()
+        master_data = get_master_data()
+
+        def render():
+            # Only the first page is rendered; the grid pages through /api/apps
+            grid = query_apps(master_data or [], request.args)
+            return stream_page(
+                'home.html',
+                picture=user_details['picture'],
+                user=user_details['user'],
+                full_name=user_details['full_name'],
+                role_type=user_details['role_type'],
+                status='True',
+                master_data=grid['items'],
+                grid=grid)
+
+        if master_data is None:
+            return render()
+        return conditional(page_etag("home", master_data_version(master_data), user_details,
+                                     _args_key()), render)
+    except Exception as e:
+        logger.exception("Error in home route")
+        return render_template('noaccess.html', error=str(e))
 
-oauth_secrets = get_oauth_config_from_secret(
-    os.getenv('EP_PROJECT_ID'), "google-oauth")
 
-client_id = oauth_secrets["GOOGLE_CLIENT_ID"]
-client_secret = oauth_secrets["GOOGLE_CLIENT_SECRET"]
-redirect_uri = oauth_secrets["GOOGLE_REDIRECT_URI"]
+@app.route('/api/apps', methods=['GET'])
+def api_apps():
+    try:
+        master_data = get_master_data()
+        role_type = get_user_details()['role_type']
 
-print(f"Client ID: {client_id}")
-print(f"Client Secret: {client_secret}")
-print(f"Redirect URI: {redirect_uri}")
+        def render():
+            grid = query_apps(master_data or [], request.args)
 
-oauth = OAuth(app)
-google = oauth.register(
-    name='google',
-    client_id=client_id,
-    client_secret=client_secret,
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    client_kwargs={
-        'scope': 'openid email profile'
-    },
-    redirect_uri=redirect_uri,
-)
+            if request.args.get('format') == 'html':
+                grid['html'] = render_template(
+                    '_app_rows.html',
+                    master_data=grid['items'],
+                    role_type=role_type)
 
+            return jsonify(grid), 200
 
-@app.route('/')
-def home():
+        if master_data is None:
+            return render()
+        return conditional(page_etag("api_apps", master_data_version(master_data), role_type,
+                                     _args_key()), render)
+
+    except Exception:
+        logger.exception("Error in api_apps")
+        return jsonify({"status": "error", "message": "Failed to load applications"}), 500
+
+
+def export_response(name, columns, rows, sheet_name):
+    # Streamed CSV (default) or XLSX download of `rows`; ?format=xlsx picks the latter.
+    file_format = request.args.get('format', 'csv')
+    if file_format not in export.FORMATS:
+        return jsonify({"status": "error", "message": "format must be csv or xlsx"}), 400
+
+    response = Response(stream_with_context(export.stream(file_format, columns, rows, sheet_name)),
+                        content_type=export.FORMATS[file_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="{export.filename(name, file_format)}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+# Export of the applications grid (same q/status/sort as /api/apps, every page). With
+# expand=1 each app's modules and dimensions are added, fetched while the file streams.
+@app.route('/api/apps/export', methods=['GET'])
+def api_apps_export():
     try:
-        if 'user' in session and session['user']:
-            if validate_user(session['user']):
-                user_details = get_user_details()
-                return render_template(
-                    'home.html',
-                    picture=user_details['picture'],
-                    user=user_details['user'],
-                    full_name=user_details['full_name'],
-                    role_type=user_details['role_type'],
-                    status='True',
-                    master_data=get_master_data())
-            else:
-                return render_template('noaccess.html', error="User validation failed.")
-        else:
-            return render_template('index.html')
-    except Exception as e:
-        print(f"Error in home route: {e}")
-        return render_template('noaccess.html', error=str(e))
+        master_data = get_master_data()
+        if master_data is None:
+            return jsonify({"status": "error", "message": "Failed to load applications"}), 503
+
+        rows = select_apps(master_data, request.args)
+        columns = export.APP_COLUMNS
+        if request.args.get('expand') == '1':
+            rows = expand_app_rows(rows)
+            columns = columns + export.APP_DETAIL_COLUMNS
+
+        log_export("User Control Center - Export Applications", session.get('user'))
+        return export_response("applications", columns, rows, "Applications")
+
+    except Exception:
+        logger.exception("Error in api_apps_export")
+        return jsonify({"status": "error", "message": "Failed to export applications"}), 500
+
+
+@app.route('/api/apps/prefetch', methods=['POST'])
+def api_apps_prefetch():
+    try:
+        data = request.get_json(silent=True) or {}
+        app_ids = data.get('app_ids')
+        if not isinstance(app_ids, list):
+            return jsonify({"status": "error", "message": "app_ids must be a list"}), 400
+
+        app_ids = [str(app_id).strip() for app_id in app_ids if str(app_id).strip()][:MAX_LIMIT]
+        return jsonify(prefetch_app_details(app_ids)), 200
+
+    except Exception:
+        logger.exception("Error in api_apps_prefetch")
+        return jsonify({"status": "error", "message": "Failed to prefetch application details"}), 500
 
 
 @app.route('/manage_users')
 def manage_users():
     user_details = get_user_details()
-    return_processed = load_administrators()
-    return render_template('users.html', headers=return_processed['headers'], data=return_processed['rows'], user=user_details['user'], full_name=user_details['full_name'],
+    return_processed = get_administrators()
+
+    def render():
+        return stream_page('users.html', headers=return_processed['headers'], data=return_processed['rows'], user=user_details['user'], full_name=user_details['full_name'],
                            role_type=user_details['role_type'], picture=user_details['picture'],
                            status='True')
 
+    return conditional(page_etag("manage_users", administrators_version(return_processed),
+                                 user_details), render)
+
 
 @app.route('/login')
 def login():
+    try:
+        google = get_google()
+    except SecretUnavailable as e:
+        logger.error("Login unavailable", extra={"error": str(e)})
+        return render_template('noaccess.html', error="Sign-in is temporarily unavailable. Please try again shortly."), 503
     redirect_uri = url_for('callback', _external=True)
     return google.authorize_redirect(redirect_uri)
 
 
 @app.route('/callback')
 def callback():
+    google = get_google()
     token = google.authorize_access_token()
     user_info = google.get(
         'https://openidconnect.googleapis.com/v1/userinfo').json()
+    # Nothing from before sign-in is kept, and the session gets a new id.
+    session.clear()
+    session_store.regenerate(session)
     session['user'] = user_info
-    print(user_info)
+    logger.info("User signed in")
+    logger.debug("Google user info", extra={"user_info": user_info})
     return redirect('/')
 
 
@@ -108,83 +283,70 @@ def logout():
     return redirect('/')
 
 
+# Old entry points kept for open tabs and bookmarks; they only point at the GET routes below.
 @app.route('/modify_app', methods=['POST'])
 def modify_app():
-    try:
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"error": "No JSON data received"}), 400
-
-        required_keys = ['app_id', 'app_name',
-                         'app_url', 'status', 'app_owner']
-        missing_keys = [key for key in required_keys if key not in data]
-
-        if missing_keys:
-            return jsonify({"error": f"Missing required fields: {', '.join(missing_keys)}"}), 400
-
-        if not isinstance(data.get('app_id'), str) or not data.get('app_id').strip():
-            return jsonify({"error": "Invalid app ID"}), 400
-
-        session['app_id_to_modify'] = data['app_id']
-        session['app_name'] = data['app_name']
-        session['app_url'] = data['app_url']
-        session['app_status'] = data['status']
-        session['owner'] = data['app_owner']
-        session['perm_read'] = data['perm_read']
-        session['perm_write'] = data['perm_write']
-        session['perm_update'] = data['perm_update']
-        session['perm_delete'] = data['perm_delete']
-
-        print(f"App modification data stored in session for: {data['app_id']}")
-
-        return jsonify({"redirect": url_for('modify_app_form')}), 200
-
-    except Exception as e:
-        print(f"Exception in modify_app: {e}")
-        return jsonify({"error": "Internal server error"}), 500
+    data = request.get_json(silent=True) or {}
+    app_id = str(data.get('app_id') or '').strip()
+    if not app_id:
+        return jsonify({"error": "Invalid app ID"}), 400
+    return jsonify({"redirect": url_for('edit_app', app_id=app_id)}), 200
 
 
 @app.route('/modify_app_form', methods=['GET'])
 def modify_app_form():
+    app_id = session.get('app_id_to_modify')
+    if not app_id:
+        return redirect('/')
+    return redirect(url_for('edit_app', app_id=app_id))
+
+
+@app.route('/apps/<app_id>/edit', methods=['GET'])
+def edit_app(app_id):
     try:
         user_details = get_user_details()
 
-        app_id = session.get('app_id_to_modify')
-        app_name = session.get('app_name', 'Unnamed App')
-        app_url = session.get('app_url', '')
-        app_status = session.get('app_status', 'Unknown')
-        app_owner = session.get('owner', 'Not Assigned')
-        perm_read = session.get('perm_read')
-        perm_write = session.get('perm_write')
-        perm_update = session.get('perm_update')
-        perm_delete = session.get('perm_delete')
-
-        if not app_id:
-            print(
-                "Warning: No app ID found in session. Redirecting or showing error may be appropriate.")
-
-        return render_template(
-            'modify_app.html',
-            user=user_details.get("user", {}),
-            app_id=app_id,
-            app_name=app_name,
-            app_url=app_url,
-            app_status=app_status,
-            app_owner=app_owner,
-            full_name=user_details.get("full_name", "Unknown User"),
-            role_type=user_details.get("role_type", "guest"),
-            picture=user_details.get("picture", "/static/default-avatar.png"),
-            perm_read=perm_read,
-            perm_write=perm_write,
-            perm_update=perm_update,
-            perm_delete=perm_delete,
-            dimensions=get_dimension(app_id),
-            modules=get_modules(app_id)
-        )
-
-    except Exception as e:
-        print(f"Error rendering modify_app_form: {e}")
+        details, missing = fetch_concurrently(
+            {"app": (get_app, app_id),
+             "dimensions": (get_dimension, app_id),
+             "modules": (get_modules, app_id)},
+            defaults={"app": None, "dimensions": [], "modules": []})
+
+        app_row = details["app"]
+        if app_row is None:
+            if "app" in missing:
+                return render_template('noaccess.html', error="Could not load the application. Please try again."), 503
+            return render_template('noaccess.html', error="Application not found."), 404
+
+        def render():
+            return render_template(
+                'modify_app.html',
+                user=user_details.get("user", {}),
+                app_id=app_id,
+                app_name=app_row.get('app_name', 'Unnamed App'),
+                app_url=app_row.get('app_url', ''),
+                app_status=str(app_row.get('status')),
+                app_owner=app_row.get('app_owner', 'Not Assigned'),
+                full_name=user_details.get("full_name", "Unknown User"),
+                role_type=user_details.get("role_type", "guest"),
+                picture=user_details.get("picture", "/static/default-avatar.png"),
+                perm_read=app_row.get('can_read'),
+                perm_write=app_row.get('can_write'),
+                perm_update=app_row.get('can_update'),
+                perm_delete=app_row.get('can_delete'),
+                dimensions=details["dimensions"],
+                modules=details["modules"],
+                missing=[name for name in missing if name != "app"]
+            )
+
+        # Pages with a detail that failed to load are never marked cacheable
+        if missing:
+            return render()
+        return conditional(page_etag("edit_app", app_row, details["dimensions"],
+                                     details["modules"], user_details), render)
+
+    except Exception:
+        logger.exception("Error rendering edit_app")
         return render_template('noaccess.html', error="Something went wrong loading the form.")
 
 
@@ -194,11 +356,11 @@ def get_user_details():
         user = session.get('user')
 
         if not isinstance(user, dict):
-            print("Invalid or missing 'user' in session.")
+            logger.debug("Invalid or missing 'user' in session")
             user = {}
 
         if not isinstance(admin_details, dict):
-            print("Invalid or missing 'admin_details' in session.")
+            logger.debug("Invalid or missing 'admin_details' in session")
             admin_details = {}
 
         return {
@@ -208,8 +370,8 @@ def get_user_details():
             "role_type": admin_details.get("role_type", 'guest')
         }
 
-    except Exception as e:
-        print(f"Exception in get_user_details: {e}")
+    except Exception:
+        logger.exception("Exception in get_user_details")
         return {
             "user": {},
             "full_name": "Unknown User",
@@ -230,6 +392,7 @@ def submit_app_data():
 
         save_application_data(
             function_mode=data.get('function_mode'),
+            app_id=data.get('app_id'),
             application_name=data.get('application_name'),
             app_url=data.get('application_link'),
             status=data.get('status'),
@@ -243,7 +406,7 @@ def submit_app_data():
         return jsonify({"message": "Success"}), 200
 
     except Exception as e:
-        print(f"Error in submit_app_data: {e}")
+        logger.exception("Error in submit_app_data")
         return jsonify({"error": str(e)}), 500
 
 
@@ -256,7 +419,7 @@ def delete_app():
             return jsonify({"error": "No parameter provided"}), 400
 
         app_id = data.get('app_id')
-        print(f"Selected App ID: {app_id}")
+        logger.debug("Deleting application", extra={"app_id": app_id})
 
         result = delete_application(app_id)
 
@@ -266,68 +429,110 @@ def delete_app():
         return jsonify({"message": "Deletion Success"}), 200
 
     except Exception as e:
-        print(f"Error in application deletion: {e}")
+        logger.exception("Error in application deletion")
         return jsonify({"error": str(e)}), 500
 
 
+def batch_ids(data, key):
+    # The non-empty list of ids under `key` (at most BATCH_DELETE_MAX), or None.
+    ids = data.get(key)
+    if not isinstance(ids, list) or not ids or len(ids) > BATCH_DELETE_MAX:
+        return None
+    if any(isinstance(i, bool) or not isinstance(i, (str, int)) or not str(i).strip() for i in ids):
+        return None
+    return ids
+
+
+# Batch delete (Super Administrators only), {"app_ids": [...]}. Answers 200 with a result per id when at least one
+# was deleted (or may have been) and 409 when none was.
+@app.route('/api/applications/delete', methods=['POST'])
+def api_delete_applications():
+    try:
+        if get_user_details()['role_type'] != 'Super Administrator':
+            return jsonify({"status": "error", "message": "Only a Super Administrator can delete in bulk"}), 403
+
+        data = request.get_json(silent=True) or {}
+        app_ids = batch_ids(data, 'app_ids')
+        if app_ids is None:
+            return jsonify({"status": "error",
+                            "message": f"app_ids must be a list of 1 to {BATCH_DELETE_MAX} ids"}), 400
+
+        result = delete_applications(app_ids)
+        return jsonify(result), 409 if result["status"] == "error" else 200
+
+    except Exception:
+        logger.exception("Error in api_delete_applications")
+        return jsonify({"status": "error", "message": "Failed to delete applications"}), 500
+
+
 @app.route('/app_modules', methods=['POST'])
 def app_modules():
-    data = request.get_json()
-    app_id = data.get('app_id', '').strip() if data else ''
-    app_name = data.get('app_name', '').strip() if data else ''
-
+    data = request.get_json(silent=True) or {}
+    app_id = str(data.get('app_id') or '').strip()
     if not app_id:
         return jsonify({"error": "Invalid or missing app_id"}), 400
-
-    session['app_owner_id'] = app_id
-    session['app_name'] = app_name
-    print(f"App ID stored in session: {app_id}")
-    return jsonify({"redirect": url_for('get_modules_form')}), 200
+    return jsonify({"redirect": url_for('app_modules_page', app_id=app_id)}), 200
 
 
 @app.route('/get_modules_form', methods=['GET'])
 def get_modules_form():
     app_id = session.get('app_owner_id')
-    app_name = session.get('app_name')
     if not app_id:
         return render_template('noaccess.html', error="App ID not found in session.")
+    return redirect(url_for('app_modules_page', app_id=app_id))
+
 
-    modules = get_modules(app_id)
-    print(modules)
+@app.route('/apps/<app_id>/modules', methods=['GET'])
+def app_modules_page(app_id):
+    details, missing = fetch_concurrently(
+        {"app": (get_app, app_id), "modules": (get_modules, app_id)},
+        defaults={"app": None, "modules": []})
+    app_row = details["app"] or {}
+    logger.debug("Modules loaded", extra={"app_id": app_id, "modules": details["modules"]})
 
     user_details = get_user_details()
 
-    return render_template('modules.html', app_id=app_id, app_name=app_name, modules=modules, error="Failed to load modules.", user=user_details)
+    def render():
+        return render_template('modules.html', app_id=app_id, app_name=app_row.get('app_name', ''), modules=details["modules"], error="Failed to load modules.", user=user_details)
+
+    if missing:
+        return render()
+    return conditional(page_etag("app_modules_page", app_row, details["modules"], user_details), render)
 
 
 @app.route('/app_dimension', methods=['POST'])
 def app_dimension():
-    data = request.get_json()
-    app_id = data.get('app_id', '').strip() if data else ''
-    app_name = data.get('app_name', '').strip() if data else ''
-
+    data = request.get_json(silent=True) or {}
+    app_id = str(data.get('app_id') or '').strip()
     if not app_id:
         return jsonify({"error": "Invalid or missing app_id"}), 400
-
-    session['app_owner_id'] = app_id
-    session['app_name'] = app_name
-    print(f"App ID stored in session: {app_id}")
-    return jsonify({"redirect": url_for('get_dimension_form')}), 200
+    return jsonify({"redirect": url_for('app_dimensions_page', app_id=app_id)}), 200
 
 
 @app.route('/get_dimension_form', methods=['GET'])
 def get_dimension_form():
     app_id = session.get('app_owner_id')
-    app_name = session.get('app_name')
     if not app_id:
         return render_template('noaccess.html', error="App ID not found in session.")
+    return redirect(url_for('app_dimensions_page', app_id=app_id))
+
 
-    dimension = get_dimension(app_id)
-    print(dimension)
+@app.route('/apps/<app_id>/dimensions', methods=['GET'])
+def app_dimensions_page(app_id):
+    details, missing = fetch_concurrently(
+        {"app": (get_app, app_id), "dimensions": (get_dimension, app_id)},
+        defaults={"app": None, "dimensions": []})
+    app_row = details["app"] or {}
+    logger.debug("Dimensions loaded", extra={"app_id": app_id, "dimensions": details["dimensions"]})
 
     user_details = get_user_details()
 
-    return render_template('dimensions.html', app_id=app_id, app_name=app_name, dimensions=dimension, error="Failed to load modules.", user=user_details)
+    def render():
+        return render_template('dimensions.html', app_id=app_id, app_name=app_row.get('app_name', ''), dimensions=details["dimensions"], error="Failed to load modules.", user=user_details)
+
+    if missing:
+        return render()
+    return conditional(page_etag("app_dimensions_page", app_row, details["dimensions"], user_details), render)
 
 # Search function in modal
 
@@ -338,7 +543,6 @@ def get_dimension_form():
 @app.route('/search_hcm_id', methods=['POST'])
 def enroll_administrator():
     # get_users()
-    print(f"enroll_administrator function was triggered, will now process data")
     return_processed = search_hcm_id()
 
     if return_processed['status'] == 'error':
@@ -347,43 +551,88 @@ def enroll_administrator():
         return jsonify(return_processed), 200
 
 
+@app.route('/api/employees/search', methods=['GET'])
+def api_employees_search():
+    try:
+        limit = min(max(request.args.get('limit', 10, type=int) or 10, 1), 25)
+        return jsonify(search_employees(request.args.get('q', ''), limit)), 200
+
+    except Exception:
+        logger.exception("Error in api_employees_search")
+        return jsonify({"status": "error", "message": "Failed to search employees"}), 500
+
+
 # Search function in Gridview
 # AS IT IS HARDCODED
 
 
 @app.route('/retrieve_administrator_details', methods=['POST'])
 def retrieve_administrator_details():
+    # Form post of the HCM ID search; the page itself searches through /api/administrators.
     try:
+        return_processed = get_administrators()
+        user_details = get_user_details()
 
-        return_processed = retrieve_administrator_details_to_gridview()
+        hcm_id = (request.form.get('txt_search_employee') or '').strip()
+        rows = administrators_index(return_processed).search(hcm_id=hcm_id)
+        message = f"Showing result for {hcm_id}" if rows else f"No HCM ID found for {hcm_id}"
 
-        print(
-            f"Data processed from API for retrieve_administrator_details :{retrieve_administrator_details_to_gridview}")
+        return stream_page('users.html', headers=return_processed['headers'], data=rows, message=message, status=True, status2='success', user=user_details['user'], full_name=user_details['full_name'],
+                           role_type=user_details['role_type'])
 
-        user_details = get_user_details()
+    except Exception:
+        logger.exception("Error in retrieve_administrator_details")
+        return render_template('noaccess.html', error="Failed to search administrators")
 
-        return render_template('users.html', headers=return_processed['headers'], data=return_processed['rows'], message=return_processed['message'], status=True, status2=return_processed['status'], user=user_details['user'], full_name=user_details['full_name'],
-                               role_type=user_details['role_type'])
 
-    # Logic that search if user exist in administrator_master table
+@app.route('/api/administrators', methods=['GET'])
+def api_administrators():
+    try:
+        return_processed = get_administrators()
+        if not return_processed:
+            return jsonify({"status": "error", "message": "Failed to load administrators"}), 503
 
-    except Exception as e:
-        # full_traceback = traceback.format_exc()
-        exc_type, exc_obj, exc_tb = sys.exc_info()
-        file_name = exc_tb.tb_frame.f_code.co_filename
-        line_number = exc_tb.tb_lineno
+        def render():
+            grid = query_admins(administrators_index(return_processed), request.args)
+
+            if request.args.get('format') == 'html':
+                grid['html'] = render_template(
+                    '_admin_rows.html',
+                    headers=return_processed['headers'],
+                    data=grid['items'])
+
+            return jsonify(grid), 200
+
+        return conditional(page_etag("api_administrators", administrators_version(return_processed),
+                                     _args_key()), render)
+
+    except Exception:
+        logger.exception("Error in api_administrators")
+        return jsonify({"status": "error", "message": "Failed to load administrators"}), 500
+
+
+# Export of the administrators grid (same q/hcm_id/sbu/role/sort as /api/administrators).
+@app.route('/api/administrators/export', methods=['GET'])
+def api_administrators_export():
+    try:
+        return_processed = get_administrators()
+        if not return_processed:
+            return jsonify({"status": "error", "message": "Failed to load administrators"}), 503
+
+        rows = select_admins(administrators_index(return_processed), request.args)
+        log_export("User Control Center UI - Export Administrators", session.get('user'))
+        return export_response("administrators", export.admin_columns(return_processed['headers']), rows,
+                               "Administrators")
 
-        print(f"Error occurred in file: {file_name}")
-        print(f"Error occurred on line number: {line_number}")
-        print(f"Error message: {e}")
-        # print(f"Full Traceback: {full_traceback}")
+    except Exception:
+        logger.exception("Error in api_administrators_export")
+        return jsonify({"status": "error", "message": "Failed to export administrators"}), 500
 
 
 @app.route('/insert_enroll_administrator', methods=['POST'])
 def insert_enroll_administrator():
 
     try:
-        print("The insert_enroll_administrator_function was triggered")
         # Call the function here
         return_processed = insert_enroll_administrator_function(
             session.get('user'))
@@ -392,15 +641,68 @@ def insert_enroll_administrator():
             return jsonify(return_processed), 409
         else:
             return jsonify(return_processed), 200
-    except Exception as e:
-        # full_traceback = traceback.format_exc()
-        exc_type, exc_obj, exc_tb = sys.exc_info()
-        file_name = exc_tb.tb_frame.f_code.co_filename
-        line_number = exc_tb.tb_lineno
+    except Exception:
+        logger.exception("Error in insert_enroll_administrator")
+
+
+# Bulk enrollment from a CSV upload (multipart field "file", or a text/csv body). The
+# response is NDJSON: one line per row, a progress line per batch and a summary line.
+@app.route('/api/administrators/import', methods=['POST'])
+def api_administrators_import():
+    try:
+        if get_user_details()['role_type'] != 'Super Administrator':
+            return jsonify({"status": "error", "message": "Only a Super Administrator can bulk enroll"}), 403
+
+        # Set before the body is touched: Werkzeug then answers a larger Content-Length
+        # (or multipart form) with 413 instead of reading it in.
+        request.max_content_length = bulk_import.MAX_BYTES
+        if request.mimetype == 'text/csv':
+            stream = request.stream
+        elif 'file' in request.files:
+            stream = bulk_import.spool(request.files['file'].stream)
+        else:
+            return jsonify({"status": "error", "message": "Upload a CSV file"}), 400
+
+        dry_run = request.args.get('dry_run') == '1' or request.form.get('dry_run') == '1'
+        events = import_administrators(stream, session.get('user'), dry_run=dry_run)
+        response = Response(stream_with_context(bulk_import.ndjson(events)),
+                            mimetype='application/x-ndjson')
+        response.headers['Cache-Control'] = 'no-store'
+        if stream is not request.stream:
+            response.call_on_close(stream.close)
+        return response
+
+    except RequestEntityTooLarge:
+        return jsonify({"status": "error",
+                        "message": f"The file is larger than {bulk_import.MAX_BYTES} bytes"}), 413
+    except Exception:
+        logger.exception("Error in api_administrators_import")
+        return jsonify({"status": "error", "message": "Failed to import administrators"}), 500
+
+
+# Batch delete, {"user_ids": [...], "deletion_reason": "..."}; same answers as
+# /api/applications/delete.
+@app.route('/api/administrators/delete', methods=['POST'])
+def api_delete_administrators():
+    try:
+        if get_user_details()['role_type'] != 'Super Administrator':
+            return jsonify({"status": "error", "message": "Only a Super Administrator can delete in bulk"}), 403
+
+        data = request.get_json(silent=True) or {}
+        user_ids = batch_ids(data, 'user_ids')
+        if user_ids is None:
+            return jsonify({"status": "error",
+                            "message": f"user_ids must be a list of 1 to {BATCH_DELETE_MAX} ids"}), 400
+        deletion_reason = str(data.get('deletion_reason') or '').strip()
+        if not deletion_reason:
+            return jsonify({"status": "error", "message": "deletion_reason is required"}), 400
 
-        print(f"Error occurred in file: {file_name}")
-        print(f"Error occurred on line number: {line_number}")
-        print(f"Error message: {e}")
+        result = delete_administrators(user_ids, deletion_reason, session.get('user'))
+        return jsonify(result), 409 if result["status"] == "error" else 200
+
+    except Exception:
+        logger.exception("Error in api_delete_administrators")
+        return jsonify({"status": "error", "message": "Failed to delete administrators"}), 500
 
 
 # FUNCTION TO DELETE ADMINISTRATOR
@@ -408,23 +710,14 @@ def insert_enroll_administrator():
 def handle_delete_administrator():
 
     try:
-        print(f"Delete Administrator Function was triggered and called ")
-
         return_processed = delete_administrator(session.get('user'))
 
         if return_processed['status'] == 'error':
             return jsonify(return_processed), 409
         else:
             return jsonify(return_processed), 200
-    except Exception as e:
-        # full_traceback = traceback.format_exc()
-        exc_type, exc_obj, exc_tb = sys.exc_info()
-        file_name = exc_tb.tb_frame.f_code.co_filename
-        line_number = exc_tb.tb_lineno
-
-        print(f"Error occurred in file: {file_name}")
-        print(f"Error occurred on line number: {line_number}")
-        print(f"Error message: {e}")
+    except Exception:
+        logger.exception("Error in delete_administrator")
 
 
 if __name__ == '__main__':
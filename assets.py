@@ -0,0 +1,110 @@
+import json
+import mimetypes
+import os
+
+from flask import request, send_from_directory, url_for
+from markupsafe import Markup, escape
+from werkzeug.utils import safe_join
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+# Fingerprinted static bundles.
+#
+# build_assets.py concatenates and minifies the sources of each bundle in BUNDLES into
+# static/dist/<name>.<hash>.<ext>, writes .gz and .br variants next to it and records the
+# file names in static/dist/manifest.json. Templates refer to bundles by name through
+# asset_tags() and asset_url(); built files are served from /assets/ with a one year
+# immutable Cache-Control, as the precompressed variant the browser accepts.
+# Without a manifest (a local run before building) the helpers point at the source
+# files under /static/ instead.
+#
+# Configuration (environment):
+#   ASSETS_DIR     build output directory (default static/dist)
+#   ASSETS_DEBUG   "1" to ignore the manifest and always use the source files
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+ASSETS_DIR = os.getenv('ASSETS_DIR') or os.path.join(STATIC_DIR, "dist")
+MANIFEST = "manifest.json"
+URL_PATH = "/assets"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Bundle name -> source files under static/, in load order.
+BUNDLES = {
+    "app.css": [
+        "custom_css/style.css",
+        "css/bootstrap.min.css",
+        "vendor/bootstrap-icons/bootstrap-icons.min.css",
+    ],
+    "bootstrap.js": ["js/bootstrap.bundle.min.js"],
+    "navbar.js": ["js/navbar.js"],
+    "home.js": ["js/home.js"],
+    "users.js": ["js/users.js"],
+    "login.css": ["css/login.css"],
+    "login_logo.png": ["login_logo.png"],
+    "UCC Logo.png": ["UCC Logo.png"],
+    "UCC Logo Black.png": ["UCC Logo Black.png"],
+    "google_g.svg": ["google_g.svg"],
+}
+
+mimetypes.add_type("font/woff", ".woff")
+mimetypes.add_type("font/woff2", ".woff2")
+
+manifest = {}
+
+
+def load_manifest(directory=ASSETS_DIR):
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _urls(name):
+    built = manifest.get(name)
+    if built:
+        return [url_for("assets", filename=built)]
+    return [url_for("static", filename=source) for source in BUNDLES.get(name, [name])]
+
+
+def asset_url(name):
+    return _urls(name)[0]
+
+
+def asset_tags(name):
+    if name.endswith(".css"):
+        tag = '<link rel="stylesheet" href="{}">'
+    else:
+        tag = '<script src="{}"></script>'
+    return Markup("\n    ".join(tag.format(escape(url)) for url in _urls(name)))
+
+
+def serve_asset(filename):
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    response = None
+    for encoding, suffix in ENCODINGS:
+        path = safe_join(ASSETS_DIR, filename + suffix)
+        if request.accept_encodings[encoding] and path and os.path.isfile(path):
+            response = send_from_directory(ASSETS_DIR, filename + suffix, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+            break
+    if response is None:
+        response = send_from_directory(ASSETS_DIR, filename, mimetype=mimetype)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def init_app(app):
+    if os.getenv('ASSETS_DEBUG') != '1':
+        manifest.update(load_manifest())
+        if not manifest:
+            logger.warning("No asset manifest, serving unbundled static files",
+                           extra={"assets_dir": ASSETS_DIR})
+    app.add_url_rule(URL_PATH + "/<path:filename>", "assets", serve_asset)
+    app.add_template_global(asset_url)
+    app.add_template_global(asset_tags)
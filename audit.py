@@ -0,0 +1,280 @@
+import atexit
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+
+from logs import get_logger
+from metrics import observe_audit, set_audit_queue_depth
+
+logger = get_logger(__name__)
+
+
+# In-process shipper for log_api_activity records.
+#
+# Request handlers only enqueue a record; a background thread drains the queue and
+# ships records to the job-logs service in batches, flushing when a batch fills up
+# or when the flush interval elapses. When the queue is full the record is dropped
+# (optionally after waiting briefly for room) and counted. When the job-logs service
+# is unreachable, the batch is appended to a local JSON-lines spill file which is
+# replayed once the service accepts records again.
+#
+# A batch goes out as one {"data": [records]} post. If the service answers that with
+# 400, 415 or 422 it is taken not to accept lists, and from then on this process posts
+# {"data": record} once per record, as the service originally expected.
+#
+# Configuration (environment):
+#   AUDIT_BATCH_SIZE          records per flush (default 50)
+#   AUDIT_FLUSH_INTERVAL      seconds between flushes of a partial batch (default 2)
+#   AUDIT_QUEUE_SIZE          maximum queued records (default 10000)
+#   AUDIT_QUEUE_BLOCK_SECONDS how long a full queue may block the caller before dropping (default 0)
+#   AUDIT_SPILL_PATH          append-only spill file (default /tmp/control_center_audit_spill.jsonl)
+#   AUDIT_REPLAY_INTERVAL     seconds to wait after a failed send before replaying the spill file (default 30)
+#   AUDIT_BULK                "1" to always post batches, "0" to always post one record at a
+#                             time (default: batches, falling back as described above)
+
+
+class AuditShipper:
+
+    def __init__(self, client, batch_size=None, flush_interval=None, max_queue=None,
+                 block_seconds=None, spill_path=None, bulk=None):
+        self.client = client
+        self.batch_size = batch_size or int(os.getenv('AUDIT_BATCH_SIZE', 50))
+        self.flush_interval = flush_interval or float(
+            os.getenv('AUDIT_FLUSH_INTERVAL', 2))
+        self.max_queue = max_queue or int(os.getenv('AUDIT_QUEUE_SIZE', 10000))
+        self.block_seconds = block_seconds if block_seconds is not None else float(
+            os.getenv('AUDIT_QUEUE_BLOCK_SECONDS', 0))
+        self.spill_path = spill_path or os.getenv(
+            'AUDIT_SPILL_PATH', '/tmp/control_center_audit_spill.jsonl')
+        # True, False, or None to try batches and fall back to single records.
+        self.bulk = bulk if bulk is not None else {"1": True, "0": False}.get(os.getenv('AUDIT_BULK'))
+        self.replay_interval = float(os.getenv('AUDIT_REPLAY_INTERVAL', 30))
+        self._next_replay = 0.0
+
+        self.counters = {
+            "enqueued": 0,
+            "sent": 0,
+            "dropped": 0,
+            "failed": 0,
+            "spilled": 0,
+            "replayed": 0,
+        }
+        self._counter_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+
+    def _count(self, name, amount=1):
+        with self._counter_lock:
+            self.counters[name] += amount
+        observe_audit(name, amount)
+
+    def _ensure_started(self):
+        # Start lazily and again after a fork: threads do not survive into gunicorn workers.
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._thread = threading.Thread(
+                target=self._run, name="audit-shipper", daemon=True)
+            self._pid = pid
+            self._thread.start()
+
+    def submit(self, record):
+        self._ensure_started()
+        try:
+            if self.block_seconds > 0:
+                self._queue.put(record, timeout=self.block_seconds)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        set_audit_queue_depth(self._queue.qsize())
+        return True
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self):
+        with self._counter_lock:
+            stats = dict(self.counters)
+        stats["queue_depth"] = self.queue_depth()
+        return stats
+
+    def _next_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping:
+            batch = self._next_batch()
+            set_audit_queue_depth(self._queue.qsize())
+            if batch:
+                if self._send(batch):
+                    self._replay_spill()
+            elif time.monotonic() >= self._next_replay and os.path.exists(self.spill_path):
+                self._replay_spill()
+
+    def _post(self, data):
+        # The response status code, or None when the service could not be reached.
+        try:
+            response = self.client.post("", json={"data": data})
+        except Exception as e:
+            logger.warning("Audit batch could not be shipped", extra={"error": str(e)})
+            return None
+        if response.status_code != 200:
+            logger.warning("Audit batch rejected", extra={
+                "status_code": response.status_code, "response": response.text[:500]})
+        return response.status_code
+
+    def _send(self, batch):
+        unsent = self._deliver(batch)
+        if unsent:
+            self._spill(unsent)
+        return not unsent
+
+    def _deliver(self, batch):
+        # Ships `batch` and returns the records that could not be shipped.
+        unsent = self._deliver_batch(batch)
+        if unsent:
+            self._count("failed", len(unsent))
+            self._next_replay = time.monotonic() + self.replay_interval
+        return unsent
+
+    def _deliver_batch(self, batch):
+        if self.bulk is not False:
+            status = self._post(batch)
+            if status == 200:
+                self._count("sent", len(batch))
+                return []
+            if self.bulk is None and status in (400, 415, 422):
+                logger.warning("The job-logs service does not accept batches, posting one record at a time")
+                self.bulk = False
+            else:
+                return batch
+
+        for index, record in enumerate(batch):
+            if self._post(record) != 200:
+                return batch[index:]
+            self._count("sent")
+        return []
+
+    def _spill(self, records):
+        try:
+            with self._spill_lock, open(self.spill_path, 'a', encoding='utf-8') as spill:
+                for record in records:
+                    spill.write(json.dumps(record) + "\n")
+            self._count("spilled", len(records))
+        except OSError as e:
+            self._count("dropped", len(records))
+            logger.error("Unable to spill audit records", extra={
+                "spill_path": self.spill_path, "error": str(e)})
+
+    def _replay_spill(self):
+        # Claim the spill file by renaming it so concurrent workers never replay it twice.
+        replay_path = f"{self.spill_path}.{os.getpid()}.replay"
+        with self._spill_lock:
+            try:
+                os.replace(self.spill_path, replay_path)
+            except FileNotFoundError:
+                return
+            except OSError as e:
+                logger.error("Unable to claim audit spill file", extra={"error": str(e)})
+                return
+
+        replayed = 0
+        done = True
+        with open(replay_path, encoding='utf-8') as spill:
+            for batch in self._read_batches(spill):
+                unsent = self._deliver(batch)
+                replayed += len(batch) - len(unsent)
+                if unsent:
+                    # Put the unsent records and the rest of the file back without reading
+                    # the rest into memory, ahead of anything spilled since it was claimed.
+                    done = self._restore_spill(unsent, spill, replay_path)
+                    break
+        if done:
+            os.remove(replay_path)
+        self._count("replayed", replayed)
+
+    def _read_batches(self, spill):
+        batch = []
+        for line in spill:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                batch.append(json.loads(line))
+            except ValueError:
+                continue
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _restore_spill(self, unsent, rest, replay_path):
+        restore_path = f"{replay_path}.rest"
+        try:
+            with open(restore_path, 'w', encoding='utf-8') as restored:
+                for record in unsent:
+                    restored.write(json.dumps(record) + "\n")
+                shutil.copyfileobj(rest, restored)
+                with self._spill_lock:
+                    try:
+                        with open(self.spill_path, encoding='utf-8') as newer:
+                            shutil.copyfileobj(newer, restored)
+                    except FileNotFoundError:
+                        pass
+                    restored.close()
+                    os.replace(restore_path, self.spill_path)
+        except OSError as e:
+            # The claimed file is left in place, so nothing is lost (but it is not replayed).
+            logger.error("Unable to restore audit spill file", extra={
+                "spill_path": self.spill_path, "replay_path": replay_path, "error": str(e)})
+            return False
+        self._count("spilled", len(unsent))
+        return True
+
+    def drain_to_spill(self):
+        if self._queue is None or self._pid != os.getpid():
+            return
+        records = []
+        while True:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if records:
+            self._spill(records)
+
+
+def _shutdown(shipper):
+    shipper._stopping = True
+    shipper.drain_to_spill()
+
+
+def create_shipper(client):
+    shipper = AuditShipper(client)
+    atexit.register(_shutdown, shipper)
+    return shipper
@@ -0,0 +1,80 @@
+import time
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from cache import TTLCache, env_ttl
+
+
+# Validated administrator claims.
+#
+# validate_user() caches the admin record it gets from upstream per email for
+# ADMIN_CLAIM_TTL seconds, and the before_request guard in app.py stores a signed,
+# short-lived claim (email, hcm_id, role_type, expiry) in the session. While the
+# claim is valid, navigation never calls {domain}/admin again. Enrolling, editing or
+# deleting an administrator bumps the claim generation so every claim issued by this
+# process before the write is re-validated on the next request.
+#
+# The generation and the cached records only live in this process. Other gunicorn
+# workers and instances notice a removed or changed administrator through the
+# administrators grid the worker has cached (the guard never loads it itself): a claim
+# carries the grid version it was issued against, and once the cached grid has changed
+# the guard in app.py only accepts it while the grid still lists the HCM ID with that
+# role (functions.admin_enrolled). A removed administrator can therefore keep access
+# elsewhere until that worker reloads the grid (ADMINISTRATORS_TTL), or for up to
+# ADMIN_CLAIM_TTL while it has no grid cached.
+
+ADMIN_CLAIM_TTL = env_ttl('ADMIN_CLAIM_TTL', 120)
+
+admin_cache = TTLCache("admin_claims", ADMIN_CLAIM_TTL)
+
+_generation = {"value": 0}
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.secret_key, salt="admin-claim")
+
+
+def _normalize(email):
+    return (email or '').strip().lower()
+
+
+def issue_claim(email, admin_details, grid_version=None):
+    return _serializer().dumps({
+        "email": _normalize(email),
+        "hcm_id": admin_details['hcm_id'],
+        "role_type": admin_details['role_type'],
+        "exp": int(time.time() + ADMIN_CLAIM_TTL),
+        "gen": _generation["value"],
+        "grid": grid_version
+    })
+
+
+def read_claim(token, email):
+    if not token:
+        return None
+    try:
+        claim = _serializer().loads(token, max_age=ADMIN_CLAIM_TTL)
+    except BadSignature:
+        return None
+    if claim.get("email") != _normalize(email):
+        return None
+    if claim.get("gen") != _generation["value"] or claim.get("exp", 0) < time.time():
+        return None
+    return claim
+
+
+def get_cached_admin(email):
+    return admin_cache.get(_normalize(email))
+
+
+def cache_admin(email, admin_details):
+    admin_cache.set(_normalize(email), admin_details)
+
+
+def invalidate_admin(email=None):
+    if email:
+        admin_cache.invalidate(_normalize(email))
+    else:
+        admin_cache.clear()
+    _generation["value"] += 1
@@ -0,0 +1,127 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from bench import fake_backend, fake_services
+from bench.run_bench import ROUTES, backend_env, bench_cookie, measure, sample_app_id, start_backend
+from secrets_provider import _env_name
+
+
+# Runs the app under real gunicorn in each serving mode (see gunicorn.conf.py) against
+# the same fake backend and prints throughput and latency side by side.
+#
+#   python -m bench.compare_modes --latency-ms 100 --concurrency 32 --duration 20
+#   python -m bench.compare_modes --modes sync,sync:8,async --json modes.json
+#
+# A mode is "sync", "sync:<threads>" or "async". Needs gunicorn and gevent installed.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            # Any answer will do: /metrics is 404 without METRICS_TOKEN.
+            requests.get(f"{url}/metrics", timeout=1)
+            return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not come up on {url}")
+
+
+def start_gunicorn(mode, backend_url, metrics_dir):
+    serving_mode, _, threads = mode.partition(':')
+    port = free_port()
+    env = dict(os.environ)
+    env.update(backend_env(backend_url))
+    env.update({
+        'PORT': str(port),
+        'SERVING_MODE': serving_mode,
+        'GUNICORN_THREADS': threads or '1',
+        'PROMETHEUS_MULTIPROC_DIR': metrics_dir,
+        _env_name('google-oauth'): fake_services.FAKE_SECRETS['google-oauth'],
+        _env_name(env['secret_id']): fake_services.FAKE_API_KEY,
+    })
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_ready(url)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process, url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare gunicorn serving modes")
+    parser.add_argument('--modes', default="sync,sync:8,async")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--warmup', type=float, default=2)
+    parser.add_argument('--routes', default=",".join(ROUTES))
+    parser.add_argument('--json', dest='json_path')
+    fake_backend.add_dataset_arguments(parser)
+    parser.set_defaults(latency_ms=100)
+    args = parser.parse_args(argv)
+    routes = [name.strip() for name in args.routes.split(',') if name.strip()]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset, backend = start_backend(args)
+        os.environ.update(backend_env(backend.url))
+        fake_services.install_fake_secrets()
+        import app as control_center_app
+        cookie = bench_cookie(control_center_app.app)
+
+    results = {}
+    for mode in [mode.strip() for mode in args.modes.split(',') if mode.strip()]:
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            process, url = start_gunicorn(mode, backend.url, metrics_dir)
+            try:
+                report, elapsed = measure(url, cookie, routes, args.concurrency, args.duration,
+                                          args.warmup, params={"app_id": sample_app_id(dataset)})
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+        total = sum(row["requests"] for row in report.values())
+        results[mode] = {"rps": round(total / elapsed, 2), "routes": report}
+        print(f"{mode}: {total / elapsed:.1f} req/s")
+    backend.stop()
+
+    print(f"\nconcurrency {args.concurrency}, upstream latency {args.latency_ms:.0f}ms\n")
+    print(f"{'route':<22}" + "".join(f"{mode + ' p50/p95 ms':>24}" for mode in results))
+    for route in routes:
+        cells = []
+        for mode, result in results.items():
+            row = result["routes"].get(route)
+            cells.append(f"{row['p50_ms']:.0f}/{row['p95_ms']:.0f}" if row else "-")
+        print(f"{route:<22}" + "".join(f"{cell:>24}" for cell in cells))
+    print(f"{'total req/s':<22}" + "".join(f"{result['rps']:>24.1f}" for result in results.values()))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as handle:
+            json.dump({"concurrency": args.concurrency, "latency_ms": args.latency_ms,
+                       "modes": results}, handle, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
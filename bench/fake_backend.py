@@ -0,0 +1,298 @@
+import argparse
+import random
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+
+from flask import Flask, jsonify, request
+
+
+# Offline stand-in for the control_center API and the job-logs service.
+#
+# Implements every endpoint functions.py calls, over a generated in-memory dataset,
+# with injectable latency and error rates. Point the app at it with
+#   CONTROL_CENTER_DOMAIN=http://127.0.0.1:<port>/control_center
+#   AUDIT_LOG_URL=http://127.0.0.1:<port>/job_logs
+#
+#   python -m bench.fake_backend --port 9000 --apps 500 --latency-ms 40 --error-rate 0.01
+
+ADMIN_HEADERS = ["id", "HCM ID", "Full Name", "Email Address", "SBU", "Job Position",
+                 "Ticket Number", "Access Start Date", "Access End Date", "Role Type"]
+SBUS = ["Malls", "Hotels", "Residences", "Offices", "Corporate", "Logistics"]
+POSITIONS = ["Analyst", "Engineer", "Manager", "Specialist", "Supervisor", "Director"]
+FIRST_NAMES = ["Ana", "Ben", "Carla", "Dan", "Ella", "Fred", "Gina", "Hugo", "Ivy", "Jon",
+               "Kara", "Leo", "Mia", "Noel", "Olga", "Paul", "Rita", "Sam", "Tina", "Vic"]
+LAST_NAMES = ["Reyes", "Santos", "Cruz", "Garcia", "Mendoza", "Torres", "Flores", "Ramos",
+              "Lopez", "Castro", "Rivera", "Bautista", "Villanueva", "Aquino", "Navarro"]
+DIMENSIONS = ["Company", "Brand", "Location", "Mall Group"]
+
+
+class Dataset:
+
+    def __init__(self, apps=200, modules=5, dimensions=3, administrators=200, employees=5000,
+                 seed=7):
+        rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.employees = {}
+        for index in range(employees):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            hcm_id = f"{100000 + index}"
+            self.employees[hcm_id] = {
+                "hcm_id": hcm_id,
+                "full_name": f"{first} {last}",
+                "email": f"{first.lower()}.{last.lower()}{index}@example.com",
+                "sbu": rng.choice(SBUS),
+                "job_position": rng.choice(POSITIONS),
+            }
+
+        self.administrators = {}
+        for employee in list(self.employees.values())[:administrators]:
+            self._add_admin(employee, rng.choice(["Administrator", "Super Administrator"]),
+                            str(rng.randint(10000, 99999)))
+
+        self.apps = {}
+        self.modules = {}
+        self.dimensions = {}
+        start = date(2024, 1, 1)
+        for index in range(apps):
+            app_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            module_count = rng.randint(0, modules * 2)
+            dimension_count = rng.randint(0, dimensions)
+            self.apps[app_id] = {
+                "app_id": app_id,
+                "app_name": f"Application {index:05d}",
+                "app_url": f"https://apps.example.com/{index}",
+                "app_owner": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "status": rng.random() > 0.2,
+                "can_read": True,
+                "can_write": rng.random() > 0.3,
+                "can_update": rng.random() > 0.4,
+                "can_delete": rng.random() > 0.6,
+                "created_by": "admin@example.com",
+                "date_created": (start + timedelta(days=index % 600)).isoformat(),
+                "module_count": module_count,
+                "dimension_count": dimension_count,
+            }
+            self.modules[app_id] = [
+                {"module_name": f"Module {m}", "url": f"https://apps.example.com/{index}/m{m}"}
+                for m in range(module_count)]
+            self.dimensions[app_id] = [
+                {"dimension_name": name} for name in rng.sample(DIMENSIONS, dimension_count)]
+
+    def _add_admin(self, employee, role_type, ticket_number, user_id=None):
+        user_id = user_id or str(len(self.administrators) + 1)
+        self.administrators[user_id] = {
+            "id": user_id,
+            "HCM ID": employee["hcm_id"],
+            "Full Name": employee["full_name"],
+            "Email Address": employee["email"],
+            "SBU": employee["sbu"],
+            "Job Position": employee["job_position"],
+            "Ticket Number": ticket_number,
+            "Access Start Date": "2025-01-01",
+            "Access End Date": "2026-12-31",
+            "Role Type": role_type,
+        }
+        return user_id
+
+    def admin_by_username(self, username):
+        for admin in self.administrators.values():
+            if admin["Email Address"].split("@")[0] == username:
+                return admin
+        return None
+
+
+def create_app(dataset, latency_ms=0, jitter_ms=0, error_rate=0.0, endpoint_latency=None,
+               allow_all_users=True, seed=11):
+    app = Flask(__name__)
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    endpoint_latency = endpoint_latency or {}
+    stats = {"requests": 0, "errors": 0}
+
+    @app.before_request
+    def inject_faults():
+        endpoint = request.path.rstrip('/').rsplit('/', 1)[-1]
+        with rng_lock:
+            stats["requests"] += 1
+            delay = endpoint_latency.get(endpoint, latency_ms) + rng.uniform(0, jitter_ms)
+            fail = rng.random() < error_rate
+        if delay:
+            time.sleep(delay / 1000.0)
+        if fail:
+            stats["errors"] += 1
+            return jsonify({"status": "error", "message": "Injected failure"}), 500
+        return None
+
+    def payload():
+        return request.get_json(silent=True) or {}
+
+    @app.route('/job_logs', methods=['POST'])
+    @app.route('/job_logs/', methods=['POST'])
+    @app.route('/control_center/log_activity', methods=['POST'])
+    def job_logs():
+        return jsonify({"status": "success"})
+
+    @app.route('/control_center/admin', methods=['POST'])
+    def admin():
+        username = payload().get("param", "")
+        admin = dataset.admin_by_username(username)
+        if admin:
+            return jsonify({"data": [{"hcm_id": admin["HCM ID"], "role_type": admin["Role Type"]}]})
+        if allow_all_users:
+            return jsonify({"data": [{"hcm_id": "000000", "role_type": "Super Administrator"}]})
+        return jsonify({"data": []})
+
+    @app.route('/control_center/get_app_master_data', methods=['GET'])
+    def get_app_master_data():
+        with dataset.lock:
+            return jsonify(list(dataset.apps.values()))
+
+    @app.route('/control_center/get_modules', methods=['POST'])
+    def get_modules():
+        return jsonify({"data": dataset.modules.get(payload().get("app_id"), [])})
+
+    @app.route('/control_center/get_dimension', methods=['POST'])
+    def get_dimension():
+        return jsonify({"data": dataset.dimensions.get(payload().get("app_id"), [])})
+
+    @app.route('/control_center/save_application_data', methods=['POST'])
+    def save_application_data():
+        data = payload()
+        app_id = data.get("app_id") or str(uuid.uuid4())
+        permissions = data.get("permissions") or {}
+        with dataset.lock:
+            row = dataset.apps.setdefault(app_id, {
+                "app_id": app_id, "created_by": str(data.get("created_by")),
+                "date_created": date.today().isoformat()})
+            row.update({
+                "app_name": data.get("application_name"),
+                "app_url": data.get("app_url"),
+                "app_owner": data.get("owner"),
+                "status": str(data.get("status")).lower() == "true",
+                "can_read": bool(permissions.get("read")),
+                "can_write": bool(permissions.get("write")),
+                "can_update": bool(permissions.get("update")),
+                "can_delete": bool(permissions.get("delete")),
+                "module_count": len(data.get("modules") or []),
+                "dimension_count": len(data.get("dimensions") or []),
+            })
+            dataset.modules[app_id] = [
+                {"module_name": m.get("module_name"), "url": m.get("link_url")}
+                for m in data.get("modules") or []]
+            dataset.dimensions[app_id] = [
+                {"dimension_name": name} for name in data.get("dimensions") or []]
+        return jsonify({"status": "success", "app_id": app_id})
+
+    @app.route('/control_center/delete_app', methods=['POST'])
+    def delete_app():
+        with dataset.lock:
+            removed = dataset.apps.pop(payload().get("app_id"), None)
+        if removed is None:
+            return jsonify({"status": "error", "message": "Application not found"})
+        return jsonify({"status": "success"})
+
+    @app.route('/control_center/load_administrator', methods=['POST'])
+    def load_administrator():
+        with dataset.lock:
+            rows = list(dataset.administrators.values())
+        return jsonify({"status": "success", "message": "Loaded", "headers": ADMIN_HEADERS,
+                        "rows": rows})
+
+    @app.route('/control_center/search_hcm_id', methods=['POST'])
+    def search_hcm_id():
+        hcm_id = str(payload().get("result", "")).strip()
+        employee = dataset.employees.get(hcm_id)
+        if employee is None:
+            return jsonify({"status": "success", "message": "No HCM ID found", "result": []})
+        return jsonify({"status": "success", "message": "Employee found", "result": [employee]})
+
+    @app.route('/control_center/insert_enroll_administrator', methods=['POST'])
+    def insert_enroll_administrator():
+        data = payload().get("payload") or {}
+        employee = dataset.employees.get(str(data.get("hcm_id")))
+        if employee is None:
+            return jsonify({"status": "error", "message": "Please input a VALID HCM ID..."})
+        with dataset.lock:
+            if data.get("mode") == "Edit" and data.get("user_id") in dataset.administrators:
+                dataset.administrators[data["user_id"]].update({
+                    "Role Type": data.get("role_type"),
+                    "Ticket Number": data.get("ticket_number"),
+                    "Access Start Date": data.get("access_start_date"),
+                    "Access End Date": data.get("access_end_date"),
+                })
+                return jsonify({"status": "success", "message": "Administrator updated"})
+            if any(a["HCM ID"] == employee["hcm_id"] for a in dataset.administrators.values()):
+                return jsonify({"status": "error", "message": "Administrator already exists"})
+            user_id = dataset._add_admin(employee, data.get("role_type"), data.get("ticket_number"),
+                                         user_id=str(uuid.uuid4()))
+        return jsonify({"status": "success", "message": "Administrator enrolled", "user_id": user_id})
+
+    @app.route('/control_center/delete_administrator', methods=['POST'])
+    def delete_administrator():
+        user_id = (payload().get("payload") or {}).get("user_id")
+        with dataset.lock:
+            removed = dataset.administrators.pop(user_id, None)
+        if removed is None:
+            return jsonify({"status": "error", "message": "Administrator not found"})
+        return jsonify({"status": "success", "message": "Administrator deleted"})
+
+    @app.route('/control_center/retrieve_administrator_details', methods=['POST'])
+    def retrieve_administrator_details():
+        needle = str((payload().get("payload") or {}).get("user_id") or "").strip()
+        with dataset.lock:
+            rows = [a for a in dataset.administrators.values() if a["HCM ID"] == needle]
+        message = f"Showing result for {needle}" if rows else f"No HCM ID found for {needle}"
+        return jsonify({"status": "success", "message": message, "headers": ADMIN_HEADERS,
+                        "rows": rows})
+
+    @app.route('/_stats', methods=['GET'])
+    def fake_stats():
+        return jsonify(stats)
+
+    return app
+
+
+def parse_endpoint_latency(items):
+    latency = {}
+    for item in items or []:
+        name, _, value = item.partition('=')
+        latency[name.strip('/')] = float(value)
+    return latency
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument('--apps', type=int, default=200)
+    parser.add_argument('--modules', type=int, default=5, help="average modules per app")
+    parser.add_argument('--dimensions', type=int, default=3, help="maximum dimensions per app")
+    parser.add_argument('--administrators', type=int, default=200)
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--endpoint-latency', action='append', metavar='ENDPOINT=MS',
+                        help="per-endpoint latency override, e.g. get_app_master_data=250")
+
+
+def app_from_args(args):
+    dataset = Dataset(apps=args.apps, modules=args.modules, dimensions=args.dimensions,
+                      administrators=args.administrators, employees=args.employees)
+    return create_app(dataset, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                      error_rate=args.error_rate,
+                      endpoint_latency=parse_endpoint_latency(args.endpoint_latency))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake control_center backend")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    from werkzeug.serving import run_simple
+    run_simple(args.host, args.port, app_from_args(args), threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import json
+from types import SimpleNamespace
+
+
+# Offline stand-ins for Secret Manager and the Google OAuth login, so app.py and
+# functions.py can be imported and driven without GCP credentials.
+#
+# install_fake_secrets() must run before the first secret is resolved; app.py and
+# functions.py start prefetching as soon as they are imported. login_cookie() mints a signed Flask session cookie that
+# looks like a completed Google login.
+
+FAKE_SECRETS = {
+    "google-oauth": json.dumps({
+        "GOOGLE_CLIENT_ID": "bench-client-id.apps.googleusercontent.com",
+        "GOOGLE_CLIENT_SECRET": "bench-client-secret",
+        "GOOGLE_REDIRECT_URI": "http://127.0.0.1/callback",
+    }),
+}
+FAKE_API_KEY = "bench-api-key"
+
+BENCH_USER = {
+    "email": "bench.admin@example.com",
+    "name": "Bench Admin",
+    "picture": "",
+    "email_verified": True,
+}
+
+
+class FakeSecretManagerServiceClient:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def access_secret_version(self, request=None, name=None, **kwargs):
+        name = name or (request or {}).get("name", "")
+        # projects/<project>/secrets/<secret_id>/versions/latest
+        parts = name.split("/")
+        secret_id = parts[3] if len(parts) > 3 else name
+        value = FAKE_SECRETS.get(secret_id, FAKE_API_KEY)
+        return SimpleNamespace(payload=SimpleNamespace(data=value.encode("UTF-8")))
+
+
+def install_fake_secrets():
+    from google.cloud import secretmanager
+    secretmanager.SecretManagerServiceClient = FakeSecretManagerServiceClient
+
+
+def login_cookie(flask_app, user=None, **extra):
+    # Returns the value of the signed "session" cookie for a logged-in user.
+    client = flask_app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = dict(user or BENCH_USER)
+        session.update(extra)
+    cookie = client.get_cookie(flask_app.config.get('SESSION_COOKIE_NAME', 'session'))
+    return cookie.value if cookie else None
@@ -0,0 +1,274 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from bench import fake_backend, fake_services
+
+
+# Fixed-concurrency load test for the Flask routes.
+#
+# By default everything runs in this process, offline: the fake control_center backend
+# (bench/fake_backend.py), fake Secret Manager and a pre-signed login cookie
+# (bench/fake_services.py), and the app itself on a threaded werkzeug server.
+#
+#   python -m bench.run_bench --concurrency 16 --duration 30 --latency-ms 40
+#   python -m bench.run_bench --json results.json
+#   python -m bench.run_bench --baseline results.json --max-regression 0.15
+#
+# --target points the load at an already running server instead (pass its session
+# cookie with --cookie). With --baseline the run exits non-zero when any route's p95
+# or throughput regresses by more than --max-regression.
+
+ROUTES = {
+    "home": ("GET", "/", None),
+    "api_apps": ("GET", "/api/apps?page=2&limit=25&sort=name", None),
+    "api_apps_search": ("GET", "/api/apps?q=00&format=html", None),
+    "manage_users": ("GET", "/manage_users", None),
+    "edit_app": ("GET", "/apps/{app_id}/edit", None),
+    "app_modules_page": ("GET", "/apps/{app_id}/modules", None),
+    "app_dimensions_page": ("GET", "/apps/{app_id}/dimensions", None),
+}
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class ServerThread(threading.Thread):
+
+    def __init__(self, wsgi_app, host='127.0.0.1', port=0):
+        super().__init__(daemon=True)
+        self.server = make_server(host, port, wsgi_app, threaded=True,
+                                  request_handler=QuietRequestHandler)
+        self.url = f"http://{host}:{self.server.server_port}"
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def start_backend(args):
+    dataset = fake_backend.Dataset(apps=args.apps, modules=args.modules,
+                                   dimensions=args.dimensions,
+                                   administrators=args.administrators,
+                                   employees=args.employees)
+    backend = ServerThread(fake_backend.create_app(
+        dataset, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        endpoint_latency=fake_backend.parse_endpoint_latency(args.endpoint_latency)))
+    backend.start()
+    return dataset, backend
+
+
+def backend_env(backend_url):
+    return {
+        'CONTROL_CENTER_DOMAIN': f"{backend_url}/control_center",
+        'AUDIT_LOG_URL': f"{backend_url}/job_logs",
+        'EP_PROJECT_ID': os.getenv('EP_PROJECT_ID', 'bench-project'),
+        'secret_id': os.getenv('secret_id', 'bench-api-key'),
+        'SECRETS_CACHE_DIR': '',
+    }
+
+
+def bench_cookie(flask_app):
+    return fake_services.login_cookie(flask_app)
+
+
+def sample_app_id(dataset):
+    # The app whose edit/modules/dimensions pages are requested.
+    return next(iter(dataset.apps))
+
+
+def start_local_stack(args):
+    dataset, backend = start_backend(args)
+    os.environ.update(backend_env(backend.url))
+    fake_services.install_fake_secrets()
+
+    import app as control_center_app
+    flask_app = control_center_app.app
+    cookie = bench_cookie(flask_app)
+
+    server = ServerThread(flask_app)
+    server.start()
+    return server.url, cookie, sample_app_id(dataset), [backend, server]
+
+
+def worker(base_url, cookie, routes, stop_at, samples, lock, offset, params):
+    session = requests.Session()
+    if cookie:
+        session.cookies.set('session', cookie)
+    local = []
+    index = offset
+    while time.perf_counter() < stop_at:
+        name = routes[index % len(routes)]
+        index += 1
+        method, path, body = ROUTES[name]
+        path = path.format(**params)
+        started = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body,
+                                       allow_redirects=False, timeout=60)
+            response.content
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        local.append((name, time.perf_counter() - started, ok))
+    with lock:
+        samples.extend(local)
+
+
+def run_load(base_url, cookie, routes, concurrency, duration, params):
+    samples = []
+    lock = threading.Lock()
+    started = time.perf_counter()
+    stop_at = started + duration
+    threads = [threading.Thread(target=worker,
+                                args=(base_url, cookie, routes, stop_at, samples, lock, n,
+                                      params))
+               for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def measure(base_url, cookie, routes, concurrency, duration, warmup=0, params=None):
+    params = params or {}
+    if warmup:
+        run_load(base_url, cookie, routes, concurrency, warmup, params)
+    samples, elapsed = run_load(base_url, cookie, routes, concurrency, duration, params)
+    return summarize(samples, elapsed), elapsed
+
+
+def summarize(samples, elapsed):
+    by_route = defaultdict(list)
+    errors = defaultdict(int)
+    for name, latency, ok in samples:
+        by_route[name].append(latency)
+        if not ok:
+            errors[name] += 1
+
+    report = {}
+    for name, latencies in sorted(by_route.items()):
+        latencies.sort()
+        report[name] = {
+            "requests": len(latencies),
+            "errors": errors[name],
+            "rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
+    return report
+
+
+def print_report(report, elapsed, concurrency):
+    total = sum(row["requests"] for row in report.values())
+    print(f"\n{total} requests in {elapsed:.1f}s at concurrency {concurrency} "
+          f"({total / elapsed:.1f} req/s)\n")
+    print(f"{'route':<22}{'reqs':>8}{'errs':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in report.items():
+        print(f"{name:<22}{row['requests']:>8}{row['errors']:>7}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+
+
+def compare(report, baseline, max_regression):
+    failures = []
+    for name, row in report.items():
+        before = baseline.get("routes", {}).get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and row["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            failures.append(f"{name}: p95 {before['p95_ms']}ms -> {row['p95_ms']}ms")
+        if before["rps"] and row["rps"] < before["rps"] * (1 - max_regression):
+            failures.append(f"{name}: throughput {before['rps']} -> {row['rps']} req/s")
+        if row["errors"] > before.get("errors", 0) and row["errors"] / row["requests"] > 0.01:
+            failures.append(f"{name}: {row['errors']} errors (baseline {before.get('errors', 0)})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the control center Flask routes")
+    parser.add_argument('--target', help="base URL of a running server (default: start one offline)")
+    parser.add_argument('--cookie', help="session cookie to send with --target")
+    parser.add_argument('--app-id', help="app whose pages are requested with --target")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10, help="seconds of measured load")
+    parser.add_argument('--warmup', type=float, default=2, help="seconds of unmeasured load first")
+    parser.add_argument('--routes', default=",".join(ROUTES),
+                        help=f"comma separated subset of: {', '.join(ROUTES)}")
+    parser.add_argument('--json', dest='json_path', help="write the results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help="allowed p95/throughput regression versus --baseline (default 0.2)")
+    parser.add_argument('--verbose', action='store_true', help="keep the app's own output")
+    fake_backend.add_dataset_arguments(parser)
+    args = parser.parse_args(argv)
+
+    routes = [name.strip() for name in args.routes.split(',') if name.strip()]
+    unknown = [name for name in routes if name not in ROUTES]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    servers = []
+    with quiet:
+        if args.target:
+            base_url, cookie, app_id = args.target.rstrip('/'), args.cookie, args.app_id
+        else:
+            base_url, cookie, app_id, servers = start_local_stack(args)
+        report, elapsed = measure(base_url, cookie, routes, args.concurrency, args.duration,
+                                  args.warmup, params={"app_id": app_id})
+        for server in servers:
+            server.stop()
+
+    print_report(report, elapsed, args.concurrency)
+
+    result = {
+        "concurrency": args.concurrency,
+        "duration": round(elapsed, 2),
+        "dataset": {"apps": args.apps, "modules": args.modules, "dimensions": args.dimensions,
+                    "administrators": args.administrators, "latency_ms": args.latency_ms,
+                    "error_rate": args.error_rate},
+        "routes": report,
+    }
+    if args.json_path:
+        with open(args.json_path, 'w') as handle:
+            json.dump(result, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            failures = compare(report, json.load(handle), args.max_regression)
+        if failures:
+            print("\nRegressions against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from bench import fake_backend, fake_services
+
+
+# Template micro-benchmark: renders home.html and users.html with generated grids of
+# 100/1k/10k rows, whole (render_template) and streamed (templating.stream_page), and
+# reports render time, time to the first streamed chunk and peak Python memory.
+# It also times loading each template from source versus from the Jinja bytecode cache.
+#
+#   python -m bench.template_bench
+#   python -m bench.template_bench --rows 100,1000 --repeat 10 --json templates.json
+#   python -m bench.template_bench --baseline templates.json --max-regression 0.15
+#
+# No backend is needed; the app is imported with the fake Secret Manager and every
+# template variable is passed in directly.
+
+TEMPLATES = ("home.html", "users.html")
+ROLE = "Super Administrator"
+
+
+def import_app():
+    os.environ.setdefault('SECRETS_CACHE_DIR', '')
+    os.environ.setdefault('EP_PROJECT_ID', 'bench-project')
+    os.environ.setdefault('secret_id', 'bench-api-key')
+    fake_services.install_fake_secrets()
+    import app as control_center_app
+    return control_center_app.app
+
+
+def template_context(template_name, rows):
+    dataset = fake_backend.Dataset(apps=rows, modules=2, dimensions=2, administrators=rows,
+                                   employees=rows)
+    user = dict(fake_services.BENCH_USER)
+    common = {"user": user, "full_name": user["name"], "picture": "", "role_type": ROLE,
+              "status": "True"}
+    if template_name == "home.html":
+        items = list(dataset.apps.values())
+        return dict(common, master_data=items,
+                    grid={"page": 1, "pages": 1, "limit": rows, "total": rows, "items": items})
+    return dict(common, headers=fake_backend.ADMIN_HEADERS,
+                data=list(dataset.administrators.values()))
+
+
+def render_whole(flask_app, template_name, context):
+    from flask import render_template
+    started = time.perf_counter()
+    html = render_template(template_name, **context)
+    return time.perf_counter() - started, None, len(html)
+
+
+def render_streamed(flask_app, template_name, context):
+    import templating
+    started = time.perf_counter()
+    response = templating.stream_page(template_name, **context)
+    first = None
+    size = 0
+    for chunk in response.response:
+        if first is None:
+            first = time.perf_counter() - started
+        size += len(chunk)
+    response.close()
+    return time.perf_counter() - started, first, size
+
+
+MODES = {"render": render_whole, "stream": render_streamed}
+
+
+def measure(flask_app, template_name, rows, mode, repeat):
+    context = template_context(template_name, rows)
+    render = MODES[mode]
+    with flask_app.test_request_context('/'):
+        render(flask_app, template_name, context)  # warm the compiled template
+        timings = [render(flask_app, template_name, context) for _ in range(repeat)]
+
+        tracemalloc.start()
+        render(flask_app, template_name, context)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    firsts = [first for _, first, _ in timings if first is not None]
+    return {
+        "render_ms": round(statistics.median(t for t, _, _ in timings) * 1000, 2),
+        "first_chunk_ms": round(statistics.median(firsts) * 1000, 2) if firsts else None,
+        "peak_kib": round(peak / 1024, 1),
+        "html_kib": round(timings[0][2] / 1024, 1),
+    }
+
+
+def measure_load(flask_app, template_name, repeat):
+    # Cold load of one template: parse and compile from source, or read the bytecode.
+    env = flask_app.jinja_env
+    bytecode_cache = env.bytecode_cache
+    result = {}
+    for label, cache in (("source", None), ("bytecode", bytecode_cache)):
+        if label == "bytecode" and cache is None:
+            continue
+        env.bytecode_cache = cache
+        if cache is not None:
+            env.cache.clear()
+            env.get_template(template_name)  # make sure the entry exists
+        timings = []
+        for _ in range(repeat):
+            env.cache.clear()
+            started = time.perf_counter()
+            env.get_template(template_name)
+            timings.append(time.perf_counter() - started)
+        result[f"{label}_ms"] = round(statistics.median(timings) * 1000, 2)
+    env.bytecode_cache = bytecode_cache
+    env.cache.clear()
+    return result
+
+
+def print_report(results, loads):
+    print(f"\n{'template':<12}{'rows':>7}{'mode':>8}{'render ms':>11}{'first ms':>10}"
+          f"{'peak KiB':>11}{'html KiB':>10}")
+    for key, row in results.items():
+        template_name, rows, mode = key.split(":")
+        first = "-" if row["first_chunk_ms"] is None else f"{row['first_chunk_ms']:.2f}"
+        print(f"{template_name:<12}{rows:>7}{mode:>8}{row['render_ms']:>11.2f}{first:>10}"
+              f"{row['peak_kib']:>11.1f}{row['html_kib']:>10.1f}")
+    print(f"\n{'template':<12}{'load from source ms':>21}{'from bytecode ms':>18}")
+    for template_name, row in loads.items():
+        print(f"{template_name:<12}{row['source_ms']:>21.2f}{row.get('bytecode_ms', '-'):>18}")
+
+
+def compare(results, baseline, max_regression):
+    failures = []
+    for key, row in results.items():
+        before = baseline.get("results", {}).get(key)
+        if not before:
+            continue
+        if before["render_ms"] and row["render_ms"] > before["render_ms"] * (1 + max_regression):
+            failures.append(f"{key}: render {before['render_ms']}ms -> {row['render_ms']}ms")
+        if before["peak_kib"] and row["peak_kib"] > before["peak_kib"] * (1 + max_regression):
+            failures.append(f"{key}: peak memory {before['peak_kib']}KiB -> {row['peak_kib']}KiB")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark rendering of the grid templates")
+    parser.add_argument('--rows', default="100,1000,10000", help="comma separated grid sizes")
+    parser.add_argument('--templates', default=",".join(TEMPLATES))
+    parser.add_argument('--modes', default=",".join(MODES), help="render, stream or both")
+    parser.add_argument('--repeat', type=int, default=5, help="timed renders per case (median)")
+    parser.add_argument('--json', dest='json_path', help="write the results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help="allowed render time/peak memory regression versus --baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.rows.split(',') if size.strip()]
+    templates = [name.strip() for name in args.templates.split(',') if name.strip()]
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        flask_app = import_app()
+
+    results = {}
+    for template_name in templates:
+        for rows in sizes:
+            for mode in modes:
+                results[f"{template_name}:{rows}:{mode}"] = measure(
+                    flask_app, template_name, rows, mode, args.repeat)
+    loads = {template_name: measure_load(flask_app, template_name, args.repeat)
+             for template_name in templates}
+    print_report(results, loads)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as handle:
+            json.dump({"repeat": args.repeat, "results": results, "loads": loads}, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            failures = compare(results, json.load(handle), args.max_regression)
+        if failures:
+            print("\nRegressions against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
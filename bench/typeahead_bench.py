@@ -0,0 +1,160 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from bench import fake_backend
+from employee_index import EmployeeIndex
+
+
+# Employee typeahead benchmark: builds employee_index.EmployeeIndex from generated
+# employees (bench/fake_backend.py data) and reports the bulk build time and memory,
+# the cost of incremental inserts, and query latency percentiles for HCM ID, name,
+# email and multi-word prefixes.
+#
+#   python -m bench.typeahead_bench
+#   python -m bench.typeahead_bench --employees 100000 --queries 2000 --json typeahead.json
+#   python -m bench.typeahead_bench --baseline typeahead.json --max-regression 0.25
+#
+# Runs offline; neither the app nor the fake backend is started.
+
+QUERY_KINDS = {
+    "hcm_prefix": lambda rng, e: e["hcm_id"][:rng.randint(2, 4)],
+    "hcm_full": lambda rng, e: e["hcm_id"],
+    "first_name": lambda rng, e: e["full_name"].split()[0][:rng.randint(2, 4)],
+    "last_name": lambda rng, e: e["full_name"].split()[1][:rng.randint(3, 6)],
+    "full_name": lambda rng, e: f"{e['full_name'].split()[0]} {e['full_name'].split()[1][:3]}",
+    "email": lambda rng, e: e["email"].split("@")[0][:rng.randint(5, 9)],
+    "no_match": lambda rng, e: "zq" + e["hcm_id"][-3:],
+}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def micros(seconds):
+    return round(seconds * 1e6, 1)
+
+
+def measure_build(employees):
+    # Timed without tracemalloc (it slows allocation down several times), then built again
+    # under it for the memory the index keeps.
+    started = time.perf_counter()
+    index = EmployeeIndex()
+    index.add_many(employees)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    traced = EmployeeIndex()
+    traced.add_many(employees)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+    return index, {"build_ms": round(elapsed * 1000, 1), "memory_mib": round(current / 2**20, 1),
+                   **index.stats()}
+
+
+def measure_inserts(index, count):
+    # One-at-a-time inserts of new employees (a search_hcm_id result) into the full index.
+    timings = []
+    for n in range(count):
+        employee = {"hcm_id": f"9{n:06d}", "full_name": f"New Hire{n}",
+                    "email": f"new.hire{n}@example.com", "sbu": "Malls", "job_position": "Analyst"}
+        started = time.perf_counter()
+        index.add(employee)
+        timings.append(time.perf_counter() - started)
+    return {"insert_p50_us": micros(percentile(timings, 50)),
+            "insert_p99_us": micros(percentile(timings, 99))}
+
+
+def measure_queries(index, employees, queries, limit, rng):
+    results = {}
+    for kind, make in QUERY_KINDS.items():
+        texts = [make(rng, rng.choice(employees)) for _ in range(queries)]
+        for text in texts[:50]:
+            index.search(text, limit)  # warm up
+        timings = []
+        hits = 0
+        for text in texts:
+            started = time.perf_counter()
+            found = index.search(text, limit)
+            timings.append(time.perf_counter() - started)
+            hits += bool(found)
+        results[kind] = {
+            "p50_us": micros(percentile(timings, 50)),
+            "p95_us": micros(percentile(timings, 95)),
+            "p99_us": micros(percentile(timings, 99)),
+            "mean_us": micros(statistics.mean(timings)),
+            "hit_rate": round(hits / len(texts), 3),
+        }
+    return results
+
+
+def print_report(build, inserts, queries):
+    print(f"\nbuild: {build['employees']} employees, {build['tokens']} tokens in "
+          f"{build['build_ms']} ms, {build['memory_mib']} MiB")
+    print(f"incremental insert: p50 {inserts['insert_p50_us']} us, p99 {inserts['insert_p99_us']} us")
+    print(f"\n{'query':<12}{'p50 us':>9}{'p95 us':>9}{'p99 us':>9}{'mean us':>9}{'hits':>7}")
+    for kind, row in queries.items():
+        print(f"{kind:<12}{row['p50_us']:>9}{row['p95_us']:>9}{row['p99_us']:>9}"
+              f"{row['mean_us']:>9}{row['hit_rate']:>7}")
+
+
+def compare(results, baseline, max_regression):
+    failures = []
+    before, after = baseline.get("build", {}), results["build"]
+    if before.get("build_ms") and after["build_ms"] > before["build_ms"] * (1 + max_regression):
+        failures.append(f"build {before['build_ms']}ms -> {after['build_ms']}ms")
+    for kind, row in results["queries"].items():
+        old = baseline.get("queries", {}).get(kind)
+        if old and old["p95_us"] and row["p95_us"] > old["p95_us"] * (1 + max_regression):
+            failures.append(f"{kind}: p95 {old['p95_us']}us -> {row['p95_us']}us")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the employee typeahead index")
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000, help="queries per kind")
+    parser.add_argument('--inserts', type=int, default=1000, help="incremental inserts to time")
+    parser.add_argument('--limit', type=int, default=10, help="suggestions per query")
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--json', dest='json_path', help="write the results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="allowed build time/query p95 regression versus --baseline")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    dataset = fake_backend.Dataset(apps=0, administrators=0, employees=args.employees)
+    employees = list(dataset.employees.values())
+
+    index, build = measure_build(employees)
+    queries = measure_queries(index, employees, args.queries, args.limit, rng)
+    inserts = measure_inserts(index, args.inserts)
+    print_report(build, inserts, queries)
+
+    results = {"employees": args.employees, "build": build, "inserts": inserts, "queries": queries}
+    if args.json_path:
+        with open(args.json_path, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            failures = compare(results, json.load(handle), args.max_regression)
+        if failures:
+            print("\nRegressions against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
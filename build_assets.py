@@ -0,0 +1,138 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import brotli
+import rcssmin
+import rjsmin
+
+from assets import ASSETS_DIR, BUNDLES, MANIFEST, STATIC_DIR
+
+
+# Builds the fingerprinted bundles served from /assets/ (see assets.py).
+#
+#   python build_assets.py              bundle, minify and precompress into static/dist
+#   python build_assets.py --tailwind   first recompile static/css/login.css from
+#                                       static/tailwind/login.css with the Tailwind CLI
+#                                       (pip install tailwindcss-bin, or set TAILWIND_BIN)
+#
+# Files referenced with url() from a CSS bundle (the Bootstrap Icons fonts) are
+# fingerprinted and copied too, and the references rewritten. The Dockerfile runs this
+# at image build time; static/dist is not committed.
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".json"}
+MIN_COMPRESS_SIZE = 256
+
+SOURCE_MAP = re.compile(r'/\*# sourceMappingURL=[^*]*\*/|//# sourceMappingURL=\S*')
+CSS_URL = re.compile(r'url\(\s*(["\']?)([^"\')]+)\1\s*\)')
+
+TAILWIND_INPUT = os.path.join(STATIC_DIR, "tailwind", "login.css")
+TAILWIND_OUTPUT = os.path.join(STATIC_DIR, "css", "login.css")
+
+
+def fingerprint(name, content):
+    stem, ext = os.path.splitext(os.path.basename(name).replace(" ", "-"))
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+def write_output(out_dir, filename, content):
+    sizes = {"size": len(content)}
+    with open(os.path.join(out_dir, filename), 'wb') as handle:
+        handle.write(content)
+    if os.path.splitext(filename)[1] not in COMPRESSIBLE or len(content) < MIN_COMPRESS_SIZE:
+        return sizes
+    # Only keep a variant when it actually saves bytes.
+    variants = (
+        ("gzip", ".gz", gzip.compress(content, compresslevel=9, mtime=0)),
+        ("br", ".br", brotli.compress(content, quality=11)),
+    )
+    for encoding, suffix, compressed in variants:
+        if len(compressed) < len(content):
+            with open(os.path.join(out_dir, filename + suffix), 'wb') as handle:
+                handle.write(compressed)
+            sizes[encoding] = len(compressed)
+    return sizes
+
+
+def read_source(source):
+    with open(os.path.join(STATIC_DIR, source), 'rb') as handle:
+        return handle.read()
+
+
+def rewrite_css_urls(css, source, out_dir, copied):
+    # Bundles live flat in out_dir, so relative url()s are re-pointed at fingerprinted
+    # copies of the files they reference.
+    def replace(match):
+        url = match.group(2)
+        if re.match(r'^(data:|[a-z]+://|/|#)', url):
+            return match.group(0)
+        path = re.split(r'[?#]', url, maxsplit=1)[0]
+        referenced = os.path.normpath(os.path.join(os.path.dirname(source), path))
+        if referenced not in copied:
+            content = read_source(referenced)
+            copied[referenced] = fingerprint(referenced, content)
+            write_output(out_dir, copied[referenced], content)
+        return f'url("{copied[referenced]}")'
+
+    return CSS_URL.sub(replace, css)
+
+
+def build_bundle(name, sources, out_dir, copied):
+    ext = os.path.splitext(name)[1]
+    if ext == ".css":
+        parts = [rewrite_css_urls(SOURCE_MAP.sub("", read_source(s).decode("utf-8")), s, out_dir, copied)
+                 for s in sources]
+        content = rcssmin.cssmin("\n".join(parts)).encode("utf-8")
+    elif ext == ".js":
+        parts = [rjsmin.jsmin(SOURCE_MAP.sub("", read_source(s).decode("utf-8"))) for s in sources]
+        content = ";\n".join(parts).encode("utf-8")
+    else:
+        content = b"".join(read_source(s) for s in sources)
+    filename = fingerprint(name, content)
+    return filename, write_output(out_dir, filename, content), sum(
+        os.path.getsize(os.path.join(STATIC_DIR, s)) for s in sources)
+
+
+def compile_tailwind():
+    binary = os.getenv('TAILWIND_BIN', 'tailwindcss')
+    if shutil.which(binary) is None:
+        sys.exit(f"Tailwind CLI '{binary}' not found; pip install tailwindcss-bin or set TAILWIND_BIN")
+    subprocess.run([binary, "--input", TAILWIND_INPUT, "--output", TAILWIND_OUTPUT],
+                   cwd=os.path.dirname(STATIC_DIR), check=True)
+
+
+def build(out_dir=ASSETS_DIR):
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    manifest = {}
+    copied = {}
+    for name, sources in BUNDLES.items():
+        filename, sizes, source_size = build_bundle(name, sources, out_dir, copied)
+        manifest[name] = filename
+        print(f"{filename:<40} {source_size:>9} -> {sizes['size']:>9}"
+              f"  gzip {sizes.get('gzip', '-'):>7}  br {sizes.get('br', '-'):>7}")
+    with open(os.path.join(out_dir, MANIFEST), 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build fingerprinted static bundles")
+    parser.add_argument("--tailwind", action="store_true",
+                        help="recompile static/css/login.css with the Tailwind CLI first")
+    parser.add_argument("--out", default=ASSETS_DIR, help="output directory")
+    args = parser.parse_args()
+
+    if args.tailwind:
+        compile_tailwind()
+    build(args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import codecs
+import csv
+import json
+import os
+import tempfile
+import time
+from datetime import date
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from fanout import map_concurrently
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+# Bulk enrollment of administrators from an uploaded CSV.
+#
+# The file is read one row at a time (csv over the upload stream) and each row is
+# validated as it arrives: required fields, role, ticket number, access dates, HCM IDs
+# repeated in the file or already enrolled. Valid rows are sent upstream in batches of
+# BULK_IMPORT_CONCURRENCY concurrent insert_enroll_administrator calls; only the batch
+# in flight is kept in memory. run_import() yields one event per row plus a progress
+# event per batch and a closing summary, which app.py streams back as NDJSON.
+#
+# A sent row ends up "enrolled", "failed" (upstream refused it) or "unknown" (no answer,
+# or no answer before the deadline: the enrollment may still have landed, so the row is
+# checked in the grid rather than imported again).
+#
+# Columns are the enroll form's fields (hcm_id, full_name, email, sbu, job_position,
+# ticket_number, role_type, access_start_date, access_end_date) or the administrators
+# grid's headers ("HCM ID", "Full Name", ...). Dates are YYYY-MM-DD.
+#
+# Configuration (environment):
+#   BULK_IMPORT_CONCURRENCY   upstream writes in flight at once (default 4)
+#   BULK_IMPORT_MAX_ROWS      rows accepted per file, the rest are rejected (default 2000)
+#   BULK_IMPORT_DEADLINE      seconds a batch may take before its unfinished rows are
+#                             reported as unknown (default 60)
+#   BULK_IMPORT_MAX_BYTES     largest upload accepted, bigger ones get a 413 before any
+#                             row is read (default 5 MiB)
+
+CONCURRENCY = max(int(os.getenv('BULK_IMPORT_CONCURRENCY', 4)), 1)
+MAX_ROWS = int(os.getenv('BULK_IMPORT_MAX_ROWS', 2000))
+DEADLINE = float(os.getenv('BULK_IMPORT_DEADLINE', 60))
+MAX_BYTES = int(os.getenv('BULK_IMPORT_MAX_BYTES', 5 * 2**20))
+
+REQUIRED_FIELDS = ("hcm_id", "full_name", "email", "sbu", "job_position", "ticket_number",
+                   "role_type", "access_start_date", "access_end_date")
+ROLES = ("Administrator", "Super Administrator")
+HEADER_ALIASES = {
+    "hcm id": "hcm_id",
+    "full name": "full_name",
+    "email address": "email",
+    "job position": "job_position",
+    "ticket number": "ticket_number",
+    "role": "role_type",
+    "role type": "role_type",
+    "access start date": "access_start_date",
+    "access end date": "access_end_date",
+}
+
+
+def normalize_header(name):
+    key = " ".join(str(name or "").replace("_", " ").split()).lower()
+    return HEADER_ALIASES.get(key, key.replace(" ", "_"))
+
+
+def spool(upload):
+    # Flask closes request.files when the view returns, before a streamed response has
+    # read them, so an uploaded file is copied to one the response owns (kept in memory
+    # up to 1 MiB, on disk beyond that). Stops at MAX_BYTES with a 413.
+    spooled = tempfile.SpooledTemporaryFile(max_size=2**20)
+    copied = 0
+    while True:
+        chunk = upload.read(64 * 1024)
+        if not chunk:
+            break
+        copied += len(chunk)
+        if copied > MAX_BYTES:
+            spooled.close()
+            raise RequestEntityTooLarge()
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def read_rows(stream, encoding="utf-8-sig"):
+    # Yields (line number, row dict) from a binary CSV stream without reading it all in.
+    reader = csv.reader(codecs.iterdecode(stream, encoding))
+    headers = None
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        if headers is None:
+            headers = [normalize_header(value) for value in values]
+            continue
+        yield reader.line_num, {header: value.strip() for header, value in zip(headers, values)
+                                if header}
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def validate(row, today=None):
+    errors = [f"{field} is required" for field in REQUIRED_FIELDS if not row.get(field)]
+    if row.get("role_type") and row["role_type"] not in ROLES:
+        errors.append(f"role_type must be one of: {', '.join(ROLES)}")
+    if row.get("ticket_number") and not row["ticket_number"].isdigit():
+        errors.append("ticket_number must contain only digits")
+    if row.get("email") and "@" not in row["email"]:
+        errors.append("email is not a valid email address")
+
+    start = _parse_date(row.get("access_start_date"))
+    end = _parse_date(row.get("access_end_date"))
+    if row.get("access_start_date") and start is None:
+        errors.append("access_start_date must be a YYYY-MM-DD date")
+    if row.get("access_end_date") and end is None:
+        errors.append("access_end_date must be a YYYY-MM-DD date")
+    if start and end and end < start:
+        errors.append("access_end_date is before access_start_date")
+    if end and end < (today or date.today()):
+        errors.append("access_end_date is already past")
+    return errors
+
+
+def _send(job):
+    enroll, row = job
+    return enroll(row)
+
+
+def _flush(batch, enroll, totals):
+    results, _ = map_concurrently(_send, [(enroll, row) for _, row in batch],
+                                  deadline=DEADLINE, default=None)
+    for (line, row), result in zip(batch, results):
+        if isinstance(result, dict) and result.get("status") == "success":
+            totals["enrolled"] += 1
+            yield {"type": "row", "line": line, "hcm_id": row["hcm_id"], "status": "enrolled",
+                   "message": result.get("message", "")}
+        elif result is None:
+            totals["unknown"] += 1
+            yield {"type": "row", "line": line, "hcm_id": row["hcm_id"], "status": "unknown",
+                   "message": "No answer from the control_center API; check the grid before retrying this row"}
+        else:
+            totals["failed"] += 1
+            message = (result.get("message") if isinstance(result, dict) else None) or \
+                "The control_center API refused the enrollment"
+            yield {"type": "row", "line": line, "hcm_id": row["hcm_id"], "status": "failed",
+                   "message": message}
+
+
+def run_import(rows, enroll, is_enrolled, dry_run=False):
+    # `rows` from read_rows, `enroll(row)` returns the upstream response dict (or None),
+    # `is_enrolled(hcm_id)` tells whether the HCM ID is already an administrator.
+    started = time.perf_counter()
+    totals = {"rows": 0, "valid": 0, "invalid": 0, "enrolled": 0, "failed": 0, "unknown": 0}
+    seen = {}
+    batch = []
+    today = date.today()
+
+    def progress():
+        return dict(totals, type="progress", elapsed=round(time.perf_counter() - started, 2))
+
+    try:
+        for line, row in rows:
+            totals["rows"] += 1
+            if totals["rows"] > MAX_ROWS:
+                totals["rows"] -= 1
+                yield {"type": "error", "line": line,
+                       "message": f"Only the first {MAX_ROWS} rows of a file are imported"}
+                break
+
+            errors = validate(row, today)
+            hcm_id = row.get("hcm_id", "")
+            if hcm_id in seen:
+                errors.append(f"duplicate of the HCM ID on line {seen[hcm_id]}")
+            elif hcm_id:
+                seen[hcm_id] = line
+                if is_enrolled(hcm_id):
+                    errors.append("already an administrator")
+
+            if errors:
+                totals["invalid"] += 1
+                yield {"type": "row", "line": line, "hcm_id": hcm_id, "status": "invalid",
+                       "message": "; ".join(errors)}
+                continue
+
+            totals["valid"] += 1
+            if dry_run:
+                yield {"type": "row", "line": line, "hcm_id": hcm_id, "status": "valid",
+                       "message": ""}
+                continue
+
+            batch.append((line, row))
+            if len(batch) >= CONCURRENCY:
+                yield from _flush(batch, enroll, totals)
+                batch = []
+                yield progress()
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Rows read before the bad part are still imported.
+        logger.warning("Unreadable bulk import file", extra={"error": str(e)})
+        yield {"type": "error", "line": None, "message": f"Could not read the rest of the file: {e}"}
+    except RequestEntityTooLarge:
+        # A body without Content-Length that runs past MAX_BYTES while it is read.
+        logger.warning("Bulk import file too large", extra={"max_bytes": MAX_BYTES})
+        yield {"type": "error", "line": None,
+               "message": f"The file is larger than {MAX_BYTES} bytes, the rest was not read"}
+
+    if batch:
+        yield from _flush(batch, enroll, totals)
+    summary = progress()
+    summary.update(type="summary", dry_run=dry_run)
+    yield summary
+
+
+def ndjson(events):
+    for event in events:
+        yield json.dumps(event, separators=(",", ":")) + "\n"
@@ -0,0 +1,310 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from flask import g, has_app_context
+
+from metrics import observe_cache
+
+
+# Small process-level TTL caches shared by the upstream wrappers in functions.py.
+# Every cache registers itself in CACHES so hit/miss counts can be reported later.
+#
+# A StaleWhileRevalidateCache with a fallback_ttl keeps the last good value of each key
+# after it expires. When the upstream then fails (error, timeout, open circuit) the
+# request gets that value instead of an error page; init_app marks such responses with
+# an X-Stale-Data header and gives templates `stale_data_age` for a warning banner.
+# With a failure_ttl, a failed load is also remembered for that many seconds, so while
+# the upstream is down requests get the fallback (or the failure) without each making
+# its own call.
+
+CACHES = {}
+
+
+class TTLCache:
+
+    def __init__(self, name, ttl, maxsize=1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                observe_cache(self.name, "hit")
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            observe_cache(self.name, "miss")
+            return default
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (expires_at, value)
+
+    def _evict(self):
+        # Drop expired entries first, then the entry closest to expiry.
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._data.items() if exp <= now]:
+            del self._data[key]
+        if len(self._data) >= self.maxsize:
+            del self._data[min(self._data, key=lambda k: self._data[k][0])]
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+def env_ttl(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def digest(value):
+    # Stable content hash of JSON-like data, the same in every worker process.
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def _loaded(value):
+    return value is not None and value is not False
+
+
+class StaleWhileRevalidateCache:
+    # Entries are fresh for `ttl` seconds and then served stale for up to `stale_ttl`
+    # more seconds while one background refresh replaces them. A loader result of
+    # None/False is treated as a failed load and never cached (empty lists are cached). Writes (set/update/
+    # invalidate) bump a per-key epoch so a load that started before the write can
+    # never put older data back.
+
+    def __init__(self, name, ttl, stale_ttl, fallback_ttl=0, failure_ttl=0):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.fallback_ttl = fallback_ttl
+        self.failure_ttl = failure_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self._data = {}
+        self._refreshing = set()
+        self._epochs = {}
+        self._digests = {}
+        self._last_good = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def get_or_load(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                fresh_until, stale_until, value = entry
+                if now < fresh_until:
+                    self.hits += 1
+                    observe_cache(self.name, "hit")
+                    return value
+                if now < stale_until:
+                    self.stale_hits += 1
+                    observe_cache(self.name, "stale")
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh,
+                                         args=(key, loader, self._epochs.get(key, 0)),
+                                         name=f"{self.name}-refresh", daemon=True).start()
+                    return value
+                del self._data[key]
+            self.misses += 1
+            observe_cache(self.name, "miss")
+            failure = self._failures.get(key)
+            if failure is not None and now < failure[0]:
+                failed = failure[1]
+            else:
+                failure = None
+            epoch = self._epochs.get(key, 0)
+
+        if failure is not None:
+            return self._fallback(key, failed)
+        value = loader()
+        if _loaded(value):
+            self._store(key, value, epoch)
+            return value
+        if self.failure_ttl > 0:
+            with self._lock:
+                if self._epochs.get(key, 0) == epoch:
+                    self._failures[key] = (time.monotonic() + self.failure_ttl, value)
+        return self._fallback(key, value)
+
+    def _fallback(self, key, failed):
+        # Last good value of `key` if the load failed and it is recent enough, else `failed`.
+        if self.fallback_ttl <= 0:
+            return failed
+        with self._lock:
+            last = self._last_good.get(key)
+        if last is None:
+            return failed
+        value, stored_at = last
+        age = time.time() - stored_at
+        if age > self.fallback_ttl:
+            return failed
+        observe_cache(self.name, "fallback")
+        note_stale(self.name, age)
+        return value
+
+    def prime(self, key, loader):
+        # Load `key` ahead of use unless it is already fresh. Not counted as a hit or
+        # miss, so the hit rate only reflects real reads. Returns "cached", "loaded"
+        # or "failed".
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return "cached"
+            epoch = self._epochs.get(key, 0)
+        value = loader()
+        if not _loaded(value):
+            return "failed"
+        self._store(key, value, epoch)
+        return "loaded"
+
+    def _refresh(self, key, loader, epoch):
+        try:
+            value = loader()
+            if _loaded(value) and self._store(key, value, epoch):
+                with self._lock:
+                    self.refreshes += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key, value, epoch):
+        now = time.monotonic()
+        with self._lock:
+            if self._epochs.get(key, 0) != epoch:
+                return False
+            self._data[key] = (now + self.ttl, now + self.ttl + self.stale_ttl, value)
+            self._failures.pop(key, None)
+            self._remember(key, value)
+            return True
+
+    def _remember(self, key, value):
+        if self.fallback_ttl > 0:
+            self._last_good[key] = (value, time.time())
+
+    def _bump(self, key):
+        self._epochs[key] = self._epochs.get(key, 0) + 1
+        self._failures.pop(key, None)
+
+    def version(self, key, value):
+        # Content digest of `value` as returned by get_or_load(key), for ETags. It is
+        # computed once per stored value; a value that is no longer the cached one is
+        # hashed on the spot so the version always matches the data the caller has.
+        with self._lock:
+            cached = self._digests.get(key)
+            if cached is not None and cached[0] is value:
+                return cached[1]
+            entry = self._data.get(key)
+            current = entry is not None and entry[2] is value
+        version = digest(value)
+        if current:
+            with self._lock:
+                self._digests[key] = (value, version)
+        return version
+
+    def peek(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[2] if entry is not None else None
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            self._bump(key)
+            self._data[key] = (now + self.ttl, now + self.ttl + self.stale_ttl, value)
+            self._remember(key, value)
+
+    def update(self, key, patch):
+        # Apply `patch(value) -> value` to a cached entry without changing its expiry.
+        with self._lock:
+            self._bump(key)
+            entry = self._data.get(key)
+            if entry is None:
+                # The fallback copy would miss this write, so don't serve it any more.
+                self._last_good.pop(key, None)
+                return False
+            fresh_until, stale_until, value = entry
+            value = patch(value)
+            self._data[key] = (fresh_until, stale_until, value)
+            self._remember(key, value)
+            return True
+
+    def invalidate(self, key):
+        with self._lock:
+            self._bump(key)
+            self._data.pop(key, None)
+            self._digests.pop(key, None)
+            self._last_good.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._data):
+                self._bump(key)
+            self._data.clear()
+            self._digests.clear()
+            self._last_good.clear()
+            self._failures.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses,
+                    "stale_hits": self.stale_hits, "refreshes": self.refreshes}
+
+
+def note_stale(name, age):
+    # Record on the request that `name` was served from the fallback copy, `age` seconds old.
+    if has_app_context():
+        stale = g.setdefault("stale_data", {})
+        stale[name] = max(stale.get(name, 0), age)
+
+
+def _stale_data_header(response):
+    stale = g.get("stale_data")
+    if stale:
+        response.headers["X-Stale-Data"] = ", ".join(
+            f"{name};age={int(age)}" for name, age in sorted(stale.items()))
+    return response
+
+
+def _stale_data_context():
+    stale = g.get("stale_data")
+    return {"stale_data_age": int(max(stale.values())) if stale else None}
+
+
+def init_app(app):
+    app.after_request(_stale_data_header)
+    app.context_processor(_stale_data_context)
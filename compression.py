@@ -0,0 +1,93 @@
+import gzip
+import os
+import time
+import zlib
+
+import brotli
+from flask import request
+
+import timing
+
+
+# Negotiated gzip/brotli compression of dynamic responses (rendered pages, JSON, the
+# /metrics text). Static bundles under /assets/ are already precompressed. Streamed
+# responses are compressed chunk by chunk, each chunk flushed so it still reaches the
+# browser straight away. A strong ETag gets the encoding appended ("<tag>-br"), as the
+# compressed body is a different representation.
+#
+# Configuration (environment):
+#   COMPRESS_MIN_SIZE         smallest body in bytes worth compressing (default 1024)
+#   COMPRESS_LEVEL            gzip level (default 6)
+#   COMPRESS_BROTLI_QUALITY   brotli quality, 0-11 (default 4; higher costs much more CPU)
+#   COMPRESS                  "0" to turn compression off
+
+MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/plain", "text/css", "text/javascript", "text/csv",
+    "application/json", "application/javascript", "image/svg+xml",
+}
+ENCODINGS = ["br", "gzip"]
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_stream(chunks, encoding):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def compress_response(response):
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        original = response.response
+        response.response = compress_stream(response.iter_encoded(), encoding)
+        if hasattr(original, "close"):
+            response.call_on_close(original.close)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+        started = time.perf_counter()
+        response.set_data(compress(data, encoding))
+        timing.record("compress", time.perf_counter() - started)
+    response.headers["Content-Encoding"] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def init_app(app):
+    if os.getenv('COMPRESS', '1') != '0':
+        app.after_request(compress_response)
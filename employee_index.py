@@ -0,0 +1,201 @@
+import bisect
+import heapq
+import re
+import sys
+import threading
+
+
+# In-process typeahead index of employees for the enroll administrator form.
+#
+# Each employee is indexed under a few lower-case tokens: the HCM ID, every word of the
+# full name and the email's local part (whole and split into words). The tokens are kept
+# in one sorted list, so a prefix query is two binary searches plus a walk over the
+# matching slice, well under a millisecond at 100k employees (bench/typeahead_bench.py).
+# A query of several words ("ana rey") walks the narrowest word's slice and keeps the
+# employees that also have a token starting with each other word; those checks are one
+# substring search in the employee's tokens joined into a single string. A query of
+# words without spaces ("ana.reyes", "reyes,ana") is also looked up whole, as an email's
+# local part, and those matches are listed first.
+#
+# The index only knows the employees it has been given: functions.py feeds it the
+# administrators grid and every employee the control_center API returns from
+# search_hcm_id, and asks the API about full HCM IDs it does not have yet.
+
+FIELDS = ("hcm_id", "full_name", "email", "sbu", "job_position")
+# load_administrator rows use the grid's column names.
+ADMIN_FIELDS = {"HCM ID": "hcm_id", "Full Name": "full_name", "Email Address": "email",
+                "SBU": "sbu", "Job Position": "job_position"}
+
+_WORD = re.compile(r"[^\W_]+")
+_END = "\U0010ffff"
+_SEP = "\x00"
+
+
+def normalize(row):
+    # Employee dict from search_hcm_id or an administrators grid row -> FIELDS, or None.
+    if not isinstance(row, dict):
+        return None
+    if "HCM ID" in row:
+        row = {field: row.get(column) for column, field in ADMIN_FIELDS.items()}
+    hcm_id = str(row.get("hcm_id") or "").strip()
+    if not hcm_id:
+        return None
+    record = {field: str(row.get(field) or "").strip() for field in FIELDS}
+    record["hcm_id"] = hcm_id
+    return record
+
+
+def tokens(record):
+    found = {record["hcm_id"].lower()}
+    found.update(_WORD.findall(record["full_name"].lower()))
+    local = record["email"].lower().split("@", 1)[0]
+    if local:
+        found.add(local)
+        found.update(_WORD.findall(local))
+    # Interned, as the same first and last names come back thousands of times.
+    return tuple(sorted(sys.intern(token) for token in found))
+
+
+def _joined(found):
+    # "\0ana\0reyes\0..." so `"\0" + prefix in joined` tests every token at once.
+    return _SEP + _SEP.join(found)
+
+
+def _split(joined):
+    return joined[1:].split(_SEP)
+
+
+class EmployeeIndex:
+
+    def __init__(self):
+        self._records = {}
+        self._tokens = {}
+        self._keys = []
+        self._ids = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, hcm_id):
+        return self._records.get(str(hcm_id).strip())
+
+    def add(self, row):
+        # Insert or update one employee. Returns True when the index changed.
+        record = normalize(row)
+        if record is None:
+            return False
+        with self._lock:
+            hcm_id = record["hcm_id"]
+            if self._records.get(hcm_id) == record:
+                return False
+            new_tokens = tokens(record)
+            old_tokens = _split(self._tokens[hcm_id]) if hcm_id in self._tokens else ()
+            for token in old_tokens:
+                if token not in new_tokens:
+                    self._remove_key(token, hcm_id)
+            for token in new_tokens:
+                if token not in old_tokens:
+                    i = bisect.bisect_right(self._keys, token)
+                    self._keys.insert(i, token)
+                    self._ids.insert(i, hcm_id)
+            self._records[hcm_id] = record
+            self._tokens[hcm_id] = _joined(new_tokens)
+            return True
+
+    def add_many(self, rows):
+        # Inserting into the middle of the key lists moves everything after it, so a
+        # batch (the administrators grid, the first load) is sorted on its own and merged
+        # in with one pass instead.
+        rows = list(rows or [])
+        if len(rows) < 64:
+            return sum(self.add(row) for row in rows)
+        with self._lock:
+            added = {}
+            for row in rows:
+                record = normalize(row)
+                if record is None or self._records.get(record["hcm_id"]) == record:
+                    continue
+                hcm_id = record["hcm_id"]
+                if hcm_id in self._tokens:
+                    self.remove(hcm_id)
+                added[hcm_id] = record
+            pairs = []
+            for hcm_id, record in added.items():
+                found = tokens(record)
+                self._records[hcm_id] = record
+                self._tokens[hcm_id] = _joined(found)
+                pairs.extend((token, hcm_id) for token in found)
+            if pairs:
+                pairs.sort()
+                merged = list(heapq.merge(zip(self._keys, self._ids), pairs))
+                self._keys = [token for token, _ in merged]
+                self._ids = [hcm_id for _, hcm_id in merged]
+            return len(added)
+
+    def remove(self, hcm_id):
+        hcm_id = str(hcm_id).strip()
+        with self._lock:
+            if self._records.pop(hcm_id, None) is None:
+                return False
+            for token in _split(self._tokens.pop(hcm_id)):
+                self._remove_key(token, hcm_id)
+            return True
+
+    def _remove_key(self, token, hcm_id):
+        i = bisect.bisect_left(self._keys, token)
+        while i < len(self._keys) and self._keys[i] == token:
+            if self._ids[i] == hcm_id:
+                del self._keys[i]
+                del self._ids[i]
+                return
+            i += 1
+
+    def _range(self, term):
+        return (bisect.bisect_left(self._keys, term),
+                bisect.bisect_left(self._keys, term + _END))
+
+    def search(self, query, limit=10):
+        query = str(query or "").strip().lower()
+        terms = list(dict.fromkeys(_WORD.findall(query)))
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            results = []
+            seen = set()
+            if len(terms) > 1 and not any(char.isspace() for char in query):
+                # "ana.reyes12" may also be a whole token (an email's local part); those
+                # matches come first, then the ones that have every word ("reyes,ana").
+                self._match([query], limit, results, seen)
+            self._match(terms, limit, results, seen)
+            return results
+
+    def _match(self, terms, limit, results, seen):
+        # Appends to `results` (up to `limit`) the employees with a token starting with
+        # each term, skipping the hcm_ids already in `seen` (the results so far).
+        ranges = [(self._range(term), term) for term in terms]
+        (lo, hi), first = min(ranges, key=lambda item: item[0][1] - item[0][0])
+        others = [_SEP + term for _, term in ranges if term != first]
+        checked = set()
+        for i in range(lo, hi):
+            if len(results) >= limit:
+                return
+            hcm_id = self._ids[i]
+            if hcm_id in seen or hcm_id in checked:
+                continue
+            checked.add(hcm_id)
+            joined = self._tokens[hcm_id]
+            if all(term in joined for term in others):
+                seen.add(hcm_id)
+                results.append(self._records[hcm_id])
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._tokens.clear()
+            self._keys = []
+            self._ids = []
+
+    def stats(self):
+        with self._lock:
+            return {"employees": len(self._records), "tokens": len(self._keys)}
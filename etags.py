@@ -0,0 +1,59 @@
+import glob
+import hashlib
+import os
+
+from flask import Response, g, make_response, request
+
+import assets
+from cache import digest
+
+
+# Strong ETags for rendered pages and JSON, derived from the data version behind them
+# (see StaleWhileRevalidateCache.version) plus the templates and asset bundles of this
+# build, so a repeat navigation with nothing changed gets a 304 without rendering.
+# Parts that differ per user (name, picture, role) must be passed in by the route.
+#
+# Configuration (environment):
+#   ETAGS   "0" to always render
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+CACHE_CONTROL = "private, no-cache"
+ENCODING_SUFFIXES = ("", "-br", "-gzip")
+
+_build = {}
+
+
+def build_version():
+    # Same in every worker of a deploy; changes whenever a template or bundle does.
+    if "version" not in _build:
+        hasher = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, "*.html"))):
+            with open(path, 'rb') as handle:
+                hasher.update(handle.read())
+        hasher.update(digest(assets.manifest).encode())
+        _build["version"] = hasher.hexdigest()[:16]
+    return _build["version"]
+
+
+def page_etag(*parts):
+    return digest([build_version(), *parts])
+
+
+def conditional(etag, render):
+    # `render` is only called when the client's copy (any encoding of it) is out of date.
+    # Data served from a fallback copy (cache.note_stale) is never revalidated as current.
+    if os.getenv('ETAGS', '1') == '0' or g.get("stale_data"):
+        return render()
+
+    for suffix in ENCODING_SUFFIXES:
+        if request.if_none_match.contains(etag + suffix):
+            response = Response(status=304)
+            response.set_etag(etag + suffix)
+            response.headers["Cache-Control"] = CACHE_CONTROL
+            return response
+
+    response = make_response(render())
+    if response.status_code == 200 and not g.get("stale_data"):
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
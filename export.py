@@ -0,0 +1,251 @@
+import csv
+import io
+import math
+import os
+import re
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+
+# CSV and XLSX exports of the applications and administrators grids, written one row at
+# a time: csv_stream() and xlsx_stream() are generators of bytes chunks for a streamed
+# Flask response, so the file is never held in memory whole, however many rows it has.
+#
+# XLSX is built with the standard library (zipfile): one worksheet of inline strings,
+# deflated into a zip that is written as it is read, with the sizes of each part in
+# data descriptors instead of a seek back. Excel, LibreOffice and Google Sheets open it.
+#
+# In CSV, text starting with = + - @ tab or CR that is not a number is prefixed with ' so
+# a spreadsheet does not run it as a formula (values come from upstream and users). XLSX
+# cells are written as inline strings, which are never evaluated, so they are left as is;
+# NaN and infinite numbers, which Excel rejects in a number cell, are written as text.
+#
+# Configuration (environment):
+#   EXPORT_CHUNK_ROWS  rows per chunk handed to the response (default 200)
+
+CHUNK_ROWS = max(int(os.getenv('EXPORT_CHUNK_ROWS', 200)), 1)
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _yes_no(value):
+    return "Yes" if value else "No"
+
+
+# (header, row -> value) for master data rows, in the home page grid's order.
+APP_COLUMNS = (
+    ("Application ID", lambda row: row.get("app_id")),
+    ("Application Name", lambda row: row.get("app_name")),
+    ("Application URL", lambda row: row.get("app_url")),
+    ("Application Owner", lambda row: row.get("app_owner")),
+    ("Status", lambda row: "Active" if row.get("status") else "Inactive"),
+    ("Dimensions", lambda row: row.get("dimension_count") or 0),
+    ("Modules", lambda row: row.get("module_count") or 0),
+    ("Read", lambda row: _yes_no(row.get("can_read"))),
+    ("Write", lambda row: _yes_no(row.get("can_write"))),
+    ("Update", lambda row: _yes_no(row.get("can_update"))),
+    ("Delete", lambda row: _yes_no(row.get("can_delete"))),
+    ("Created By", lambda row: row.get("created_by")),
+    ("Date Created", lambda row: row.get("date_created")),
+)
+# Added with expand=1: the app's modules and dimensions, one per line in the cell.
+APP_DETAIL_COLUMNS = (
+    ("Module Names", lambda row: "\n".join(
+        str(module.get("module_name") or "") for module in row.get("modules") or [])),
+    ("Module URLs", lambda row: "\n".join(
+        str(module.get("url") or "") for module in row.get("modules") or [])),
+    ("Dimension Names", lambda row: "\n".join(
+        str(dimension.get("dimension_name") or "") for dimension in row.get("dimensions") or [])),
+)
+
+
+def admin_columns(headers):
+    # The load_administrator headers, without the internal id.
+    return tuple((header, lambda row, header=header: row.get(header))
+                 for header in headers if header != "id")
+
+
+def filename(name, file_format):
+    return f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{file_format}"
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return _yes_no(value)
+    return value
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _csv_cell(value):
+    value = _cell(value)
+    if not isinstance(value, str):
+        return value
+    if value[:1] in ("=", "@", "\t", "\r") or \
+            (value[:1] in ("+", "-") and value != "-" and not _is_number(value)):
+        return "'" + value
+    return value
+
+
+def _values(columns, row, cell=_cell):
+    return [cell(get(row)) for _, get in columns]
+
+
+def csv_stream(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # The BOM makes Excel read the file as UTF-8.
+    buffer.write("\ufeff")
+    writer.writerow([header for header, _ in columns])
+    for count, row in enumerate(rows, 1):
+        writer.writerow(_values(columns, row, _csv_cell))
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+class _Sink:
+    # Write-only file for ZipFile that hands what was written to the generator. Having no
+    # seek/tell makes zipfile write data descriptors rather than seek back.
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>')
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>')
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>')
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>')
+# Style 0 is the default, style 1 the bold header row, style 2 wraps multi-line cells.
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1">'
+    '<alignment wrapText="1" vertical="top"/></xf></cellXfs>'
+    '</styleSheet>')
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+    'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+    '<sheetData>')
+_SHEET_END = '</sheetData></worksheet>'
+
+# Characters XML 1.0 does not allow, even escaped.
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_row(number, values, letters, style=0):
+    cells = []
+    for letter, value in zip(letters, values):
+        ref = f"{letter}{number}"
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            continue
+        text = escape(_INVALID_XML.sub("", str(value)))
+        cell_style = style or (2 if "\n" in text else 0)
+        styled = f' s="{cell_style}"' if cell_style else ""
+        cells.append(f'<c r="{ref}" t="inlineStr"{styled}><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def xlsx_stream(columns, rows, sheet_name="Sheet1"):
+    sink = _Sink()
+    letters = [_column_letter(index) for index in range(len(columns))]
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        workbook.writestr("_rels/.rels", _ROOT_RELS)
+        workbook.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31])))
+        workbook.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        workbook.writestr("xl/styles.xml", _STYLES)
+        with workbook.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(_SHEET_START.encode("utf-8"))
+            sheet.write(_xlsx_row(1, [header for header, _ in columns], letters, style=1).encode("utf-8"))
+            for number, row in enumerate(rows, 2):
+                sheet.write(_xlsx_row(number, _values(columns, row), letters).encode("utf-8"))
+                if number % CHUNK_ROWS == 0:
+                    # Deflate holds some output back, so a chunk can be empty.
+                    data = sink.drain()
+                    if data:
+                        yield data
+            sheet.write(_SHEET_END.encode("utf-8"))
+    yield sink.drain()
+
+
+def stream(file_format, columns, rows, sheet_name="Sheet1"):
+    if file_format == "xlsx":
+        return xlsx_stream(columns, rows, sheet_name)
+    return csv_stream(columns, rows)
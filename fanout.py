@@ -0,0 +1,78 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+# Run the independent upstream reads a page needs at the same time on a small shared
+# executor, bounded by a page-level deadline. Calls that fail or miss the deadline
+# fall back to their default and are reported back so the page can say so.
+#
+# Configuration (environment):
+#   FANOUT_WORKERS   threads shared by all requests in the process (default 8)
+#   FANOUT_DEADLINE  default page deadline in seconds (default 15)
+
+FANOUT_WORKERS = int(os.getenv('FANOUT_WORKERS', 8))
+FANOUT_DEADLINE = float(os.getenv('FANOUT_DEADLINE', 15))
+
+_executor = {"pid": None, "pool": None}
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    # One pool per process; a pool inherited through fork has no live threads.
+    pid = os.getpid()
+    if _executor["pid"] != pid:
+        with _executor_lock:
+            if _executor["pid"] != pid:
+                _executor["pool"] = ThreadPoolExecutor(
+                    max_workers=FANOUT_WORKERS, thread_name_prefix="fanout")
+                _executor["pid"] = pid
+    return _executor["pool"]
+
+
+def submit(fn, *args, **kwargs):
+    # Copy the caller's context so Flask's request/app context (session, g) is visible.
+    context = contextvars.copy_context()
+    return get_executor().submit(context.run, fn, *args, **kwargs)
+
+
+# Run {name: (fn, *args)} concurrently. Returns (results, missing) where missing lists
+# the names that raised or did not finish before the deadline; their result is
+# defaults[name].
+def fetch_concurrently(calls, deadline=None, defaults=None):
+    defaults = defaults or {}
+    deadline = FANOUT_DEADLINE if deadline is None else deadline
+
+    futures = {name: submit(call[0], *call[1:]) for name, call in calls.items()}
+    done, _ = wait(futures.values(), timeout=deadline)
+
+    results = {}
+    missing = []
+    for name, future in futures.items():
+        if future in done and future.exception() is None:
+            results[name] = future.result()
+            continue
+        if future in done:
+            logger.warning("Concurrent call failed", extra={
+                "call": name, "error": str(future.exception())})
+        else:
+            future.cancel()
+            logger.warning("Concurrent call missed the page deadline", extra={
+                "call": name, "deadline": deadline})
+        results[name] = defaults.get(name)
+        missing.append(name)
+
+    return results, missing
+
+
+# Apply fn to every item with bounded concurrency, keeping input order.
+def map_concurrently(fn, items, deadline=None, default=None):
+    calls = {index: (fn, item) for index, item in enumerate(items)}
+    results, missing = fetch_concurrently(
+        calls, deadline=deadline, defaults={index: default for index in calls})
+    return [results[index] for index in range(len(calls))], [items[index] for index in missing]
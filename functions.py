@@ -1,64 +1,90 @@
-import email
 from flask import session, request
-import requests
-import json
+import re
 import uuid
 from datetime import datetime
 import os
-from google.cloud import secretmanager
 import sys
-import traceback
 from dotenv import load_dotenv
-import pytz
-from zoneinfo import ZoneInfo
+from upstream import HeaderAuth, UpstreamClient
+from audit import create_shipper
+from auth import cache_admin, get_cached_admin, invalidate_admin
+from cache import StaleWhileRevalidateCache, TTLCache, env_ttl
+from employee_index import EmployeeIndex
+from bulk_import import read_rows, run_import
+from timing import timed
+from fanout import map_concurrently
+from grid import AdminIndex
+from secrets_provider import secret_store
+from logs import get_logger
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
 secret_project_id = os.getenv('EP_PROJECT_ID')
 secret_id = os.getenv('secret_id')
 
 
-# def get_user_details():
-#     try:
-#         admin_details = session.get('admin_details')
-#         user = session.get('user')
-
-#         if not isinstance(user, dict):
-#             print("Invalid or missing 'user' in session.")
-#             user = {}
-
-#         if not isinstance(admin_details, dict):
-#             print("Invalid or missing 'admin_details' in session.")
-#             admin_details = {}
-
-#         return {
-#             "user": user,
-#             "full_name": user.get('name', 'Unknown User'),
-#             "picture": user.get('picture', '/static/default-avatar.png'),
-#             "role_type": admin_details.get("role_type", 'guest')
-#         }
-
-#     except Exception as e:
-#         print(f"Exception in get_user_details: {e}")
-#         return {
-#             "user": {},
-#             "full_name": "Unknown User",
-#             "picture": "",
-#             "role_type": "guest"
-#         }
-
-
-def get_secret(project_id: str, secret_id: str) -> str:
-    client = secretmanager.SecretManagerServiceClient()
-    secret_name = f"projects/{project_id}/secrets/{secret_id}/versions/latest"
-    response = client.access_secret_version(name=secret_name)
-    return response.payload.data.decode("UTF-8")
-
-
-api_key = get_secret(project_id=secret_project_id, secret_id=secret_id)
-
-domain = "https://control-center-ednpoints-740032229271.us-west1.run.app/control_center"
-key = api_key
+def get_api_key():
+    # Resolved on first use (and re-read after rotation) instead of at import time.
+    return secret_store.get(secret_id)
+
+
+secret_store.prefetch(secret_id)
+
+domain = os.getenv(
+    'CONTROL_CENTER_DOMAIN', "https://control-center-ednpoints-740032229271.us-west1.run.app/control_center")
+
+control_center = UpstreamClient("control_center", domain, headers={
+    'Content-Type': 'application/json'
+}, auth=HeaderAuth('X-API-KEY', get_api_key))
+job_logs = UpstreamClient("job_logs", os.getenv(
+    'AUDIT_LOG_URL', "https://dma-dev-job-logs-174874363586.us-west1.run.app"))
+audit_shipper = create_shipper(job_logs)
+
+# get_app_master_data only changes through save_application_data / delete_application,
+# which patch or invalidate this cache after a successful write.
+MASTER_DATA_KEY = "app_master_data"
+# When the control_center API fails, pages fall back to the last good copy of a cache
+# entry up to STALE_FALLBACK_TTL seconds old (0 to show the error instead).
+STALE_FALLBACK_TTL = env_ttl('STALE_FALLBACK_TTL', 86400)
+master_data_cache = StaleWhileRevalidateCache(
+    "master_data", env_ttl('MASTER_DATA_TTL', 60), env_ttl('MASTER_DATA_STALE_TTL', 300),
+    STALE_FALLBACK_TTL)
+
+# Modules and dimensions per app_id, filled when a page needs them or in bulk by
+# prefetch_app_details, and dropped when the app is saved or deleted.
+modules_cache = StaleWhileRevalidateCache(
+    "app_modules", env_ttl('APP_DETAIL_TTL', 300), env_ttl('APP_DETAIL_STALE_TTL', 900),
+    STALE_FALLBACK_TTL)
+dimensions_cache = StaleWhileRevalidateCache(
+    "app_dimensions", env_ttl('APP_DETAIL_TTL', 300), env_ttl('APP_DETAIL_STALE_TTL', 900),
+    STALE_FALLBACK_TTL)
+# load_administrator result (headers and rows of the admin grid). Patched when an
+# administrator is edited or deleted here and dropped when one is enrolled; changes made
+# elsewhere show up within ADMINISTRATORS_TTL. The grid searches go through an AdminIndex
+# of whichever result is cached. A failed load is not retried for ADMINISTRATORS_FAILURE_TTL
+# seconds.
+ADMINISTRATORS_KEY = "administrators"
+administrators_cache = StaleWhileRevalidateCache(
+    "administrators", env_ttl('ADMINISTRATORS_TTL', 30), env_ttl('ADMINISTRATORS_STALE_TTL', 120),
+    STALE_FALLBACK_TTL, env_ttl('ADMINISTRATORS_FAILURE_TTL', 5))
+_admin_index = {"entry": (None, None)}
+# Typeahead index of the employees seen in the administrators grid and search_hcm_id
+# results. A query shaped like a full HCM ID that the index does not have is looked up
+# upstream once; IDs the API does not know are remembered for EMPLOYEE_MISS_TTL seconds.
+employee_index = EmployeeIndex()
+employee_misses = TTLCache("employee_misses", env_ttl('EMPLOYEE_MISS_TTL', 300))
+HCM_ID_PATTERN = re.compile(os.getenv('HCM_ID_PATTERN', r'^\d{6,}$'))
+_indexed = {"administrators": None}
+# Upstream calls one prefetch batch keeps in flight, so it never takes over the fan-out pool
+PREFETCH_CONCURRENCY = max(int(os.getenv('PREFETCH_CONCURRENCY', 4)), 1)
+# Batch deletes call the single-item delete endpoints (there is no bulk one upstream)
+# BATCH_DELETE_CONCURRENCY at a time, for at most BATCH_DELETE_MAX ids per request.
+BATCH_DELETE_CONCURRENCY = max(int(os.getenv('BATCH_DELETE_CONCURRENCY', 4)), 1)
+BATCH_DELETE_MAX = int(os.getenv('BATCH_DELETE_MAX', 200))
+# Apps whose modules and dimensions an expanded export fetches at once
+EXPORT_CONCURRENCY = max(int(os.getenv('EXPORT_CONCURRENCY', 4)), 1)
 
 
 def validate_user(user):
@@ -66,51 +92,54 @@ def validate_user(user):
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         if not isinstance(user, dict):
-            print("Invalid user object.")
+            logger.warning("Invalid user object")
             return False
 
         user_email = user.get('email')
 
         if not user_email:
-            print("User email is missing.")
+            logger.warning("User email is missing")
             return False
 
         username = user_email.split('@')[0]
 
-        payload = json.dumps({"param": username})
-        headers = {
-            'X-API-KEY': key,
-            'Content-Type': 'application/json'
-        }
+        cached_admin = get_cached_admin(user_email)
+        if cached_admin:
+            if session.get('admin_details') != cached_admin:
+                session['admin_details'] = cached_admin
+            return True
+
+        payload = {"param": username}
 
-        url = f"{domain}/admin"
-        response = requests.post(url, headers=headers, data=payload)
+        response = control_center.read('POST', "admin", json=payload)
 
         if response.status_code != 200:
-            print(
-                f"Error validating user: {response.status_code} - {response.text}")
+            logger.warning("Error validating user", extra={
+                "status_code": response.status_code, "response": response.text[:500]})
             return False
 
         try:
             admin_list = response.json().get('data', [])
         except ValueError:
-            print("Invalid JSON response from admin API.")
+            logger.warning("Invalid JSON response from admin API")
             return False
 
         if not admin_list:
-            print("No admin details found for the user.")
+            logger.info("No admin details found for the user", extra={"username": username})
             return False
 
         admin_details = admin_list[0]
 
         if 'hcm_id' not in admin_details or 'role_type' not in admin_details:
-            print("Missing expected admin details.")
+            logger.warning("Missing expected admin details")
             return False
 
-        session['admin_details'] = {
+        admin_details = {
             'hcm_id': admin_details['hcm_id'],
             'role_type': admin_details['role_type']
         }
+        cache_admin(user_email, admin_details)
+        session['admin_details'] = admin_details
 
         log_api_activity(StartDate, "User Control Center - Validate User",
                          "Success", "", f"User {username} validated successfully.")
@@ -127,68 +156,54 @@ def validate_user(user):
 
 def log_user_activity(user, action, details):
     try:
-        url = f"{domain}/log_activity"
         payload = {
             "user": user,
             "action": action,
             "details": details
         }
-        headers = {
-            'X-API-KEY': key,
-            'Content-Type': 'application/json'
-        }
-        response = requests.post(url, headers=headers, json=payload)
+        response = control_center.post("log_activity", json=payload)
         if response.status_code == 200:
-            print(f"User activity logged successfully: {response.text}")
+            logger.debug("User activity logged", extra={"response": response.text})
         else:
-            print(
-                f"Failed to log user activity: {response.status_code} - {response.text}")
-    except Exception as e:
-        print(f"Exception during logging user activity: {e}")
+            logger.warning("Failed to log user activity", extra={
+                "status_code": response.status_code, "response": response.text[:500]})
+    except Exception:
+        logger.exception("Exception during logging user activity")
 
 
+@timed("audit")
 def log_api_activity(StartDate, LogTitle, Status, ErrorMessage, Remarks):
     try:
-        url = f"https://dma-dev-job-logs-174874363586.us-west1.run.app"
-
         EndDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        print(
-            f"Parameters being sent to log_api_activity: {StartDate}, {EndDate}, {LogTitle}, {Status}, {ErrorMessage}, {Remarks}")
-
-        payload = {
-            "data": {
-                "StartDate": StartDate,
-                "EndDate": EndDate,
-                "LogTitle": LogTitle,
-                "Status": Status,
-                "ErrorMessage": ErrorMessage,
-                "Remarks": Remarks
-            }
+        record = {
+            "StartDate": StartDate,
+            "EndDate": EndDate,
+            "LogTitle": LogTitle,
+            "Status": Status,
+            "ErrorMessage": ErrorMessage,
+            "Remarks": Remarks
         }
 
-        response = requests.post(url, json=payload)
+        logger.debug("Audit record", extra={"record": record})
 
-        if response.status_code == 200:
-            print(f"API activity logged successfully: {response.text}")
-        else:
-            print(
-                f"Failed to log API activity: {response.status_code} - {response.text}")
-    except Exception as e:
-        print(f"Exception during logging API activity: {e}")
+        # Shipped in the background by the audit shipper; never blocks the request.
+        if not audit_shipper.submit(record):
+            logger.warning("Audit queue full, dropped log record", extra={"log_title": LogTitle})
+    except Exception:
+        logger.exception("Exception during logging API activity")
 
 
-def save_application_data(function_mode, application_name, app_url, status, owner, permissions, dimensions, modules, created_by):
+def save_application_data(function_mode, application_name, app_url, status, owner, permissions, dimensions, modules, created_by, app_id=None):
     try:
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         if function_mode == "modify":
-            app_id = session.get('app_id_to_modify')
+            # Pages opened before /apps/<app_id>/edit existed still carry the id in the session
+            app_id = app_id or session.get('app_id_to_modify')
         else:
             app_id = str(uuid.uuid4())
-            print(app_id)
 
-        url = f"{domain}/save_application_data"
         payload = {
             "app_id": app_id,
             "function_mode": function_mode,
@@ -201,16 +216,34 @@ def save_application_data(function_mode, application_name, app_url, status, owne
             "modules": modules,
             "created_by": created_by
         }
-        headers = {
-            'X-API-KEY': key,
-            'Content-Type': 'application/json'
-        }
-        response = requests.post(url, headers=headers, json=payload)
+        response = control_center.post("save_application_data", json=payload)
         if response.status_code == 200:
-            print(f"Application successfully saved: {response.text}")
+            logger.info("Application saved", extra={
+                "app_id": app_id, "function_mode": function_mode})
+            logger.debug("Save application response", extra={"response": response.text})
+            if function_mode == "modify":
+                modules_cache.invalidate(app_id)
+                dimensions_cache.invalidate(app_id)
+                permissions = permissions or {}
+                master_data_cache.update(MASTER_DATA_KEY, _patch_master_row(app_id, {
+                    "app_name": application_name,
+                    "app_url": app_url,
+                    "app_owner": owner,
+                    "status": str(status).lower() == "true",
+                    "can_read": bool(permissions.get("read")),
+                    "can_write": bool(permissions.get("write")),
+                    "can_update": bool(permissions.get("update")),
+                    "can_delete": bool(permissions.get("delete")),
+                    "dimension_count": len(dimensions or []),
+                    "module_count": len(modules or [])
+                }))
+            else:
+                # New rows carry server-side fields (created date, counts), so refetch
+                master_data_cache.invalidate(MASTER_DATA_KEY)
         else:
-            print(
-                f"Failed to save application: {response.status_code} - {response.text}")
+            logger.warning("Failed to save application", extra={
+                "app_id": app_id, "status_code": response.status_code,
+                "response": response.text[:500]})
 
         log_api_activity(StartDate, "User Control Center - Save Application Data",
                          "Success", "", f"{application_name} was successfully saved.")
@@ -220,31 +253,60 @@ def save_application_data(function_mode, application_name, app_url, status, owne
         #                  "Failed", str(e), f"Saving {application_name} encountered error. Details: {str(e)}")
         log_api_error_activity(
             "User Control Center - Save Application Data function", e)
-        print(f"Exception during logging user activity: {e}")
+
+
+def _patch_master_row(app_id, fields):
+    def patch(rows):
+        return [dict(row, **fields) if row.get("app_id") == app_id else row for row in rows]
+    return patch
+
+
+def _remove_master_row(app_id):
+    return _remove_master_rows([app_id])
+
+
+def _remove_master_rows(app_ids):
+    app_ids = set(app_ids)
+
+    def patch(rows):
+        return [row for row in rows if row.get("app_id") not in app_ids]
+    return patch
 
 
 def get_master_data():
-    try:
-        StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return master_data_cache.get_or_load(MASTER_DATA_KEY, fetch_master_data)
 
-        url = f"{domain}/get_app_master_data"
 
-        headers = {
-            'X-API-KEY': key,
-            'Content-Type': 'application/json'
-        }
+def master_data_version(rows):
+    return master_data_cache.version(MASTER_DATA_KEY, rows)
+
+
+def get_app(app_id):
+    # One application's row from the cached master data, or None if it does not exist.
+    rows = get_master_data()
+    if not rows:
+        raise RuntimeError("Application master data is unavailable")
+    for row in rows:
+        if row.get("app_id") == app_id:
+            return row
+    return None
+
+
+def fetch_master_data():
+    try:
+        StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        response = requests.get(url, headers=headers)
+        response = control_center.read('GET', "get_app_master_data")
 
         if response.status_code != 200:
-            print(
-                f"Error getting master data: {response.status_code} - {response.text}")
+            logger.warning("Error getting master data", extra={
+                "status_code": response.status_code, "response": response.text[:500]})
             return False
 
         app_master_list = response.json()
 
         if not app_master_list:
-            print("No application master data found.")
+            logger.warning("No application master data found")
             return False
 
         master_details = app_master_list
@@ -266,27 +328,19 @@ def delete_application(app_id):
     try:
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        url = f"{domain}/delete_app"
-
-        payload = {
-            "app_id": app_id
-        }
-        headers = {
-            'X-API-KEY': key,
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
-
-        if response.status_code != 200:
-            print(
-                f"Error deleting application: {response.status_code} - {response.text}")
+        result = _delete_app_upstream(app_id)
+        if result is None:
             return False
 
+        if isinstance(result, dict) and result.get("status") == "success":
+            master_data_cache.update(MASTER_DATA_KEY, _remove_master_row(app_id))
+            modules_cache.invalidate(app_id)
+            dimensions_cache.invalidate(app_id)
+
         log_api_activity(StartDate, "User Control Center - Delete Application",
                          "Success", "", f"Application with ID: {app_id} was successfully deleted.")
 
-        return response.json()
+        return result
 
     except Exception as e:
         # log_api_activity(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "User Control Center - Delete Application",
@@ -296,103 +350,317 @@ def delete_application(app_id):
         return False
 
 
+# Returns the delete_app response, or None when the API answered with an error status.
+def _delete_app_upstream(app_id):
+    payload = {
+        "app_id": app_id
+    }
+
+    response = control_center.post("delete_app", json=payload)
+
+    if response.status_code != 200:
+        logger.warning("Error deleting application", extra={
+            "app_id": app_id, "status_code": response.status_code,
+            "response": response.text[:500]})
+        return None
+
+    return response.json()
+
+
+# Batch deletes. Each id ends up "deleted", "failed" (the API refused it or could not be
+# reached) or "unknown" (no answer before the fan-out deadline; the call may still land).
+# The caches are patched once for the whole batch, or dropped when an outcome is unknown,
+# and one audit record lists the outcome of the batch.
+DELETE_TIMED_OUT = ("unknown", "The delete did not finish in time; reload to check whether it was applied")
+
+
+def _delete_outcome(result, error_message):
+    if isinstance(result, dict) and result.get("status") == "success":
+        return "deleted", result.get("message", "")
+    return "failed", (result.get("message") if isinstance(result, dict) else None) or error_message
+
+
+def _delete_in_batches(delete_one, ids):
+    outcomes = []
+    for start in range(0, len(ids), BATCH_DELETE_CONCURRENCY):
+        results, _ = map_concurrently(
+            delete_one, ids[start:start + BATCH_DELETE_CONCURRENCY], default=DELETE_TIMED_OUT)
+        outcomes.extend(results)
+    return outcomes
+
+
+def _batch_delete_summary(results):
+    summary = {"requested": len(results)}
+    for outcome in ("deleted", "failed", "unknown"):
+        summary[outcome] = sum(1 for result in results if result["status"] == outcome)
+    if summary["deleted"] == summary["requested"]:
+        summary["status"] = "success"
+    elif summary["deleted"] or summary["unknown"]:
+        summary["status"] = "partial"
+    else:
+        summary["status"] = "error"
+    return summary
+
+
+def _batch_delete_remarks(results, id_key):
+    deleted = [str(result[id_key]) for result in results if result["status"] == "deleted"]
+    problems = [f"{result[id_key]} ({result['status']}: {result['message']})"
+                for result in results if result["status"] != "deleted"]
+    return f"Deleted IDs: {', '.join(deleted) or 'none'}. Not deleted: {'; '.join(problems) or 'none'}."
+
+
+def _delete_app_outcome(app_id):
+    try:
+        return _delete_outcome(_delete_app_upstream(app_id), "The application could not be deleted")
+    except Exception:
+        # Logged here only; the batch's single audit record carries the outcome.
+        logger.exception("Error deleting application", extra={"app_id": app_id})
+        return "failed", "The control_center API could not be reached"
+
+
+def delete_applications(app_ids):
+    StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    app_ids = list(dict.fromkeys(app_ids))
+
+    outcomes = _delete_in_batches(_delete_app_outcome, app_ids)
+    results = [{"app_id": app_id, "status": status, "message": message}
+               for app_id, (status, message) in zip(app_ids, outcomes)]
+    summary = _batch_delete_summary(results)
+
+    deleted = [result["app_id"] for result in results if result["status"] == "deleted"]
+    touched = [result["app_id"] for result in results if result["status"] != "failed"]
+    if summary["unknown"]:
+        master_data_cache.invalidate(MASTER_DATA_KEY)
+    elif deleted:
+        master_data_cache.update(MASTER_DATA_KEY, _remove_master_rows(deleted))
+    for app_id in touched:
+        modules_cache.invalidate(app_id)
+        dimensions_cache.invalidate(app_id)
+
+    log_api_activity(StartDate, "User Control Center - Delete Applications",
+                     "Success" if summary["status"] == "success" else "Failed", "",
+                     f"Batch delete of {summary['requested']} applications: {summary['deleted']} deleted, "
+                     f"{summary['failed']} failed, {summary['unknown']} unknown. "
+                     f"{_batch_delete_remarks(results, 'app_id')}")
+    return dict(summary, results=results)
+
+
 def get_modules(app_id):
+    return modules_cache.get_or_load(app_id, lambda: fetch_modules(app_id)) or []
+
+
+# Returns the app's modules, or None when they could not be loaded (never cached).
+def fetch_modules(app_id, audit=True):
     try:
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        url = f"{domain}/get_modules"
-
         payload = {
             "app_id": app_id
         }
-        headers = {
-            'X-API-KEY': key,
-            'Content-Type': 'application/json'
-        }
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = control_center.read('POST', "get_modules", json=payload)
         if response.status_code == 200:
             data = response.json()
-            log_api_activity(StartDate, "User Control Center - Get Modules",
-                             "Success", "", f"Modules was successfully retrieved.")
+            if audit:
+                log_api_activity(StartDate, "User Control Center - Get Modules",
+                                 "Success", "", f"Modules was successfully retrieved.")
             return data.get("data", []) if isinstance(data, dict) else []
         else:
 
-            log_api_activity(StartDate, "User Control Center - Get Modules",
-                             "Failed", "", f"Modules was failed to retrieved.")
-            print(
-                f"Module fetch failed: {response.status_code} - {response.text}")
-            return []
+            if audit:
+                log_api_activity(StartDate, "User Control Center - Get Modules",
+                                 "Failed", "", f"Modules was failed to retrieved.")
+            logger.warning("Module fetch failed", extra={
+                "app_id": app_id, "status_code": response.status_code,
+                "response": response.text[:500]})
+            return None
     except Exception as e:
         # log_api_activity(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "User Control Center - Get Modules",
         #                  "Failed", str(e), f"Modules was failed to retrieved. Details: {str(e)}")
         log_api_error_activity(
             "User Control Center - Get Modules function", e)
-        return []
+        return None
 
 
 def get_dimension(app_id):
+    return dimensions_cache.get_or_load(app_id, lambda: fetch_dimension(app_id)) or []
+
+
+# Returns the app's dimensions, or None when they could not be loaded (never cached).
+def fetch_dimension(app_id, audit=True):
     try:
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        url = f"{domain}/get_dimension"
-
         payload = {
             "app_id": app_id
         }
-        headers = {
-            'X-API-KEY': key,
-            'Content-Type': 'application/json'
-        }
-        response = requests.post(
-            url, headers=headers, json=payload)
+        response = control_center.read('POST', "get_dimension", json=payload)
         if response.status_code == 200:
             data = response.json()
-            log_api_activity(StartDate, "User Control Center - Get Dimension",
-                             "Success", "", f"Dimension was successfully retrieved.")
+            if audit:
+                log_api_activity(StartDate, "User Control Center - Get Dimension",
+                                 "Success", "", f"Dimension was successfully retrieved.")
             return data.get("data", []) if isinstance(data, dict) else []
         else:
-            print(
-                f"Dimension fetch failed: {response.status_code} - {response.text}")
-            log_api_activity(StartDate, "User Control Center - Get Dimension",
-                             "Failed", "", f"Dimension was failed to retrieved.")
-            return []
+            logger.warning("Dimension fetch failed", extra={
+                "app_id": app_id, "status_code": response.status_code,
+                "response": response.text[:500]})
+            if audit:
+                log_api_activity(StartDate, "User Control Center - Get Dimension",
+                                 "Failed", "", f"Dimension was failed to retrieved.")
+            return None
     except Exception as e:
         # log_api_activity(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "User Control Center - Get Dimension",
         #                  "Failed", str(e), f"Dimension was failed to retrieved. Details: {str(e)}")
         # print(f"Dimension fetch error: {e}")
         log_api_error_activity(
             "User Control Center - Get Dimension function", e)
-        return []
+        return None
+
+
+def _prime_app_detail(job):
+    cache, fetch, app_id = job
+    return cache.prime(app_id, lambda: fetch(app_id, audit=False))
+
+
+# Warm the modules/dimensions caches for the apps on the current grid page, so opening
+# their pages is usually a cache hit. Apps with a zero count are skipped (the grid does
+# not link them) and the whole batch is audited as one record.
+def prefetch_app_details(app_ids):
+    StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    rows = {row.get("app_id"): row for row in (get_master_data() or [])}
+    jobs = []
+    for app_id in dict.fromkeys(app_ids):
+        row = rows.get(app_id)
+        if row is None:
+            continue
+        if row.get("module_count"):
+            jobs.append((modules_cache, fetch_modules, app_id))
+        if row.get("dimension_count"):
+            jobs.append((dimensions_cache, fetch_dimension, app_id))
+
+    outcomes = []
+    for start in range(0, len(jobs), PREFETCH_CONCURRENCY):
+        results, _ = map_concurrently(
+            _prime_app_detail, jobs[start:start + PREFETCH_CONCURRENCY], default="failed")
+        outcomes.extend(results)
+
+    summary = {
+        "apps": len(rows.keys() & set(app_ids)),
+        "requests": len(jobs),
+        "cached": outcomes.count("cached"),
+        "loaded": outcomes.count("loaded"),
+        "failed": outcomes.count("failed"),
+    }
+    if summary["loaded"] or summary["failed"]:
+        log_api_activity(StartDate, "User Control Center - Prefetch App Details",
+                         "Failed" if summary["failed"] else "Success", "",
+                         f"Prefetched modules and dimensions: {summary}")
+    return summary
+
+
+# Detail lists of an app: name -> (loader, master data count that says whether it has any)
+APP_DETAILS = {"modules": (get_modules, "module_count"), "dimensions": (get_dimension, "dimension_count")}
+
+
+def _app_detail(job):
+    row, name = job
+    load, count = APP_DETAILS[name]
+    return load(row.get("app_id")) if row.get(count) else []
+
+
+def expand_app_rows(rows):
+    # Master data rows with their "modules" and "dimensions" (through the caches), fetched
+    # EXPORT_CONCURRENCY apps at a time as the export is read, so only one batch of
+    # details is held at once. A list that could not be loaded is left empty.
+    for start in range(0, len(rows), EXPORT_CONCURRENCY):
+        batch = rows[start:start + EXPORT_CONCURRENCY]
+        jobs = [(row, name) for row in batch for name in APP_DETAILS]
+        results, _ = map_concurrently(_app_detail, jobs, default=[])
+        details = iter(results)
+        for row in batch:
+            yield dict(row, **{name: next(details) or [] for name in APP_DETAILS})
+
+
+# One audit record per export, with the filters it was asked for.
+def log_export(title, user):
+    StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    log_api_activity(StartDate, title, "Success", "",
+                     f"Exported by {(user or {}).get('email', '')} with {request.args.to_dict()}")
 
 
 # -----------------------------------------------------------------------------------------------------------------------------
 # FRED
 
-def load_administrators():
-    url = f"{domain}/load_administrator"
-    try:
+def get_administrators():
+    return administrators_cache.get_or_load(ADMINISTRATORS_KEY, fetch_administrators)
 
-        StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
+def administrators_version(result):
+    return administrators_cache.version(ADMINISTRATORS_KEY, result)
 
-        payload = {
-            "status": "success",
-            "message": "This request post should trigger the load_administrator in API ",
-            "result": ""
-            # "X-API-KEY': api_key,
 
-        }
+def administrators_index(result):
+    # AdminIndex of `result` (from get_administrators), built once per cached result.
+    cached, index = _admin_index["entry"]
+    if cached is not result:
+        index = AdminIndex(result.get('rows'))
+        _admin_index["entry"] = (result, index)
+    return index
+
+
+def _patch_admin_row(user_id, fields):
+    def patch(result):
+        return dict(result, rows=[dict(row, **fields) if str(row.get('id')) == str(user_id) else row
+                                  for row in result.get('rows', [])])
+    return patch
+
+
+def _remove_admin_row(user_id):
+    return _remove_admin_rows([user_id])
+
+
+def _remove_admin_rows(user_ids):
+    user_ids = {str(user_id) for user_id in user_ids}
 
-        print(f"This will be the destination API of the request: {url}")
-        print(f"This is the payload: {payload}")
-        response = requests.post(url, headers=headers)
+    def patch(result):
+        return dict(result, rows=[row for row in result.get('rows', [])
+                                  if str(row.get('id')) not in user_ids])
+    return patch
 
-        print(f"This is the passing of data to API : {response}")
+
+def administrators_grid():
+    # (result, version) of the administrators grid this worker already has, or (None, None).
+    # Never loads it: the auth guard must not wait on load_administrator.
+    result = administrators_cache.peek(ADMINISTRATORS_KEY)
+    if not isinstance(result, dict) or not result.get('rows'):
+        return None, None
+    return result, administrators_version(result)
+
+
+def admin_enrolled(result, admin_details):
+    # Whether the grid `result` lists this HCM ID with this role.
+    rows = administrators_index(result).by_hcm_id.get(str(admin_details.get('hcm_id') or '').strip(), [])
+    return any(row.get('Role Type') == admin_details.get('role_type') for row in rows)
+
+
+def fetch_administrators():
+    # Only a complete grid is cached; anything else is retried on the next request.
+    result = load_administrators()
+    if isinstance(result, dict) and 'headers' in result and 'rows' in result:
+        return result
+    return None
+
+
+def load_administrators():
+    try:
+
+        StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        response = control_center.read('POST', "load_administrator")
+        logger.debug("Upstream response", extra={"endpoint": "load_administrator",
+                                                 "status_code": response.status_code})
 
         # Wait response from API
         api_response = response.json()
@@ -414,18 +682,12 @@ def load_administrators():
 # Pass the data to API
 def search_hcm_id():
 
-    url = f"{domain}/search_hcm_id"
+    url = control_center.url_for("search_hcm_id")
     try:
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         data = request.get_json()
         hcm_id = data['hcm_id']
-        print(f"The user input of HCM ID was:{hcm_id}")
-
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
 
         payload = {
             "status": "success",
@@ -433,14 +695,14 @@ def search_hcm_id():
             "result": hcm_id
         }
 
-        print(f"This will be the destination API of the request: {url}")
-        print(f"This is the payload: {payload}")
-        response = requests.post(url, headers=headers, json=payload)
-
-        print(f"This is the passing of data to API : {response}")
+        logger.debug("Upstream request", extra={"url": url, "payload": payload})
+        response = control_center.post("search_hcm_id", json=payload)
+        logger.debug("Upstream response", extra={"url": url, "status_code": response.status_code})
 
         # Wait response from API
         api_response = response.json()
+        if isinstance(api_response, dict):
+            employee_index.add_many(api_response.get('result'))
 
         # api_response = requests.get(url, headers=headers)
         # print(f"This is getting the data FROM API : {api_response}")
@@ -458,14 +720,78 @@ def search_hcm_id():
             "User Control Center UI - search_hcm_id function", e)
 
 
+def index_administrators():
+    # Re-indexes the grid whenever administrators_cache holds a new result.
+    result = get_administrators()
+    if isinstance(result, dict) and result is not _indexed["administrators"]:
+        employee_index.add_many(result.get('rows'))
+        _indexed["administrators"] = result
+
+
+# Returns the employees upstream has for one exact HCM ID, or None when the call failed.
+def fetch_employee(hcm_id):
+    try:
+        StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        payload = {
+            "status": "success",
+            "message": "This is user inputr of HCM ID",
+            "result": hcm_id
+        }
+        response = control_center.read('POST', "search_hcm_id", json=payload)
+        if response.status_code != 200:
+            logger.warning("Employee lookup failed", extra={
+                "hcm_id": hcm_id, "status_code": response.status_code,
+                "response": response.text[:500]})
+            return None
+
+        api_response = response.json()
+        employees = api_response.get('result') if isinstance(api_response, dict) else None
+        employees = [row for row in employees or [] if isinstance(row, dict)]
+        employee_index.add_many(employees)
+
+        log_api_activity(StartDate, "User Control Center UI - Employee Typeahead",
+                         "Success", "", f"Looked up HCM ID {hcm_id} for the typeahead.")
+        return employees
+
+    except Exception as e:
+        log_api_error_activity(
+            "User Control Center UI - Employee Typeahead function", e)
+        return None
+
+
+def search_employees(query, limit=10):
+    index_administrators()
+    query = str(query or "").strip()
+    results = employee_index.search(query, limit)
+    source = "index"
+
+    if (HCM_ID_PATTERN.match(query) and employee_index.get(query) is None
+            and employee_misses.get(query) is None):
+        employees = fetch_employee(query)
+        source = "upstream"
+        if employees is not None:
+            if not employees:
+                employee_misses.set(query, True)
+            results = employee_index.search(query, limit)
+
+    return {"query": query, "source": source, "results": results}
+
+
 # Pass the data to API
 def insert_enroll_administrator_function(user):
+    return enroll_administrator(request.get_json(silent=True) or {}, user)
+
+
+# Enrolls (mode "Save") or edits (mode "Edit") one administrator from the form fields in
+# `data`. The bulk import passes audit=False/refresh=False/invalidate=False and audits,
+# refreshes the administrators grid and re-validates claims once for the whole file.
+def enroll_administrator(data, user, audit=True, refresh=True, invalidate=True):
     try:
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        url = f"{domain}/insert_enroll_administrator"
+        url = control_center.url_for("insert_enroll_administrator")
 
-        data = request.get_json()
         # print(f"This is the contents of the request.get_json data: {data}")
 
         # Get the username based on user email address then use Split() method to only get the "firstname.lastname" format
@@ -473,10 +799,7 @@ def insert_enroll_administrator_function(user):
         raw_username = data['email']
         splitted_username = raw_username.split(username_delimiter, 1)
 
-        print(
-            f"There is the contents of the splitted email: {splitted_username}")
-
-        print(f"There is the data: {data}")
+        logger.debug("Administrator form received", extra={"data": data})
 
         # Get user input from UI, passed by Javascript
         user_id = data['user_id']
@@ -493,23 +816,6 @@ def insert_enroll_administrator_function(user):
         mode = data['mode']
         current_logged_in = user['email']
 
-        print("Data from UI was successfully retrieved, here are the items ")
-
-        print(f"HCM ID: {hcm_id}")
-        # print(f"FULL NAME: {full_name}")
-        print(f"USERNAME: {username}")
-        print(f"EMAIL: {email}")
-        print(f"SBU: {sbu}")
-        print(f"JOB POSITION: {job_position}")
-        print(f"TICKET NUMBER: {ticket_number}")
-        print(f"ACCESS START DATE: {access_start_date}")
-        print(f"ACCESS END DATE: {access_end_date}")
-        print(f"ROLE TYPE: {role_type}")
-        print(f"MODE: {mode}")
-        print(f"CURRENT LOGGED IN: {current_logged_in}")
-
-        print('insert_enroll_administrator_function will now pass the data to API ')
-
         data_from_UI = {
             "user_id": user_id,
             "hcm_id": hcm_id,
@@ -526,38 +832,46 @@ def insert_enroll_administrator_function(user):
             "current_logged_in": current_logged_in
         }
 
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
-
         payload = {
             "status": "success",
             "message": "This is user input from controls",
             "payload": data_from_UI
         }
 
-        print(f"This will be the destination API of the request: {url}")
-        print(f"This is the payload: {payload}")
-
-        response = requests.post(url, headers=headers, json=payload)
+        logger.debug("Upstream request", extra={"url": url, "payload": payload})
 
-        # return response
-        print(f"This is the passing of data to API : {response}")
+        response = control_center.post(
+            "insert_enroll_administrator", json=payload)
 
         if response.status_code != 200:
-            print(
-                f"Error in searching user: {response.status_code} - {response.text}")
+            logger.warning("Error enrolling administrator", extra={
+                "hcm_id": hcm_id, "mode": mode, "status_code": response.status_code,
+                "response": response.text[:500]})
             return False
 
         # Get the response from API
         api_response = response.json()
 
+        # The enrolled (or edited) administrator must be re-validated on their next request
+        if invalidate:
+            invalidate_admin(email)
+        if refresh and mode == "Edit" and isinstance(api_response, dict) and api_response.get('status') == 'success':
+            administrators_cache.update(ADMINISTRATORS_KEY, _patch_admin_row(user_id, {
+                "Role Type": role_type,
+                "Ticket Number": ticket_number,
+                "Access Start Date": access_start_date,
+                "Access End Date": access_end_date,
+            }))
+        elif refresh:
+            # A new administrator's id is assigned upstream, so reload the grid.
+            administrators_cache.invalidate(ADMINISTRATORS_KEY)
+
         # api_response = requests.get(url, headers=headers)
         # print(f"This is getting the data FROM API : {api_response}")
 
-        log_api_activity(StartDate, "User Control Center UI - insert_enroll_administrator_function function",
-                         "Success", "", f"enroll administrator was passed to API without issues....")
+        if audit:
+            log_api_activity(StartDate, "User Control Center UI - insert_enroll_administrator_function function",
+                             "Success", "", f"enroll administrator was passed to API without issues....")
 
         return api_response
 
@@ -566,51 +880,55 @@ def insert_enroll_administrator_function(user):
             "User Control Center UI - insert_enroll_administrator_function function", e)
 
 
+# Bulk CSV enrollment (bulk_import.py). Rows are enrolled without a per-row audit record;
+# the administrators grid is reloaded and one audit record written for the whole file.
+def import_administrators(stream, user, dry_run=False):
+    StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    existing = administrators_index(get_administrators() or {})
+
+    def enroll(row):
+        return enroll_administrator(dict(row, user_id="", mode="Save"), user, audit=False, refresh=False,
+                                    invalidate=False)
+
+    summary = None
+    try:
+        for event in run_import(read_rows(stream), enroll, lambda hcm_id: bool(existing.by_hcm_id.get(hcm_id)),
+                                dry_run=dry_run):
+            if event["type"] == "summary":
+                summary = event
+            yield event
+    finally:
+        if summary is None or summary["enrolled"] or summary["unknown"]:
+            administrators_cache.invalidate(ADMINISTRATORS_KEY)
+            invalidate_admin()
+        if summary is not None and not dry_run:
+            counts = {key: summary[key] for key in ("rows", "enrolled", "failed", "unknown", "invalid")}
+            log_api_activity(StartDate, "User Control Center UI - Bulk Enroll Administrators",
+                             "Failed" if summary["failed"] or summary["unknown"] else "Success", "",
+                             f"Bulk enrollment by {(user or {}).get('email', '')}: {counts}")
+
+
 # Pass the data to API
 def delete_administrator(user):
 
     try:
         StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        url = f"{domain}/delete_administrator"
-
         data = request.get_json()
         user_id = data.get('user_id') if data else None
         deletion_reason = data.get('deletion_reason') if data else None
         current_logged_in = user['email']
 
-        print(f"Logged user: {current_logged_in}")
-
-        print(f" This is the user input to delete {deletion_reason}")
-
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
-
-        payload = {
-            "status": "success",
-            "message": "This is the user id with reason of deletion",
-            "payload": {
-                "user_id": user_id,
-                "deletion_reason": deletion_reason,
-                "deleted_by": current_logged_in
-            }
-        }
-
-        print(f"This will be the destination API of the request: {url}")
-        print(f"This is the payload: {payload}")
-        response = requests.post(url, headers=headers, json=payload)
-
-        # return response
-        print(f"This is the passing of data to API : {response}")
-
-        if response.status_code != 200:
-            print(
-                f"Error in searching user: {response.status_code} - {response.text}")
+        api_response = _delete_admin_upstream(user_id, deletion_reason, current_logged_in)
+        if api_response is None:
             return False
 
-        api_response = response.json()
+        # Only the user_id is known here, so drop every cached admin claim
+        invalidate_admin()
+        if isinstance(api_response, dict) and api_response.get('status') == 'success':
+            administrators_cache.update(ADMINISTRATORS_KEY, _remove_admin_row(user_id))
+        else:
+            administrators_cache.invalidate(ADMINISTRATORS_KEY)
 
         # api_response = requests.get(url, headers=headers)
         # print(f"This is getting the data FROM API : {api_response}")
@@ -625,57 +943,66 @@ def delete_administrator(user):
             "User Control Center UI - delete_administrator function", e)
 
 
-# Pass the data to API
-def retrieve_administrator_details_to_gridview():
-    try:
-        StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+# Returns the delete_administrator response, or None when the API answered with an error status.
+def _delete_admin_upstream(user_id, deletion_reason, deleted_by):
+    url = control_center.url_for("delete_administrator")
 
-        url = f"{domain}/retrieve_administrator_details"
-        print(url)
-
-        print(request.form)
-
-        user_id = request.form.get('txt_search_employee')
-        print(f"The HCM ID to search was: {user_id}")
-
-        headers = {
-            'X-API-KEY': api_key,
-            'Content-Type': 'application/json'
-        }
-
-        payload = {
-            "status": "success",
-            "message": "This is user input from controls",
-            "payload": {
-                "user_id": user_id
-            }
+    payload = {
+        "status": "success",
+        "message": "This is the user id with reason of deletion",
+        "payload": {
+            "user_id": user_id,
+            "deletion_reason": deletion_reason,
+            "deleted_by": deleted_by
         }
+    }
 
-        response = requests.post(url, headers=headers, json=payload)
+    logger.debug("Upstream request", extra={"url": url, "payload": payload})
+    response = control_center.post("delete_administrator", json=payload)
 
-        # return response
-        print(f"This is the passing of data to API : {response}")
+    if response.status_code != 200:
+        logger.warning("Error deleting administrator", extra={
+            "user_id": user_id, "status_code": response.status_code,
+            "response": response.text[:500]})
+        return None
 
-        if response.status_code != 200:
-            print(
-                f"Error in searching user: {response.status_code} - {response.text}")
-            return False
+    return response.json()
 
-        api_response = response.json()
 
-        # api_response = requests.get(url, headers=headers)
-        # print(f"This is getting the data FROM API : {api_response}")
-
-        log_api_activity(StartDate, "User Control Center UI - retrieve_administrator_details_to_gridview function",
-                         "Success", "", f"retrieve data request to API without issues....")
-
-        return api_response
-
-    # Logic that search if user exist in administrator_master table
+def delete_administrators(user_ids, deletion_reason, user):
+    StartDate = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    user_ids = list(dict.fromkeys(user_ids))
+    current_logged_in = user['email']
 
-    except Exception as e:
-        log_api_error_activity(
-            "User Control Center UI - retrieve_administrator_details_to_gridview function", e)
+    def delete_one(user_id):
+        try:
+            return _delete_outcome(_delete_admin_upstream(user_id, deletion_reason, current_logged_in),
+                                   "The administrator could not be deleted")
+        except Exception:
+            # Logged here only; the batch's single audit record carries the outcome.
+            logger.exception("Error deleting administrator", extra={"user_id": user_id})
+            return "failed", "The control_center API could not be reached"
+
+    outcomes = _delete_in_batches(delete_one, user_ids)
+    results = [{"user_id": user_id, "status": status, "message": message}
+               for user_id, (status, message) in zip(user_ids, outcomes)]
+    summary = _batch_delete_summary(results)
+
+    deleted = [result["user_id"] for result in results if result["status"] == "deleted"]
+    if deleted or summary["unknown"]:
+        # Only user_ids are known here, so drop every cached admin claim
+        invalidate_admin()
+    if summary["unknown"]:
+        administrators_cache.invalidate(ADMINISTRATORS_KEY)
+    elif deleted:
+        administrators_cache.update(ADMINISTRATORS_KEY, _remove_admin_rows(deleted))
+
+    log_api_activity(StartDate, "User Control Center UI - delete_administrators",
+                     "Success" if summary["status"] == "success" else "Failed", "",
+                     f"Batch delete of {summary['requested']} administrators by {current_logged_in} "
+                     f"({deletion_reason}): {summary['deleted']} deleted, {summary['failed']} failed, "
+                     f"{summary['unknown']} unknown. {_batch_delete_remarks(results, 'user_id')}")
+    return dict(summary, results=results)
 
 
 def log_api_error_activity(title, e):
@@ -684,9 +1011,8 @@ def log_api_error_activity(title, e):
     file_name = exc_tb.tb_frame.f_code.co_filename
     line_number = exc_tb.tb_lineno
 
-    print(f"Error occurred in file: {file_name}")
-    print(f"Error occurred on line: {line_number}")
-    print(f"Error message: {e}")
+    logger.error(title, exc_info=True, extra={
+        "file": file_name, "line": line_number, "error": str(e)})
 
     log_api_activity(StartDate, title, "Failed",
                      f"Error in file {file_name} at line {line_number}", str(e))
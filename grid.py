@@ -0,0 +1,245 @@
+from datetime import datetime, timezone
+
+# Server-side paging, sorting and filtering for the grids rendered from upstream lists.
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 200
+
+# Friendly sort/filter names accepted by the JSON endpoints, mapped to master data keys
+APP_COLUMNS = {
+    "id": "app_id",
+    "name": "app_name",
+    "owner": "app_owner",
+    "status": "status",
+    "url": "app_url",
+    "dimensions": "dimension_count",
+    "modules": "module_count",
+    "created_by": "created_by",
+    "created": "date_created",
+}
+APP_SEARCH_FIELDS = ("app_name", "app_owner", "app_url", "created_by")
+# Fields holding dates, sorted by the parsed date rather than as text. Upstream sends ISO
+# dates; the other formats it might send are tried in DATE_FORMATS order. Values that do
+# not parse sort after every date, as text. Only the columns in APP_COLUMNS/ADMIN_COLUMNS
+# can be sorted on; any other `sort` leaves the upstream order.
+DATE_FIELDS = {"date_created", "Access Start Date", "Access End Date"}
+DATE_FORMATS = ("%a, %d %b %Y %H:%M:%S %Z", "%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%d-%b-%Y", "%b %d, %Y")
+
+
+def _to_int(value, default, minimum=1, maximum=None):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    value = max(value, minimum)
+    return min(value, maximum) if maximum else value
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "1", "yes", "active"):
+        return True
+    if text in ("false", "0", "no", "inactive"):
+        return False
+    return None
+
+
+def parse_date(value):
+    # Naive UTC datetime from an ISO or DATE_FORMATS string, or None.
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, date_format)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _sort_key(field):
+    # (type rank, value) so a column mixing types (or holding lists and dicts) still sorts:
+    # numbers, then dates, then text, then anything else as text, then missing values.
+    def key(row):
+        value = row.get(field)
+        if value is None:
+            return (4, "")
+        if isinstance(value, (bool, int, float)):
+            return (0, float(value))
+        if field in DATE_FIELDS:
+            parsed = parse_date(value)
+            if parsed is not None:
+                return (1, parsed)
+        if isinstance(value, str):
+            return (2, value.lower())
+        return (3, str(value).lower())
+    return key
+
+
+def _sort_field(sort, columns):
+    # Field to sort on for `sort` (a friendly name or the field itself); None for a
+    # column the grid does not have.
+    if not sort:
+        return None
+    if sort in columns:
+        return columns[sort]
+    return sort if sort in columns.values() else None
+
+
+def select_rows(rows, q=None, filters=None, sort=None, order="asc", columns=None,
+                search_fields=None):
+    # query_rows without the paging.
+    columns = columns or {}
+    rows = rows or []
+
+    if q:
+        needle = q.strip().lower()
+        fields = search_fields or ()
+        rows = [row for row in rows
+                if any(needle in str(row.get(field) or '').lower() for field in fields)]
+
+    for name, expected in (filters or {}).items():
+        if expected is None or expected == '':
+            continue
+        field = columns.get(name, name)
+        if isinstance(expected, bool):
+            rows = [row for row in rows if parse_bool(row.get(field)) is expected]
+        else:
+            expected = str(expected).lower()
+            rows = [row for row in rows if str(row.get(field) or '').lower() == expected]
+
+    field = _sort_field(sort, columns)
+    if field:
+        rows = sorted(rows, key=_sort_key(field), reverse=(order == "desc"))
+    return rows
+
+
+def query_rows(rows, q=None, filters=None, sort=None, order="asc", page=1, limit=DEFAULT_LIMIT,
+               columns=None, search_fields=None):
+    rows = select_rows(rows, q=q, filters=filters, sort=sort, order=order, columns=columns,
+                       search_fields=search_fields)
+
+    limit = _to_int(limit, DEFAULT_LIMIT, maximum=MAX_LIMIT)
+    total = len(rows)
+    pages = max((total + limit - 1) // limit, 1)
+    page = min(_to_int(page, 1), pages)
+    start = (page - 1) * limit
+
+    return {
+        "items": rows[start:start + limit],
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "pages": pages,
+        "sort": sort,
+        "order": order,
+    }
+
+
+def _app_query(args):
+    status = args.get('status')
+    return {
+        "q": args.get('q'),
+        "filters": {"status": parse_bool(status) if status else None},
+        "sort": args.get('sort'),
+        "order": 'desc' if args.get('order') == 'desc' else 'asc',
+        "columns": APP_COLUMNS,
+        "search_fields": APP_SEARCH_FIELDS,
+    }
+
+
+def query_apps(master_data, args):
+    return query_rows(master_data, page=args.get('page', 1),
+                      limit=args.get('limit', DEFAULT_LIMIT), **_app_query(args))
+
+
+def select_apps(master_data, args):
+    # Every app matching the grid's search, status filter and sort (for exports).
+    return select_rows(master_data, **_app_query(args))
+
+
+# Administrators grid (load_administrator rows). Sorting uses the grid's own column names.
+ADMIN_COLUMNS = {
+    "id": "id",
+    "hcm_id": "HCM ID",
+    "name": "Full Name",
+    "email": "Email Address",
+    "sbu": "SBU",
+    "position": "Job Position",
+    "role": "Role Type",
+    "start": "Access Start Date",
+    "end": "Access End Date",
+}
+ADMIN_SEARCH_FIELDS = ("HCM ID", "Full Name", "Email Address", "SBU", "Job Position", "Role Type")
+
+
+class AdminIndex:
+    # Lookups over one load_administrator result: rows by id and HCM ID, row positions by
+    # SBU and role, and one lower-cased search string per row for `q`. Built once per
+    # cached result (functions.administrators_index), so a search never re-reads the
+    # upstream list.
+
+    def __init__(self, rows):
+        self.rows = [row for row in rows or [] if isinstance(row, dict)]
+        self.by_id = {}
+        self.by_hcm_id = {}
+        self.by_sbu = {}
+        self.by_role = {}
+        self.text = []
+        for position, row in enumerate(self.rows):
+            self.by_id[str(row.get("id"))] = row
+            self.by_hcm_id.setdefault(str(row.get("HCM ID") or "").strip(), []).append(row)
+            self.by_sbu.setdefault(str(row.get("SBU") or "").lower(), []).append(position)
+            self.by_role.setdefault(str(row.get("Role Type") or "").lower(), []).append(position)
+            self.text.append("\x00".join(str(row.get(field) or "") for field in ADMIN_SEARCH_FIELDS).lower())
+        self.sbus = sorted({str(row.get("SBU")) for row in self.rows if row.get("SBU")})
+        self.roles = sorted({str(row.get("Role Type")) for row in self.rows if row.get("Role Type")})
+
+    def search(self, q=None, hcm_id=None, sbu=None, role=None):
+        if hcm_id:
+            return list(self.by_hcm_id.get(str(hcm_id).strip(), []))
+
+        positions = None
+        for index, value in ((self.by_sbu, sbu), (self.by_role, role)):
+            if value:
+                matches = index.get(str(value).lower(), [])
+                positions = matches if positions is None else sorted(set(positions) & set(matches))
+        if positions is None:
+            positions = range(len(self.rows))
+
+        needle = (q or "").strip().lower()
+        if needle:
+            positions = [position for position in positions if needle in self.text[position]]
+        return [self.rows[position] for position in positions]
+
+
+def select_admins(index, args):
+    # Every administrator matching the grid's filters, sorted, unpaged.
+    rows = index.search(q=args.get('q'), hcm_id=args.get('hcm_id'), sbu=args.get('sbu'),
+                        role=args.get('role'))
+    order = 'desc' if args.get('order') == 'desc' else 'asc'
+    return select_rows(rows, sort=args.get('sort'), order=order, columns=ADMIN_COLUMNS)
+
+
+def query_admins(index, args):
+    rows = select_admins(index, args)
+    order = 'desc' if args.get('order') == 'desc' else 'asc'
+    if args.get('limit'):
+        grid = query_rows(rows, page=args.get('page', 1), limit=args.get('limit'))
+        grid.update(sort=args.get('sort'), order=order)
+    else:
+        # The page lists every administrator, so without a limit nothing is paged.
+        grid = {"items": rows, "page": 1, "limit": len(rows), "total": len(rows), "pages": 1,
+                "sort": args.get('sort'), "order": order}
+    grid["count"] = len(index.rows)
+    return grid
@@ -0,0 +1,49 @@
+import os
+import shutil
+
+
+# Gunicorn settings for Cloud Run. Values can be overridden with the usual
+# GUNICORN_CMD_ARGS or the environment variables read below.
+#
+# SERVING_MODE picks how a worker waits on the control_center API:
+#   sync   (default) one request per worker thread; GUNICORN_THREADS threads per worker
+#   async  gevent worker; every blocking socket call (requests, the audit shipper, the
+#          fan-out pool) yields to other greenlets, so one worker overlaps up to
+#          GUNICORN_WORKER_CONNECTIONS in-flight requests. Best for this I/O-bound app.
+
+serving_mode = os.getenv('SERVING_MODE', 'sync')
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+
+if serving_mode == 'async':
+    worker_class = 'gevent'
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 200))
+    # Keep enough pooled upstream connections and fan-out slots for the extra concurrency.
+    os.environ.setdefault('UPSTREAM_POOL_SIZE', str(min(worker_connections, 100)))
+    os.environ.setdefault('FANOUT_WORKERS', str(min(worker_connections, 64)))
+else:
+    threads = int(os.getenv('GUNICORN_THREADS', 1))
+
+# Every worker writes its Prometheus samples here so /metrics can aggregate them.
+# Must be set before the app (and prometheus_client) is imported by the workers.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+
+def on_starting(server):
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def post_fork(server, worker):
+    if serving_mode == 'async':
+        # Secret Manager talks gRPC, which needs its gevent integration to not block the hub.
+        from grpc.experimental import gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
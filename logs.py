@@ -0,0 +1,187 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueListener
+
+from flask import g, has_request_context, request
+
+
+# Structured JSON logging for the app's own modules (everything under the
+# "control_center" logger). Cloud Logging picks up "severity" and the trace id.
+#
+# Records are put on a bounded queue and written to stdout by a background listener,
+# so a request never waits on stdout. Extra fields passed with extra={...} become
+# JSON keys; sensitive keys are redacted before the record leaves the request thread.
+# Below WARNING, whole requests can be sampled per route.
+#
+# Configuration (environment):
+#   LOG_LEVEL          DEBUG, INFO, WARNING, ... (default INFO; DEBUG dumps payloads)
+#   LOG_SAMPLE_RATE    fraction of requests whose DEBUG/INFO records are kept (default 1)
+#   LOG_SAMPLE_RATES   per-route overrides by Flask endpoint, e.g. "api_apps=0.1,home=0.25"
+#   LOG_QUEUE_SIZE     records buffered before new ones are dropped (default 10000)
+#   LOG_REDACT_FIELDS  extra comma separated field names to redact
+
+ROOT_LOGGER = "control_center"
+
+REDACT_FIELDS = {
+    "api_key", "x_api_key", "authorization", "cookie", "session", "admin_claim",
+    "token", "access_token", "id_token", "refresh_token", "secret", "client_secret",
+    "password", "email", "email_address", "full_name", "given_name", "family_name", "picture",
+}
+REDACTED = "[redacted]"
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "taskName"}
+
+_state = {"pid": None, "queue": None, "listener": None, "configured": False}
+_state_lock = threading.Lock()
+
+
+def _normalize(key):
+    return str(key).strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _redact_fields():
+    extra = {_normalize(name) for name in os.getenv('LOG_REDACT_FIELDS', '').split(',') if name.strip()}
+    return REDACT_FIELDS | extra
+
+
+def redact(value, fields=None):
+    fields = _redact_fields() if fields is None else fields
+    if isinstance(value, dict):
+        return {key: REDACTED if _normalize(key) in fields else redact(item, fields)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item, fields) for item in value]
+    return value
+
+
+def _parse_rates(raw):
+    rates = {}
+    for item in (raw or '').split(','):
+        if '=' not in item:
+            continue
+        name, value = item.split('=', 1)
+        try:
+            rates[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return rates
+
+
+SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 1))
+SAMPLE_RATES = _parse_rates(os.getenv('LOG_SAMPLE_RATES'))
+
+
+class RequestSampler(logging.Filter):
+    # Keeps or drops all DEBUG/INFO records of a request together; WARNING and above
+    # are always kept.
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not has_request_context():
+            return True
+        rate = SAMPLE_RATES.get(request.endpoint, SAMPLE_RATE)
+        if rate >= 1:
+            return True
+        sampled = g.get("log_sampled")
+        if sampled is None:
+            sampled = g.log_sampled = random.random() < rate
+        return sampled
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class BackgroundQueueHandler(logging.Handler):
+    # Captures request context and redacts in the calling thread; JSON encoding and the
+    # stdout write happen on the listener thread.
+
+    def emit(self, record):
+        try:
+            fields = {key: value for key, value in vars(record).items()
+                      if key not in _STANDARD_ATTRS}
+            if has_request_context():
+                fields.setdefault("route", request.endpoint)
+                fields.setdefault("method", request.method)
+                trace = request.headers.get("X-Cloud-Trace-Context", "").split("/")[0]
+                if trace and os.getenv('EP_PROJECT_ID'):
+                    fields["logging.googleapis.com/trace"] = \
+                        f"projects/{os.getenv('EP_PROJECT_ID')}/traces/{trace}"
+
+            prepared = logging.makeLogRecord({
+                "name": record.name, "levelno": record.levelno,
+                "levelname": record.levelname, "created": record.created,
+                "msg": record.getMessage(), "args": None,
+                "exc_text": self.formatter.formatException(record.exc_info)
+                if record.exc_info else record.exc_text,
+                "fields": redact(fields),
+            })
+            _get_queue().put_nowait(prepared)
+        except queue.Full:
+            from metrics import observe_log_dropped
+            observe_log_dropped()
+        except Exception:
+            self.handleError(record)
+
+
+def _get_queue():
+    # A queue and listener per process; the listener thread does not survive a fork.
+    pid = os.getpid()
+    if _state["pid"] != pid:
+        with _state_lock:
+            if _state["pid"] != pid:
+                log_queue = queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', 10000)))
+                output = logging.StreamHandler(sys.stdout)
+                output.setFormatter(JsonFormatter())
+                listener = QueueListener(log_queue, output)
+                listener.start()
+                _state.update(pid=pid, queue=log_queue, listener=listener)
+    return _state["queue"]
+
+
+def _shutdown():
+    listener = _state.get("listener")
+    if listener is not None and _state["pid"] == os.getpid():
+        listener.stop()
+
+
+def configure():
+    if _state["configured"]:
+        return
+    with _state_lock:
+        if _state["configured"]:
+            return
+        handler = BackgroundQueueHandler()
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(RequestSampler())
+        logger = logging.getLogger(ROOT_LOGGER)
+        logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+        logger.addHandler(handler)
+        logger.propagate = False
+        atexit.register(_shutdown)
+        _state["configured"] = True
+
+
+def get_logger(name):
+    configure()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
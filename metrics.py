@@ -0,0 +1,185 @@
+import hmac
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter,
+                               Gauge, Histogram, generate_latest, multiprocess)
+
+
+# Prometheus metrics for Flask routes, upstream endpoints, caches and the audit queue.
+#
+# With several gunicorn workers, set PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does)
+# so every worker writes its samples to that directory and /metrics aggregates them.
+# /metrics needs "Authorization: Bearer <METRICS_TOKEN>". Without METRICS_TOKEN it
+# answers 404, unless METRICS_PUBLIC=1 opens it to anyone (local development only: it
+# shows per-route and per-upstream traffic and errors).
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUESTS = Counter(
+    "control_center_http_requests_total", "Flask requests by route, method and status code",
+    ["route", "method", "status"])
+HTTP_LATENCY = Histogram(
+    "control_center_http_request_duration_seconds", "Flask request latency by route",
+    ["route", "method"], buckets=LATENCY_BUCKETS)
+TEMPLATE_RENDER = Histogram(
+    "control_center_template_render_seconds",
+    "Jinja render time by template, including pages streamed after their headers",
+    ["template"], buckets=LATENCY_BUCKETS)
+HTTP_ERRORS = Counter(
+    "control_center_http_exceptions_total", "Unhandled exceptions by route",
+    ["route", "exception"])
+
+UPSTREAM_REQUESTS = Counter(
+    "control_center_upstream_requests_total", "Upstream calls by endpoint and status code",
+    ["upstream", "endpoint", "status"])
+UPSTREAM_LATENCY = Histogram(
+    "control_center_upstream_request_duration_seconds", "Upstream call latency by endpoint",
+    ["upstream", "endpoint"], buckets=LATENCY_BUCKETS)
+UPSTREAM_ERRORS = Counter(
+    "control_center_upstream_errors_total", "Upstream calls that raised, by exception type",
+    ["upstream", "endpoint", "error"])
+
+UPSTREAM_CIRCUIT_STATE = Gauge(
+    "control_center_upstream_circuit_state",
+    "Circuit breaker state by upstream endpoint (0 closed, 1 half-open, 2 open)",
+    ["upstream", "endpoint"], multiprocess_mode="livemax")
+UPSTREAM_CIRCUIT_REJECTED = Counter(
+    "control_center_upstream_circuit_rejected_total",
+    "Upstream calls failed fast because the endpoint's circuit was open",
+    ["upstream", "endpoint"])
+
+UPSTREAM_COALESCED = Counter(
+    "control_center_upstream_coalesced_total",
+    "Upstream reads that shared a concurrent identical call instead of making their own",
+    ["upstream", "endpoint"])
+
+CACHE_EVENTS = Counter(
+    "control_center_cache_requests_total",
+    "Cache lookups by result (hit, miss, stale, fallback)",
+    ["cache", "result"])
+
+AUDIT_RECORDS = Counter(
+    "control_center_audit_records_total",
+    "Audit records by outcome (enqueued, sent, dropped, failed, spilled, replayed)",
+    ["result"])
+AUDIT_QUEUE_DEPTH = Gauge(
+    "control_center_audit_queue_depth", "Audit records waiting to be shipped",
+    multiprocess_mode="livesum")
+
+SESSION_OPERATIONS = Histogram(
+    "control_center_session_operation_seconds",
+    "Session load/save time including (de)serialization, by backend (cookie, memory, sqlite)",
+    ["backend", "operation"], buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1))
+SESSION_SIZE = Histogram(
+    "control_center_session_size_bytes", "Serialized session size on save, by backend",
+    ["backend"], buckets=(128, 256, 512, 1024, 2048, 3072, 4096, 8192, 16384, 65536))
+
+LOG_DROPPED = Counter(
+    "control_center_log_records_dropped_total", "Log records dropped because the log queue was full")
+
+
+def _endpoint_label(endpoint):
+    return "/" + endpoint.strip("/") if endpoint else "/"
+
+
+def observe_render(template, elapsed):
+    TEMPLATE_RENDER.labels(template).observe(elapsed)
+
+
+def observe_upstream(upstream, endpoint, elapsed, status=None, error=None):
+    endpoint = _endpoint_label(endpoint)
+    UPSTREAM_LATENCY.labels(upstream, endpoint).observe(elapsed)
+    if error is not None:
+        UPSTREAM_ERRORS.labels(upstream, endpoint, type(error).__name__).inc()
+        status = "error"
+    UPSTREAM_REQUESTS.labels(upstream, endpoint, str(status)).inc()
+
+
+def set_circuit_state(upstream, endpoint, state):
+    UPSTREAM_CIRCUIT_STATE.labels(upstream, _endpoint_label(endpoint)).set(state)
+
+
+def observe_circuit_rejected(upstream, endpoint):
+    UPSTREAM_CIRCUIT_REJECTED.labels(upstream, _endpoint_label(endpoint)).inc()
+
+
+def observe_coalesced(upstream, endpoint):
+    UPSTREAM_COALESCED.labels(upstream, _endpoint_label(endpoint)).inc()
+
+
+def observe_cache(cache, result):
+    CACHE_EVENTS.labels(cache, result).inc()
+
+
+def observe_audit(result, amount=1):
+    AUDIT_RECORDS.labels(result).inc(amount)
+
+
+def set_audit_queue_depth(depth):
+    AUDIT_QUEUE_DEPTH.set(depth)
+
+
+def observe_session(backend, operation, elapsed):
+    SESSION_OPERATIONS.labels(backend, operation).observe(elapsed)
+
+
+def observe_session_size(backend, size):
+    SESSION_SIZE.labels(backend).observe(size)
+
+
+def observe_log_dropped():
+    LOG_DROPPED.inc()
+
+
+def _route_label():
+    return request.endpoint or "unmatched"
+
+
+def _start_timer():
+    g.metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        route = _route_label()
+        latency = HTTP_LATENCY.labels(route, request.method)
+        if response.is_streamed:
+            # The body (a streamed page, an export) is produced after this, so the
+            # request is timed up to when the server closes the response.
+            response.call_on_close(lambda: latency.observe(time.perf_counter() - started))
+        else:
+            latency.observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(route, request.method,
+                             str(response.status_code)).inc()
+    return response
+
+
+def _record_exception(error):
+    if error is not None:
+        HTTP_ERRORS.labels(_route_label(), type(error).__name__).inc()
+
+
+def render_metrics():
+    token = os.getenv('METRICS_TOKEN')
+    if not token:
+        if os.getenv('METRICS_PUBLIC') != '1':
+            return Response("Not Found\n", status=404, mimetype="text/plain")
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return Response("Unauthorized\n", status=401, mimetype="text/plain")
+
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.teardown_request(_record_exception)
+    app.add_url_rule('/metrics', 'metrics', render_metrics)
@@ -0,0 +1,208 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from logs import get_logger
+
+
+# One shared, lazily resolved source for Secret Manager values.
+#
+# Nothing is fetched at import time: a secret is resolved the first time it is asked
+# for, then kept in memory (and optionally in a small on-disk cache, which on Cloud Run
+# lives on the in-memory /tmp) so new workers and cold starts skip the round trip.
+# A daemon thread re-reads every secret that has been used so rotations are picked up
+# without a redeploy. When Secret Manager is unreachable the last known value is served.
+#
+# Lookup order for a secret id such as "google-oauth":
+#   SECRET_GOOGLE_OAUTH            the value itself (env override)
+#   SECRET_GOOGLE_OAUTH_FILE       path to a file holding the value
+#   $SECRETS_DIR/google-oauth      mounted secret volume
+#   memory / disk cache            while younger than SECRETS_CACHE_TTL
+#   Secret Manager                 projects/$EP_PROJECT_ID/secrets/<id>/versions/latest
+#
+# Configuration (environment):
+#   SECRETS_DIR               directory of mounted secret files (default unset)
+#   SECRETS_CACHE_DIR         on-disk cache directory, "" to disable (default /tmp/control_center_secrets)
+#   SECRETS_CACHE_TTL         seconds a cached value is used without re-fetching (default 3600)
+#   SECRETS_REFRESH_INTERVAL  seconds between background refreshes, 0 to disable (default 1800)
+
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+
+class SecretUnavailable(Exception):
+    pass
+
+
+def _env_name(secret_id):
+    return "SECRET_" + re.sub(r'[^A-Za-z0-9]', '_', secret_id).upper()
+
+
+def _read_file(path):
+    with open(path, 'r', encoding='utf-8') as handle:
+        return handle.read().strip()
+
+
+class SecretsProvider:
+
+    def __init__(self, project_id=None, cache_dir=None, ttl=None, refresh_interval=None):
+        self.project_id = project_id or os.getenv('EP_PROJECT_ID')
+        if cache_dir is None:
+            cache_dir = os.getenv('SECRETS_CACHE_DIR', '/tmp/control_center_secrets')
+        self.cache_dir = cache_dir
+        self.ttl = float(os.getenv('SECRETS_CACHE_TTL', 3600) if ttl is None else ttl)
+        self.refresh_interval = float(
+            os.getenv('SECRETS_REFRESH_INTERVAL', 1800) if refresh_interval is None else refresh_interval)
+        self._values = {}
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+        self._client = None
+        self._client_pid = None
+        self._thread_pid = None
+
+    def _override(self, secret_id):
+        env_name = _env_name(secret_id)
+        if os.getenv(env_name):
+            return os.getenv(env_name)
+        if os.getenv(f"{env_name}_FILE"):
+            return _read_file(os.getenv(f"{env_name}_FILE"))
+        secrets_dir = os.getenv('SECRETS_DIR')
+        if secrets_dir and os.path.isfile(os.path.join(secrets_dir, secret_id)):
+            return _read_file(os.path.join(secrets_dir, secret_id))
+        return None
+
+    def _get_client(self):
+        # gRPC channels do not survive a fork, so each worker builds its own client.
+        pid = os.getpid()
+        if self._client is None or self._client_pid != pid:
+            from google.cloud import secretmanager
+            self._client = secretmanager.SecretManagerServiceClient()
+            self._client_pid = pid
+        return self._client
+
+    def _fetch(self, secret_id):
+        name = f"projects/{self.project_id}/secrets/{secret_id}/versions/latest"
+        response = self._get_client().access_secret_version(request={"name": name})
+        return response.payload.data.decode("UTF-8")
+
+    def _cache_path(self, secret_id):
+        return os.path.join(self.cache_dir, f"{self.project_id}__{secret_id}.json")
+
+    def _read_disk(self, secret_id):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(secret_id), 'r', encoding='utf-8') as handle:
+                entry = json.load(handle)
+            return entry["value"], float(entry["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, secret_id, value, fetched_at):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".secret-")
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump({"value": value, "fetched_at": fetched_at}, handle)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self._cache_path(secret_id))
+        except OSError as e:
+            logger.warning("Could not cache secret on disk", extra={
+                "secret_id": secret_id, "error": str(e)})
+
+    def _fetch_lock(self, secret_id):
+        with self._lock:
+            return self._fetch_locks.setdefault(secret_id, threading.Lock())
+
+    def _refresh(self, secret_id, stale=None):
+        # Fetch from Secret Manager; on failure fall back to the stale value, if any.
+        try:
+            value = self._fetch(secret_id)
+        except Exception as e:
+            if stale is None:
+                raise SecretUnavailable(f"Secret {secret_id} could not be loaded: {e}") from e
+            logger.warning("Secret refresh failed, keeping cached value", extra={
+                "secret_id": secret_id, "error": str(e)})
+            return stale
+        fetched_at = time.time()
+        with self._lock:
+            self._values[secret_id] = (value, fetched_at)
+        self._write_disk(secret_id, value, fetched_at)
+        return value
+
+    def get(self, secret_id):
+        override = self._override(secret_id)
+        if override is not None:
+            return override
+
+        self._ensure_refresher()
+        entry = self._values.get(secret_id)
+        if entry and time.time() - entry[1] < self.ttl:
+            return entry[0]
+
+        with self._fetch_lock(secret_id):
+            entry = self._values.get(secret_id)
+            if entry and time.time() - entry[1] < self.ttl:
+                return entry[0]
+            if entry is None:
+                entry = self._read_disk(secret_id)
+                if entry:
+                    with self._lock:
+                        self._values[secret_id] = entry
+                    if time.time() - entry[1] < self.ttl:
+                        return entry[0]
+            return self._refresh(secret_id, stale=entry[0] if entry else None)
+
+    def get_json(self, secret_id):
+        return json.loads(self.get(secret_id))
+
+    def prefetch(self, *secret_ids):
+        # Warm the cache in the background so the first request does not pay for it.
+        def run():
+            for secret_id in secret_ids:
+                try:
+                    self.get(secret_id)
+                except Exception as e:
+                    logger.warning("Secret prefetch failed", extra={
+                        "secret_id": secret_id, "error": str(e)})
+        threading.Thread(target=run, name="secrets-prefetch", daemon=True).start()
+
+    def _ensure_refresher(self):
+        if self.refresh_interval <= 0:
+            return
+        pid = os.getpid()
+        if self._thread_pid == pid:
+            return
+        with self._lock:
+            if self._thread_pid == pid:
+                return
+            self._thread_pid = pid
+            threading.Thread(target=self._run_refresher, name="secrets-refresh",
+                             daemon=True).start()
+
+    def _run_refresher(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            with self._lock:
+                secret_ids = list(self._values)
+            for secret_id in secret_ids:
+                if self._override(secret_id) is not None:
+                    continue
+                with self._fetch_lock(secret_id):
+                    entry = self._values.get(secret_id)
+                    try:
+                        self._refresh(secret_id, stale=entry[0] if entry else None)
+                    except SecretUnavailable as e:
+                        logger.error(str(e), extra={"secret_id": secret_id})
+
+
+secret_store = SecretsProvider()
@@ -0,0 +1,289 @@
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+from assets import URL_PATH as ASSETS_URL_PATH
+from metrics import observe_session, observe_session_size
+
+
+# Server-side Flask sessions: the cookie only carries a signed, opaque session id and
+# the session dict (Google user info, admin details, app edit state) stays on the
+# server. Requests for static files and /assets/ bundles never load or save the session.
+#
+# Configuration (environment):
+#   SESSION_BACKEND       cookie (default, Flask's signed cookie), memory or sqlite
+#   SESSION_TTL           idle seconds before a server-side session expires (default 28800)
+#   SESSION_MAX_ENTRIES   sessions kept by the memory backend, least recently used
+#                         evicted first (default 10000)
+#   SESSION_SQLITE_PATH   database file for the sqlite backend, which survives worker
+#                         restarts (default /tmp/control_center_sessions.sqlite3)
+#
+# The memory backend is per worker process and the sqlite backend per instance, so
+# with more than one of either, requests must stick to the same one (e.g. Cloud Run
+# session affinity) or users are asked to sign in again.
+#
+# regenerate(session) gives a server-side session a new id and drops the old entry;
+# the login callback calls it so an id planted before sign-in (session fixation) is
+# never the one that ends up signed in.
+
+serializer = TaggedJSONSerializer()
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.accessed = False
+        self.replaced_sid = None
+
+    def regenerate(self):
+        if self.sid is None:
+            return
+        if not self.new and self.replaced_sid is None:
+            self.replaced_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.new = True
+        self.modified = True
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+
+class MemorySessionStore:
+    name = "memory"
+
+    def __init__(self, ttl, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._data[sid]
+                return None
+            # Sliding expiry: every read keeps the session alive.
+            self._data[sid] = (now + self.ttl, entry[1])
+            self._data.move_to_end(sid)
+            return entry[1]
+
+    def save(self, sid, value):
+        with self._lock:
+            self._data[sid] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteSessionStore:
+    name = "sqlite"
+    PURGE_EVERY = 500
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)")
+
+    def _connect(self):
+        # One connection per thread per process; sqlite connections do not cross either.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def load(self, sid):
+        now = time.time()
+        row = self._connect().execute(
+            "SELECT data, expires FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self.delete(sid)
+            return None
+        # Only extend the expiry once half the TTL has passed, to avoid a write per read.
+        if row[1] - now < self.ttl / 2:
+            self._connect().execute(
+                "UPDATE sessions SET expires = ? WHERE sid = ?", (now + self.ttl, sid))
+        return row[0]
+
+    def save(self, sid, value):
+        now = time.time()
+        connection = self._connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)",
+            (sid, value, now + self.ttl))
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            connection.execute("DELETE FROM sessions WHERE expires <= ?", (now,))
+
+    def delete(self, sid):
+        self._connect().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+
+class ServerSideSessionInterface(SessionInterface):
+    session_class = ServerSideSession
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt="server-session")
+
+    def _is_static(self, app, request):
+        if request.path.startswith(ASSETS_URL_PATH + "/"):
+            return True
+        return app.static_url_path and request.path.startswith(app.static_url_path + "/")
+
+    def open_session(self, app, request):
+        if self._is_static(app, request):
+            return self.session_class()
+
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        sid = None
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+
+        if sid:
+            started = time.perf_counter()
+            value = self.store.load(sid)
+            if value is not None:
+                data = serializer.loads(value)
+                observe_session(self.store.name, "load", time.perf_counter() - started)
+                return self.session_class(data, sid=sid)
+            observe_session(self.store.name, "miss", time.perf_counter() - started)
+
+        return self.session_class(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        if session.sid is None:
+            return
+
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if session.replaced_sid is not None:
+            self.store.delete(session.replaced_sid)
+
+        if not session:
+            if session.modified:
+                if not session.new:
+                    self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+                response.vary.add("Cookie")
+            return
+
+        if session.modified:
+            started = time.perf_counter()
+            value = serializer.dumps(dict(session))
+            self.store.save(session.sid, value)
+            observe_session(self.store.name, "save", time.perf_counter() - started)
+            observe_session_size(self.store.name, len(value))
+
+        # The id never changes, so the cookie only needs sending when it is new, or on
+        # every save for permanent sessions so their expiry moves forward.
+        if session.new or (session.modified and session.permanent):
+            response.set_cookie(
+                name, self._signer(app).sign(session.sid).decode(),
+                expires=self.get_expiration_time(app, session), httponly=httponly,
+                domain=domain, path=path, secure=secure, samesite=samesite)
+            response.vary.add("Cookie")
+
+
+class MeasuredCookieSessionInterface(SecureCookieSessionInterface):
+    # Flask's default signed-cookie session, with the same metrics as the server-side
+    # backends so the two can be compared.
+
+    def open_session(self, app, request):
+        started = time.perf_counter()
+        session = super().open_session(app, request)
+        if request.cookies.get(self.get_cookie_name(app)):
+            observe_session("cookie", "load", time.perf_counter() - started)
+        return session
+
+    def save_session(self, app, session, response):
+        started = time.perf_counter()
+        super().save_session(app, session, response)
+        name = self.get_cookie_name(app) + "="
+        for header in response.headers.getlist("Set-Cookie"):
+            if header.startswith(name) and session:
+                observe_session("cookie", "save", time.perf_counter() - started)
+                observe_session_size("cookie", len(header.split(";", 1)[0]) - len(name))
+
+
+def regenerate(session):
+    # New session id for a server-side session (see above). Flask's cookie session has
+    # no id: its whole content is re-signed into a new cookie on the next save anyway.
+    if isinstance(session, ServerSideSession):
+        session.regenerate()
+
+
+def create_session_interface():
+    backend = os.getenv('SESSION_BACKEND', 'cookie')
+    ttl = float(os.getenv('SESSION_TTL', 28800))
+    if backend == 'memory':
+        return ServerSideSessionInterface(MemorySessionStore(
+            ttl, maxsize=int(os.getenv('SESSION_MAX_ENTRIES', 10000))))
+    if backend == 'sqlite':
+        return ServerSideSessionInterface(SQLiteSessionStore(
+            os.getenv('SESSION_SQLITE_PATH', '/tmp/control_center_sessions.sqlite3'), ttl))
+    return MeasuredCookieSessionInterface()
+
+
+def init_app(app):
+    app.session_interface = create_session_interface()
@@ -0,0 +1,63 @@
+import threading
+
+
+# Request coalescing: concurrent callers of do() with the same key share one call of
+# `fn` and its result (or exception) instead of each making it. Only callers that
+# overlap the in-flight call share it; the result is not kept afterwards, that is what
+# the caches in cache.py are for.
+#
+# Uses threading primitives, which gunicorn's gevent worker monkey-patches into greenlet
+# ones, so it coalesces across threads in sync mode and across greenlets in async mode.
+# Every group registers itself in GROUPS so call/shared counts can be reported.
+
+GROUPS = {}
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.shared = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        GROUPS[name] = self
+
+    def do(self, key, fn):
+        # Returns (result, shared): shared is True when another caller made the call.
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+            return call.value, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._inflight)}
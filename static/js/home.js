@@ -0,0 +1,329 @@
+// Attach modal triggers (delegated, grid rows are replaced when paging)
+document.getElementById('appGridBody').addEventListener('click', function (e) {
+    if (e.target.closest('.show-modal')) {
+        var please_wait = new bootstrap.Modal(document.getElementById('exampleModal'));
+        please_wait.show();
+    }
+});
+
+// Ensure modal is closed when coming back with browser navigation
+window.addEventListener('pageshow', function () {
+    var modalEl = document.getElementById('exampleModal');
+    var modal = bootstrap.Modal.getInstance(modalEl);
+    if (modal) {
+        modal.hide();
+    } else {
+        modalEl.classList.remove('show');
+        modalEl.style.display = 'none';
+        document.body.classList.remove('modal-open');
+        document.querySelectorAll('.modal-backdrop').forEach(el => el.remove());
+    }
+});
+
+// Application grid state, paged/sorted/filtered server-side by /api/apps.
+// The first page's numbers are rendered into #appGridState by home.html.
+const appGrid = Object.assign({
+    sort: '',
+    order: 'asc',
+    q: '',
+    status: ''
+}, JSON.parse(document.getElementById('appGridState').textContent));
+let appSearchTimer = null;
+let appGridRequest = null;
+
+function filterApps() {
+    clearTimeout(appSearchTimer);
+    appSearchTimer = setTimeout(function () {
+        appGrid.q = document.getElementById('appSearch').value.trim();
+        appGrid.status = document.getElementById('appStatusFilter').value;
+        appGrid.page = 1;
+        loadApps();
+    }, 250);
+}
+
+function changeAppPage(step) {
+    const page = appGrid.page + step;
+    if (page < 1 || page > appGrid.pages) {
+        return;
+    }
+    appGrid.page = page;
+    loadApps();
+}
+
+// Export links download every page of the grid as it is currently searched and sorted.
+document.querySelectorAll('.app-export').forEach(function (link) {
+    link.addEventListener('click', function () {
+        const params = new URLSearchParams({ format: link.dataset.format, order: appGrid.order });
+        if (link.dataset.expand) params.set('expand', link.dataset.expand);
+        if (appGrid.sort) params.set('sort', appGrid.sort);
+        if (appGrid.q) params.set('q', appGrid.q);
+        if (appGrid.status) params.set('status', appGrid.status);
+        link.href = '/api/apps/export?' + params.toString();
+    });
+});
+
+async function loadApps() {
+    const params = new URLSearchParams({
+        format: 'html',
+        page: appGrid.page,
+        limit: appGrid.limit,
+        order: appGrid.order
+    });
+    if (appGrid.sort) params.set('sort', appGrid.sort);
+    if (appGrid.q) params.set('q', appGrid.q);
+    if (appGrid.status) params.set('status', appGrid.status);
+
+    // Drop responses for requests superseded by a newer one
+    const request = appGridRequest = params.toString();
+    try {
+        const response = await fetch('/api/apps?' + request);
+        const result = await response.json();
+        if (request !== appGridRequest) {
+            return;
+        }
+        if (!response.ok) {
+            alert(result.message || "Failed to load applications.");
+            return;
+        }
+        document.getElementById('appGridBody').innerHTML = result.html;
+        Object.assign(appGrid, { page: result.page, pages: result.pages, total: result.total });
+        renderAppPager();
+        prefetchAppDetails();
+    } catch (error) {
+        console.error("Error occurred:", error);
+    }
+}
+
+// Warm the server's modules/dimensions cache for the rows on this page
+function prefetchAppDetails() {
+    const appIds = Array.from(document.querySelectorAll('#appGridBody tr[data-app-id]'))
+        .filter(row => row.querySelector('.modules-link, .dimension-link'))
+        .map(row => row.dataset.appId);
+    if (appIds.length === 0) {
+        return;
+    }
+    fetch('/api/apps/prefetch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ app_ids: appIds })
+    }).catch(error => console.error("Prefetch failed:", error));
+}
+
+function renderAppPager() {
+    const first = appGrid.total === 0 ? 0 : (appGrid.page - 1) * appGrid.limit + 1;
+    const last = Math.min(appGrid.page * appGrid.limit, appGrid.total);
+    document.getElementById('appPagerSummary').textContent =
+        `Showing ${first}-${last} of ${appGrid.total} applications`;
+    document.getElementById('appPagerPage').textContent = `Page ${appGrid.page} of ${appGrid.pages}`;
+    document.getElementById('appPagerPrev').disabled = appGrid.page <= 1;
+    document.getElementById('appPagerNext').disabled = appGrid.page >= appGrid.pages;
+}
+
+document.querySelectorAll('.sortable').forEach(function (th) {
+    th.addEventListener('click', function () {
+        const sort = this.dataset.sort;
+        appGrid.order = (appGrid.sort === sort && appGrid.order === 'asc') ? 'desc' : 'asc';
+        appGrid.sort = sort;
+        appGrid.page = 1;
+        document.querySelectorAll('.sortable').forEach(el => el.removeAttribute('data-order'));
+        this.dataset.order = appGrid.order;
+        loadApps();
+    });
+});
+
+renderAppPager();
+prefetchAppDetails();
+
+function addDimension() {
+    const moduleList = document.getElementById("select_available_dimensions");
+    const selectedModules = document.getElementById("select_selected_dimensions");
+
+    for (let i = moduleList.options.length - 1; i >= 0; i--) {
+        const option = moduleList.options[i];
+        if (option.selected) {
+            const newOption = document.createElement("option");
+            newOption.value = option.value;
+            newOption.text = option.text;
+            selectedModules.add(newOption);
+            moduleList.remove(i);  // Remove from available list
+        }
+    }
+}
+
+function removeDimension() {
+    const moduleList = document.getElementById("select_available_dimensions");
+    const selectedModules = document.getElementById("select_selected_dimensions");
+
+    for (let i = selectedModules.options.length - 1; i >= 0; i--) {
+        const option = selectedModules.options[i];
+        if (option.selected) {
+            const newOption = document.createElement("option");
+            newOption.value = option.value;
+            newOption.text = option.text;
+            moduleList.add(newOption);
+            selectedModules.remove(i);  // Remove from selected list
+        }
+    }
+}
+
+function addModule() {
+    const module_name = document.getElementById("txt_module_name").value;
+    const link_url = document.getElementById("txt_link_url").value;
+
+    if (module_name && link_url) {
+        const table = document.getElementById("table_modules");
+        const newRow = table.insertRow(-1);
+        newRow.innerHTML = `
+            <td class="col-6 align-middle p-1">${module_name}</td>
+            <td class="col-6 align-middle p-1 link-underline link-primary">${link_url}</td>
+            <td class="col-1 align-middle p-1">
+                <button class="btn btn-sm p-1" onclick="this.parentElement.parentElement.remove()" title="Remove Module">
+                    <i class="bi bi-trash text-dark"></i>
+                </button>
+        `;
+        document.getElementById("txt_module_name").value = "";
+        document.getElementById("txt_link_url").value = "";
+    }
+}
+
+function submitForm() {
+    // Collect input values
+    const function_mode = document.getElementById('function_mode').value.trim();
+    const applicationName = document.getElementById("txt_application_name").value.trim();
+    const applicationLink = document.getElementById("txt_application_link").value.trim();
+    const status = document.getElementById("select_status").value.trim();
+    const owner = document.getElementById("txt_owner").value.trim();
+    const permissions = {
+        read: document.getElementById("check_read").checked,
+        write: document.getElementById("check_write").checked,
+        update: document.getElementById("check_update").checked,
+        delete: document.getElementById("check_delete").checked,
+    };
+    const selectedDimensions = Array.from(document.getElementById("select_selected_dimensions").options)
+        .map(option => option.value);
+
+    const modules = getModulesFromTable();
+
+    // ✅ Validation
+    const errors = [];
+    if (!applicationName) errors.push("Application Name is required.");
+    if (!applicationLink) errors.push("Application Link is required.");
+    if (!status) errors.push("Status must be selected.");
+    if (!owner) errors.push("Owner is required.");
+
+    const hasPermission = Object.values(permissions).some(p => p);
+    if (!hasPermission) errors.push("At least one permission must be selected.");
+
+    if (modules.length === 0) errors.push("At least one module must be added.");
+
+    if (errors.length > 0) {
+        alert("Please fix the following:\n\n" + errors.join("\n"));
+        return;
+    }
+
+    // ✅ Confirm before submitting
+    if (!confirm("Are you sure you want to save this application?")) {
+        return;
+    }
+
+    var notif_modal = new bootstrap.Modal(document.getElementById('savingNotif'));
+    notif_modal.show();
+
+    // ✅ All good, prepare the payload
+    const data = {
+        function_mode: function_mode,
+        application_name: applicationName,
+        application_link: applicationLink,
+        status: status,
+        owner: owner,
+        permissions: permissions,
+        selected_dimensions: selectedDimensions,
+        modules: modules
+    };
+
+    // ✅ Send to Flask backend
+    fetch('/submit-app-data', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    })
+        .then(response => response.json())
+        .then(result => {
+            console.log(result);
+            notif_modal.hide();
+            alert("Application saved successfully!");
+            window.location.reload();
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert("Something went wrong while saving.");
+        });
+}
+
+// ✅ Helper: Get modules from table
+function getModulesFromTable() {
+    const table = document.getElementById("table_modules");
+    const modules = [];
+
+    // Ensure we skip the header
+    const rows = table.getElementsByTagName("tr");
+    for (let i = 0; i < rows.length; i++) {
+        const row = rows[i];
+        const cells = row.getElementsByTagName("td");
+        if (cells.length >= 2) {
+            const module_name = cells[0].textContent.trim();
+            const link_url = cells[1].textContent.trim();
+            if (module_name && link_url) {
+                modules.push({ module_name, link_url });
+            }
+        }
+    }
+
+    return modules;
+}
+
+document.getElementById('appGridBody').addEventListener('click', function (e) {
+    const link = e.target.closest('.grid-btn-delete');
+    if (!link) return;
+
+    document.getElementById('hidden_app_id').value = link.dataset.appid || '';
+    document.getElementById('lbl_application_name').textContent = link.dataset.appname || '';
+});
+
+document.getElementById('btn_confirm_delete').addEventListener('click', async function () {
+    const confirmDeleteElement = document.getElementById('confirmDelete');
+    const confirm_delete_modal = bootstrap.Modal.getInstance(confirmDeleteElement);
+    if (confirm_delete_modal) {
+        confirm_delete_modal.hide();
+    }
+
+    var notif_modal = new bootstrap.Modal(document.getElementById('confirmDeleteNotif'));
+    notif_modal.show();
+
+    const data = {
+        app_id: document.getElementById('hidden_app_id').value || null
+    };
+
+    try {
+        const response = await fetch('/delete_app', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            console.log("Deleted successfully:", result);
+            window.location.reload();
+        } else {
+            console.error("Delete failed:", result.message);
+            alert("Failed to delete app.");
+        }
+    } catch (error) {
+        console.error("Error occurred:", error);
+        alert("An error occurred.");
+    }
+});
@@ -0,0 +1,40 @@
+document.getElementById('lnk_manage_user').addEventListener('click', function () {
+    var please_wait = new bootstrap.Modal(document.getElementById('exampleModal'));
+    please_wait.show();
+});
+
+// Attach modal triggers
+document.querySelectorAll('.show-modal').forEach(function (link) {
+    link.addEventListener('click', function (e) {
+        var please_wait = new bootstrap.Modal(document.getElementById('exampleModal'));
+        please_wait.show();
+    });
+});
+
+// Ensure modal is closed when coming back with browser navigation
+window.addEventListener('pageshow', function () {
+    var modalEl = document.getElementById('exampleModal');
+    var modal = bootstrap.Modal.getInstance(modalEl);
+    if (modal) {
+        modal.hide();
+    } else {
+        modalEl.classList.remove('show');
+        modalEl.style.display = 'none';
+        document.body.classList.remove('modal-open');
+        document.querySelectorAll('.modal-backdrop').forEach(el => el.remove());
+    }
+});
+
+document.querySelectorAll('[data-bs-theme-value]').forEach(button => {
+    button.addEventListener('click', () => {
+        const theme = button.getAttribute('data-bs-theme-value');
+        document.documentElement.setAttribute('data-bs-theme', theme);
+        localStorage.setItem('preferred-theme', theme);
+    });
+});
+
+// Load saved theme
+const savedTheme = localStorage.getItem('preferred-theme');
+if (savedTheme) {
+    document.documentElement.setAttribute('data-bs-theme', savedTheme);
+}
@@ -0,0 +1,938 @@
+    function disableSaveChanges(value){
+
+        const modalInput = document.getElementById('txt_full_name');
+        const modalBtn = document.getElementById('btn_enroll_user_modal');
+
+
+            if (modalInput.value.trim().length > 0) {
+                modalBtn.disabled = false;
+                console.log("It works");
+            } else {
+                modalBtn.disabled = true;
+                console.log("Not working");
+            }
+}
+
+    function validateIfEnrollTextboxEmpty(){
+        const openModalBtn = document.getElementById('btn_enroll_user_modal');
+
+        const confirmSaveElement = document.getElementById('confirmSave');
+        const confirm_save_modal = bootstrap.Modal.getInstance(confirmSaveElement);
+
+        const enrollModal = document.getElementById('enrolluser');
+        const enroll_user_modal = bootstrap.Modal.getInstance(enrollModal);
+
+        // Add a click listener to that button.
+        // const mode = document.getElementById('modal_mode').value; // 
+        // alert(`The user will perform ${mode}`);
+
+
+
+            // openModalBtn.addEventListener('click', function(event) {
+                const hcm_id = document.getElementById('txt_search_hcm').value;
+                const full_name = document.getElementById('txt_full_name').value;
+                const email = document.getElementById('txt_email').value;
+                const role_type = document.getElementById('ddl_role').value;
+                const sbu = document.getElementById('txt_sbu').value;
+                const job_position = document.getElementById('txt_job_position').value;
+                const ticket_number = document.getElementById('txt_ticket_number').value;
+                const access_start_date = document.getElementById('txt_access_date_start').value;
+                const access_end_date = document.getElementById('txt_access_date_end').value;
+                // const hcm_id = document.getElementById('txt_search_hcm').value = ;
+
+                const errors = [];
+
+                if (!job_position) errors.push("Job Position is required.");
+                if (!sbu) errors.push("SBU is required.");
+                if (!email) errors.push("Email is required.");
+                if (!hcm_id) errors.push("HCM ID is required.");
+                if (!ticket_number) errors.push("Ticket Number is required.");
+                if (!role_type) errors.push("Role Type is required.");
+                if (!access_start_date) errors.push("Access Start Date is required.");
+                if (!access_end_date) errors.push("Access End Date is required.");
+
+                if (errors.length > 0) {
+                    alert("Please fill up the required fields:\n\n" + errors.join("• \n"));
+                    console.log("This code gets triggered")
+                    return;
+
+                } 
+
+                if (confirm_save_modal) {
+                    confirm_save_modal.hide();
+                }
+                enroll_user_modal.hide();
+
+                var notif_modal_confirm_save = new bootstrap.Modal(document.getElementById('confirmSave'));
+                notif_modal_confirm_save.show();
+
+}
+
+//Javascript to get the user input in "Enroll administrator" modal to be inserted later on in python script
+   function insert_enroll_administrator() {
+
+       const confirmSaveElement = document.getElementById('confirmSave');
+       const confirm_save_modal = bootstrap.Modal.getInstance(confirmSaveElement);
+
+       const enrollModal = document.getElementById('enrolluser');
+       const enroll_user_modal = bootstrap.Modal.getInstance(enrollModal);
+
+       const user_id = document.getElementById('hidden_user_id').value;
+       const hcm_id = document.getElementById('txt_search_hcm').value;
+       const full_name = document.getElementById('txt_full_name').value;
+       const email = document.getElementById('txt_email').value;
+       const role_type = document.getElementById('ddl_role').value;
+       const sbu = document.getElementById('txt_sbu').value;
+       const job_position = document.getElementById('txt_job_position').value;
+       const ticket_number = document.getElementById('txt_ticket_number').value;
+       const access_start_date = document.getElementById('txt_access_date_start').value;
+       const access_end_date = document.getElementById('txt_access_date_end').value;
+
+
+       // More on checking nalang ako dito kung ano value nung "modal_mode", meron na ako pang event listener para sa edit, dito nalang sa button ng enroll
+
+       const mode = document.getElementById('modal_mode').value; // 
+       // alert(`The user will perform ${mode}`)
+
+
+
+
+       // const hcm_id = document.getElementById('txt_search_hcm').value = ;
+
+       // const errors = [];
+
+       // if (!job_position) errors.push("Job Position is required.");
+       // if (!sbu) errors.push("SBU is required.");
+       // if (!email) errors.push("Email is required.");
+       // if (!hcm_id) errors.push("HCM ID is required.");
+       // if (!ticket_number) errors.push("Ticket Number is required.");
+       // if (!role_type) errors.push("Role Type is required.");
+       // if (!access_start_date) errors.push("Access Start Date is required.");
+       // if (!access_end_date) errors.push("Access End Date is required.");
+
+       // if (errors.length > 0) {
+       //     alert("Please fill up the required fields:\n\n" + errors.join("\n"));
+       //     return;
+       // }
+
+
+       if (confirm_save_modal) {
+           confirm_save_modal.hide();
+       }
+
+       var notif_modal = new bootstrap.Modal(document.getElementById('confirmSaveNotifLabel'));
+       notif_modal.show();
+
+       const administrator_details = {
+           user_id: user_id,
+           hcm_id: hcm_id,
+           email: email,
+           full_name: full_name,
+           sbu: sbu,
+           role_type: role_type,
+           job_position: job_position,
+           ticket_number: ticket_number,
+           access_start_date: access_start_date,
+           access_end_date: access_end_date,
+           mode: mode
+       }
+
+
+       fetch('/insert_enroll_administrator', {
+           method: 'POST',
+           headers: {
+               'Content-Type': 'application/json'
+           },
+           body: JSON.stringify(administrator_details)
+       })
+           .then(response => response.json())
+           .then(data => {
+
+
+               // Check if the response was successful and has a message
+               if (data.status === 'success' && data.message) {
+                   // alert(data.message);
+                   notif_modal.hide();
+                   loadAdmins();
+               }  else if (data.status === 'error' && data.message === 'Please input a VALID HCM ID...') {
+                   alert(data.message);
+                   enroll_user_modal.show();
+                   notif_modal.hide();
+               }   else if (data.status === 'error' && data.message) {
+                   alert(data.message);
+                   window.location.reload();
+               }
+
+           })
+           .catch(error => {
+               console.error('Error:', error);
+           });
+   }
+
+// Delete Administrator
+//Delete Function
+document.getElementById('btn_confirm_delete').addEventListener('click', async function () {
+    const confirmDeleteElement = document.getElementById('confirmDelete');
+    const confirm_delete_modal = bootstrap.Modal.getInstance(confirmDeleteElement);
+
+    if (confirm_delete_modal) {
+        confirm_delete_modal.hide();
+    }
+
+    var notif_modal = new bootstrap.Modal(document.getElementById('confirmDeleteNotif'));
+    notif_modal.show();
+
+    const data = {
+        user_id: document.getElementById('hidden_user_id').value || '',
+        deletion_reason: document.getElementById('txt_deletion_reason').value || ''
+    };
+
+    console.log(`This is the user id to be deleted: ${data}`)
+
+    try {
+        const response = await fetch('/delete_administrator', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            console.log("Deleted successfully:", result);
+            // alert("Administrator deleted successfully.");
+            notif_modal.hide();
+            document.getElementById('txt_deletion_reason').value = '';
+            document.getElementById('btn_confirm_delete').disabled = true;
+            loadAdmins();
+        } else {
+            console.error("Delete failed:", result.message);
+            alert("Failed to delete Administrator.");
+        }
+    } catch (error) {
+        console.error("Error occurred:", error);
+        alert("An error occurred.");
+    }
+});
+
+// Search in gridview: answered as JSON by /api/administrators from the server's index of
+// the administrator list, and the rows are swapped in place instead of reloading the page.
+let adminSearchTimer = null;
+let adminGridRequest = null;
+
+function filterAdmins() {
+    clearTimeout(adminSearchTimer);
+    adminSearchTimer = setTimeout(loadAdmins, 250);
+}
+
+// Export links download the administrators matching the current search and filters.
+document.querySelectorAll('.admin-export').forEach(function (link) {
+    link.addEventListener('click', function () {
+        const params = new URLSearchParams({ format: link.dataset.format });
+        const q = document.getElementById('txt_search_employee').value.trim();
+        const sbu = document.getElementById('ddl_filter_sbu').value;
+        const role = document.getElementById('ddl_filter_role').value;
+        if (q) params.set('q', q);
+        if (sbu) params.set('sbu', sbu);
+        if (role) params.set('role', role);
+        link.href = '/api/administrators/export?' + params.toString();
+    });
+});
+
+async function loadAdmins() {
+    clearTimeout(adminSearchTimer);
+    const params = new URLSearchParams({ format: 'html' });
+    const q = document.getElementById('txt_search_employee').value.trim();
+    const sbu = document.getElementById('ddl_filter_sbu').value;
+    const role = document.getElementById('ddl_filter_role').value;
+    if (q) params.set('q', q);
+    if (sbu) params.set('sbu', sbu);
+    if (role) params.set('role', role);
+
+    // Drop responses for requests superseded by a newer one
+    const request = adminGridRequest = params.toString();
+    try {
+        const response = await fetch('/api/administrators?' + request);
+        const result = await response.json();
+        if (request !== adminGridRequest) {
+            return;
+        }
+        if (!response.ok) {
+            alert(result.message || "Failed to load administrators.");
+            return;
+        }
+        document.getElementById('adminGridBody').innerHTML = result.html;
+        renderAdminSummary(result.total, result.count, Boolean(q || sbu || role));
+    } catch (error) {
+        console.error("Error occurred:", error);
+    }
+}
+
+function renderAdminSummary(total, count, filtered) {
+    document.getElementById('adminGridSummary').textContent = filtered
+        ? `Showing ${total} of ${count} administrators`
+        : '';
+}
+
+document.getElementById('retrieve_administrator_details_forms').addEventListener('submit', function (event) {
+    event.preventDefault();
+    loadAdmins();
+});
+document.getElementById('txt_search_employee').addEventListener('input', filterAdmins);
+document.getElementById('ddl_filter_sbu').addEventListener('change', loadAdmins);
+document.getElementById('ddl_filter_role').addEventListener('change', loadAdmins);
+
+// To get the user_id to be used later for Edit Query
+
+// Edit function javascript
+var notif_modal_edit = new bootstrap.Modal(document.getElementById('enrolluser'));
+
+
+ //To properly get the user ID to be use in Edit function, 
+ //delegated to the grid body, as searches replace its rows
+document.addEventListener('DOMContentLoaded', function () {
+    //Call enroll modal and reuse it but in Edit mode
+    document.getElementById('adminGridBody').addEventListener('click', function (event) {
+        const link = event.target.closest('.grid-btn-edit');
+        if (!link) return;
+        document.getElementById('hidden_user_id').value = link.dataset.userid || '';
+
+        //Set value "Edit" if user clicked the edit button to be validated in insert_enroll_administrator
+        document.getElementById('modal_mode').value = "Edit"
+        //Dito yung i sset ko pagiging dynamic nung sa header ng modal
+        document.getElementById('lbl_modal_mode').textContent = "Edit Existing"
+        document.getElementById('lbl_confirm_edit_insert').textContent = "apply changes for";
+        document.getElementById('lbl_confirm_edit_insert_header').textContent = "Confirm Changes For";
+        document.getElementById('span_search_hcm_id').textContent = "HCM ID:"
+
+        document.getElementById('lbl_confirm_spinner_insert').innerHTML = `Applying changes for <p><p/> ${link.dataset.full_name}`;
+
+
+        const mode = document.getElementById('modal_mode').value
+        // alert(`The user will perform ${mode}`)
+
+        const search_hcm_id_txt = document.getElementById('txt_search_hcm');
+        const search_hcm_id_btn = document.getElementById('btn_search_hcm_id');
+
+        btn_search_hcm_id.disabled = true;
+        search_hcm_id_txt.readOnly = true;
+
+
+        const hcm_id = link.dataset.hcm_id || '';
+        const full_name = link.dataset.full_name || '';
+        const sbu = link.dataset.sbu || '';
+        const position = link.dataset.position || '';
+        const role_type = link.dataset.role|| '';
+        const access_start_date = link.dataset.access_start_date|| '';
+        const access_end_date = link.dataset.access_end_date || '';
+        const email = link.dataset.email || '';
+        const ticket_number = link.dataset.ticket_number || '';
+
+        console.log(`This is the start date :${access_start_date}`);
+        console.log(`This is the end date :${access_end_date}`);
+
+
+        document.getElementById('txt_search_hcm').value = hcm_id ;
+        document.getElementById('txt_full_name').value = full_name ;                    
+        document.getElementById('txt_email').value = email;
+        document.getElementById('txt_ticket_number').value = ticket_number;
+        document.getElementById('txt_job_position').value = position;
+        document.getElementById('txt_sbu').value = sbu;
+        document.getElementById('ddl_role').value = role_type;
+        document.getElementById('txt_access_date_start').value = access_start_date;
+        document.getElementById('txt_access_date_end').value = access_end_date;
+
+        disableSaveChanges();
+        notif_modal_edit.show();
+
+
+
+        // const user_id = document.getElementById('hidden_user_id').value
+        // alert(`The details of the employee to be edited are:  \n ${hcm_id} \n ${full_name}    \n ${sbu}   \n ${position} \n ${access_start_date} \n ${access_end_date} \n ${email} \n ${ticket_number} `);
+    });
+
+});
+
+
+
+
+
+//     const userID = this.dataset.userid || ''
+// console.log(`This is a user ID ${userID}`)
+
+// Will display in confirm save modal on who is to be added as new administrator
+//Dito ko iallagay yung isa pang event listener na click at dito ko ilalagay yung document.getElementById('modal_mode').value = "Save";
+//Hindi magandang placement yung document.getElementById('modal_mode').value = "Save"; sa save_btn, dapat naka hiwalay
+//Ito yung event na pagka click doon sa navbar na "Enroll New User" i sset ko na mode = "Save", hindi yung nasa Save Changes
+document.addEventListener('DOMContentLoaded', function () {
+const open_enroll_modal = document.getElementById('open_enroll_modal');
+    open_enroll_modal.addEventListener('click', function() {
+
+        //Set input type hidden to "Save" to initialized later on in payload
+        document.getElementById('modal_mode').value = "Save";
+        document.getElementById('lbl_modal_mode').textContent = "Enroll New";
+        document.getElementById('lbl_confirm_edit_insert').textContent = "add administrator";
+        document.getElementById('lbl_confirm_edit_insert_header').textContent = "Confirm Add New ";
+        document.getElementById('lbl_confirm_spinner_insert').textContent = "Adding new Administrator";
+        document.getElementById('span_search_hcm_id').textContent = "Search HCM ID:";
+
+
+
+
+
+
+        // alert("The mode will be Save")
+    });
+});
+
+//Function for searching HCM ID then passing it to API
+async function search_hcm_id() {
+    const hcm_id = document.getElementById('txt_search_hcm').value;
+
+    try {
+
+            if (hcm_id.trim().length === 0) {
+                alert("Please input a HCM ID");
+                return;
+            }
+            const enrollModal = document.getElementById('enrolluser');
+            const enroll_user_modal = bootstrap.Modal.getInstance(enrollModal);
+
+            var notif_modal_search = new bootstrap.Modal(document.getElementById('searchEmployeeEnrollSpinner'));
+            notif_modal_search.show();
+            enroll_user_modal.hide();
+
+            // searchEmployeeEnrollSpinner yung name ng spinner para sa search hcm id
+
+        const response = await fetch('/search_hcm_id', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ hcm_id: hcm_id })
+        });
+
+        // This is the correct way to check for a successful HTTP status
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const data = await response.json();
+        console.log(data.status)
+
+        // Check if the response was successful based on your API's status field
+        if (data.status === 'success' && data.message) {
+            // alert(data.message);
+
+            const rows = data.result;
+            console.log(rows);
+
+            if (rows && rows.length > 0) {
+                document.getElementById('txt_search_hcm').value = rows[0].hcm_id;
+                document.getElementById('txt_full_name').value = rows[0].full_name;
+                document.getElementById('txt_email').value = rows[0].email;
+                document.getElementById('txt_sbu').value = rows[0].sbu;
+                document.getElementById('txt_job_position').value = rows[0].job_position;
+
+                disableSaveChanges();
+                notif_modal_search.hide();
+                enroll_user_modal.show();
+
+
+            } else {
+                // alert("No results found.");
+                disableSaveChanges();
+                notif_modal_search.hide();
+                alert("No results found.");
+                enroll_user_modal.show();
+
+            }
+
+        } else if (data.status === 'error') {
+            // alert(data.message);
+            notif_modal_search.hide();
+            alert(data.message);
+            enroll_user_modal.show();
+        }
+
+    } catch (error) {
+        // This catches any network or parsing errors
+        console.error('Error:', error);
+        alert('An error occurred during the search.');
+
+    }
+}
+
+// Typeahead for the HCM ID box: suggestions come from /api/employees/search, which
+// answers from the server's employee index. Requests wait for a pause in typing and an
+// older request still in flight is cancelled, so typing a name costs one call.
+const HCM_TYPEAHEAD_DELAY = 200;
+
+document.addEventListener('DOMContentLoaded', function () {
+    const input = document.getElementById('txt_search_hcm');
+    const list = document.getElementById('hcm_suggestions');
+    if (!input || !list) return;
+
+    let timer = null;
+    let controller = null;
+    let active = -1;
+
+    function hideSuggestions() {
+        list.style.display = 'none';
+        list.replaceChildren();
+        input.setAttribute('aria-expanded', 'false');
+        active = -1;
+    }
+
+    function pickEmployee(row) {
+        input.value = row.hcm_id;
+        document.getElementById('txt_full_name').value = row.full_name;
+        document.getElementById('txt_email').value = row.email;
+        document.getElementById('txt_sbu').value = row.sbu;
+        document.getElementById('txt_job_position').value = row.job_position;
+        hideSuggestions();
+        disableSaveChanges();
+    }
+
+    function highlight(index) {
+        const items = list.querySelectorAll('.list-group-item');
+        items.forEach((item, i) => item.classList.toggle('active', i === index));
+        if (items[index]) items[index].scrollIntoView({ block: 'nearest' });
+        active = index;
+    }
+
+    function showSuggestions(rows) {
+        list.replaceChildren();
+        active = -1;
+        if (!rows.length) {
+            hideSuggestions();
+            return;
+        }
+        rows.forEach(function (row) {
+            const item = document.createElement('button');
+            item.type = 'button';
+            item.className = 'list-group-item list-group-item-action rounded-0 py-1 px-2';
+            item.setAttribute('role', 'option');
+            const name = document.createElement('div');
+            name.textContent = `${row.hcm_id} - ${row.full_name}`;
+            const detail = document.createElement('small');
+            detail.className = 'text-body-secondary';
+            detail.textContent = [row.email, row.sbu].filter(Boolean).join(' | ');
+            item.append(name, detail);
+            // mousedown fires before the input's blur hides the list.
+            item.addEventListener('mousedown', function (event) {
+                event.preventDefault();
+                pickEmployee(row);
+            });
+            list.appendChild(item);
+        });
+        list.style.display = 'block';
+        input.setAttribute('aria-expanded', 'true');
+    }
+
+    async function fetchSuggestions(query) {
+        if (controller) controller.abort();
+        controller = new AbortController();
+        try {
+            const response = await fetch(`/api/employees/search?q=${encodeURIComponent(query)}&limit=10`,
+                { signal: controller.signal });
+            if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+            const data = await response.json();
+            // Ignore an answer for text that has been changed since.
+            if (input.value.trim() === query) showSuggestions(data.results || []);
+        } catch (error) {
+            if (error.name !== 'AbortError') console.error('Typeahead error:', error);
+        }
+    }
+
+    input.addEventListener('input', function () {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (input.readOnly || query.length < 2) {
+            if (controller) controller.abort();
+            hideSuggestions();
+            return;
+        }
+        timer = setTimeout(() => fetchSuggestions(query), HCM_TYPEAHEAD_DELAY);
+    });
+
+    input.addEventListener('keydown', function (event) {
+        const items = list.querySelectorAll('.list-group-item');
+        if (list.style.display === 'none' || !items.length) return;
+        if (event.key === 'ArrowDown') {
+            event.preventDefault();
+            highlight((active + 1) % items.length);
+        } else if (event.key === 'ArrowUp') {
+            event.preventDefault();
+            highlight((active - 1 + items.length) % items.length);
+        } else if (event.key === 'Enter' && active >= 0) {
+            event.preventDefault();
+            items[active].dispatchEvent(new MouseEvent('mousedown'));
+        } else if (event.key === 'Escape') {
+            hideSuggestions();
+        }
+    });
+
+    input.addEventListener('blur', hideSuggestions);
+});
+
+
+// //Javascript to get the user input in "Enroll administrator" modal to be inserted later on in python script
+// function insert_enroll_administrator() {
+
+//     const confirmSaveElement = document.getElementById('confirmSave');
+//     const confirm_save_modal = bootstrap.Modal.getInstance(confirmSaveElement);
+
+//     const enrollModal = document.getElementById('enrolluser');
+//     const enroll_user_modal = bootstrap.Modal.getInstance(enrollModal);
+
+//     const user_id = document.getElementById('hidden_user_id').value;
+//     const hcm_id = document.getElementById('txt_search_hcm').value;
+//     const full_name = document.getElementById('txt_full_name').value;
+//     const email = document.getElementById('txt_email').value;
+//     const role_type = document.getElementById('ddl_role').value;
+//     const sbu = document.getElementById('txt_sbu').value;
+//     const job_position = document.getElementById('txt_job_position').value;
+//     const ticket_number = document.getElementById('txt_ticket_number').value;
+//     const access_start_date = document.getElementById('txt_access_date_start').value;
+//     const access_end_date = document.getElementById('txt_access_date_end').value;
+
+
+//     // More on checking nalang ako dito kung ano value nung "modal_mode", meron na ako pang event listener para sa edit, dito nalang sa button ng enroll
+
+//     const mode = document.getElementById('modal_mode').value; // 
+//     alert(`The user will perform ${mode}`)
+
+
+
+
+//     // const hcm_id = document.getElementById('txt_search_hcm').value = ;
+
+//     // const errors = [];
+
+//     // if (!job_position) errors.push("Job Position is required.");
+//     // if (!sbu) errors.push("SBU is required.");
+//     // if (!email) errors.push("Email is required.");
+//     // if (!hcm_id) errors.push("HCM ID is required.");
+//     // if (!ticket_number) errors.push("Ticket Number is required.");
+//     // if (!role_type) errors.push("Role Type is required.");
+//     // if (!access_start_date) errors.push("Access Start Date is required.");
+//     // if (!access_end_date) errors.push("Access End Date is required.");
+
+//     // if (errors.length > 0) {
+//     //     alert("Please fill up the required fields:\n\n" + errors.join("\n"));
+//     //     return;
+//     // }
+
+
+//     if (confirm_save_modal) {
+//         confirm_save_modal.hide();
+//     }
+
+//     var notif_modal = new bootstrap.Modal(document.getElementById('confirmSaveNotifLabel'));
+//     notif_modal.show();
+
+//     const administrator_details = {
+//         user_id: user_id,
+//         hcm_id: hcm_id,
+//         email: email,
+//         full_name: full_name,
+//         sbu: sbu,
+//         role_type: role_type,
+//         job_position: job_position,
+//         ticket_number: ticket_number,
+//         access_start_date: access_start_date,
+//         access_end_date: access_end_date,
+//         mode: mode
+//     }
+
+
+//     fetch('/insert_enroll_administrator', {
+//         method: 'POST',
+//         headers: {
+//             'Content-Type': 'application/json'
+//         },
+//         body: JSON.stringify(administrator_details)
+//     })
+//         .then(response => response.json())
+//         .then(data => {
+
+
+//             // Check if the response was successful and has a message
+//             if (data.status === 'success' && data.message) {
+//                 alert(data.message);
+//                 window.location.reload();
+//             }  else if (data.status === 'error' && data.message === 'Please input a VALID HCM ID...') {
+//                 alert(data.message);
+//                 enroll_user_modal.show();
+//                 notif_modal.hide();
+//             }   else if (data.status === 'error' && data.message) {
+//                 alert(data.message);
+//                 window.location.reload();
+//             }
+
+//         })
+//         .catch(error => {
+//             console.error('Error:', error);
+//         });
+// }
+
+//To properly get the user ID to be use in DELETE function
+document.addEventListener('DOMContentLoaded', function () {
+    document.getElementById('adminGridBody').addEventListener('click', function (event) {
+        const link = event.target.closest('.grid-btn-delete');
+        if (!link) return;
+        document.getElementById('hidden_user_id').value = link.dataset.userid || '';
+        document.getElementById('lbl_user_full_name').textContent = link.dataset.username || '';
+    });
+});
+
+//To prevent user input of Alphabet and special characters for fields that is numbers only
+    const numberInput = document.getElementById('txt_ticket_number');
+
+    numberInput.addEventListener('input', function(event) {
+        // This regular expression checks for one or more numbers (0-9)
+        // and a global flag (g) to check the entire string.
+        this.value = this.value.replace(/[^0-9]/g, '');
+    });
+
+// Disable or Enable the Yes button in Confirm Delete to ensure the deletion reason textbox is not empty
+document.addEventListener('DOMContentLoaded', function() {
+    const txt_deletion_reason = document.getElementById('txt_deletion_reason');
+    const disable_confirm_delete_button = document.getElementById('btn_confirm_delete');
+
+
+    // const grid_btn_delete = document.getElementById('grid-btn-delete');
+    console.log("Delete button was clicked")
+    txt_deletion_reason.addEventListener('input', function() {
+        // Trim() removes any leading or trailing whitespace.
+        // The condition checks if the trimmed value's length is 0.
+        if (txt_deletion_reason.value.trim().length === 0) {
+            // If the textbox is empty, disable the button
+            disable_confirm_delete_button.disabled = true;
+        } else {
+            // If there's content, enable the button
+            disable_confirm_delete_button.disabled = false;
+        }
+        console.log(txt_deletion_reason.value.trim().length)
+    });
+
+
+
+
+
+
+
+
+
+
+
+
+
+});
+
+//Validate if textbox is empty, disable Save Changes button
+document.addEventListener('DOMContentLoaded', function () {
+    const myModalEl = document.getElementById('enrolluser');
+    // const search_hcm_id_spanner = document.getElementById('span_search_hcm_id');
+    // const modal_mode = document.getElementById('modal_mode').value;
+
+    myModalEl.addEventListener('shown.bs.modal', function () {
+
+        console.log("The modal is now fully open!");
+
+        // You can now populate data or perform other tasks.
+        disableSaveChanges();
+    });
+
+
+
+});
+
+        //When "Save Changes" is clicked, display the user 
+    document.addEventListener('DOMContentLoaded', function () {
+    const save_btn = document.getElementById('btn_enroll_user_modal');
+
+
+    save_btn.addEventListener('click', function() {
+        document.getElementById('lbl_add_admin').textContent = document.getElementById('txt_full_name').value || '';
+
+        //Set input type hidden to "Save" to initialized later on in payload
+        // document.getElementById('modal_mode').value = "Save";
+    });
+});
+
+//Validation that clears the textboxes in Enroll Modal when "Close" was clicked or other "Close" button
+    document.addEventListener('DOMContentLoaded', function () {
+        const close_enroll = document.getElementById('btn_close_enroll_modal');
+        const close_delete = document.getElementById('btn_close_delete');
+        const notif_modal_enroll = document.getElementById('enrolluser');
+        const notif_confirm_delete = document.getElementById('confirmDelete');
+
+
+        //To properly handle search hcm textbox in edit mode
+        const search_hcm_id_txt = document.getElementById('txt_search_hcm');
+        const search_hcm_id_btn = document.getElementById('btn_search_hcm_id');
+
+
+        // The scope of this textboxes, dropdowns and dateinputs are only for Enroll New User Modal
+        const textboxes_modal_enroll = notif_modal_enroll.querySelectorAll('input[type="text"]');
+        // Get all select elements inside the modal.
+        const dropdowns_modal_enroll = notif_modal_enroll.querySelectorAll('select');
+        // Get all date inputs inside the modal.
+        const dateInputs_modal_enroll = notif_modal_enroll.querySelectorAll('input[type="date"]');
+
+
+        const textboxes_delete_confirm = notif_confirm_delete.querySelectorAll('input[type="text"]');
+
+
+
+        close_enroll.addEventListener('click', function() {
+            console.log("CLOSED")
+            disableSaveChanges();
+            // notif_modal_edit.addEventListener('hide.bs.modal', function(event) {
+                // 3. Get all input fields inside the modal.
+
+                dropdowns_modal_enroll.forEach(dropdown => {
+                    dropdown.selectedIndex = 0;
+                });
+
+                console.log("Dropdownlist have been cleared.");
+
+                dateInputs_modal_enroll.forEach(dateInput => {
+                    dateInput.value = '';
+                });
+
+                console.log("Datepickers have been cleared.");
+
+                // 4. Loop through each textbox and clear its value.
+                textboxes_modal_enroll.forEach(textbox => {
+                    textbox.value = '';
+                });
+
+                console.log("Modal textboxes have been cleared.");
+
+                search_hcm_id_txt.readOnly = false;
+                search_hcm_id_btn.disabled = false;
+
+
+
+            // });
+
+        });
+
+
+        close_delete.addEventListener('click', function() {
+
+            // 4. Loop through each textbox and clear its value.
+            textboxes_delete_confirm.forEach(textbox => {
+                textbox.value = '';
+            });
+
+
+            console.log("This script is triggered but it is not clearing.");
+
+        });
+
+
+
+    });
+
+
+// Bulk enrollment from CSV. The server answers with NDJSON (one JSON object per line:
+// a result per row, progress after each batch, a summary at the end), read here as it
+// arrives so the progress bar and results table fill in while the import runs.
+document.addEventListener('DOMContentLoaded', function () {
+    const fileInput = document.getElementById('file_bulk_import');
+    const importBtn = document.getElementById('btn_bulk_import');
+    if (!fileInput || !importBtn) return;
+
+    const bulkStatusClass = { enrolled: 'text-success', valid: 'text-success', invalid: 'text-danger', failed: 'text-danger', unknown: 'text-warning' };
+    let totalRows = 0;
+
+    fileInput.addEventListener('change', function () {
+        importBtn.disabled = fileInput.files.length === 0;
+    });
+
+    function showBulkRow(event) {
+        const row = document.createElement('tr');
+        [event.line ?? '', event.hcm_id ?? '', event.status ?? 'error', event.message ?? ''].forEach(function (value, i) {
+            const cell = document.createElement('td');
+            cell.textContent = value;
+            if (i === 2) cell.className = bulkStatusClass[event.status] || 'text-danger';
+            row.appendChild(cell);
+        });
+        document.getElementById('bulk_import_rows').appendChild(row);
+        document.getElementById('tbl_bulk_import').classList.remove('d-none');
+    }
+
+    function showBulkProgress(event) {
+        const done = event.type === 'summary';
+        const percent = done || !totalRows ? 100 : Math.min(100, Math.round(100 * event.rows / totalRows));
+        document.getElementById('bulk_import_progress').style.width = `${percent}%`;
+        const verb = event.dry_run ? 'valid' : 'enrolled';
+        document.getElementById('bulk_import_summary').textContent =
+            `${done ? 'Done' : 'Working'}: ${event.rows} rows, ${event.dry_run ? event.valid : event.enrolled} ${verb}, ` +
+            `${event.invalid} invalid, ${event.failed} failed, ${event.unknown} unknown (${event.elapsed}s)`;
+    }
+
+    function handleBulkEvent(event) {
+        if (event.type === 'row' || event.type === 'error') {
+            showBulkRow(event);
+        } else {
+            showBulkProgress(event);
+        }
+    }
+
+    importBtn.addEventListener('click', async function () {
+        const file = fileInput.files[0];
+        if (!file) return;
+
+        importBtn.disabled = true;
+        fileInput.disabled = true;
+        document.getElementById('bulk_import_rows').replaceChildren();
+        document.getElementById('tbl_bulk_import').classList.add('d-none');
+        document.getElementById('bulk_import_progress').style.width = '0%';
+        document.getElementById('bulk_import_summary').textContent = 'Uploading...';
+        // Data rows, for the progress bar only (the header and blank lines are not rows).
+        totalRows = Math.max((await file.text()).split(/\r?\n/).filter(line => line.trim()).length - 1, 0);
+
+        const form = new FormData();
+        form.append('file', file);
+        if (document.getElementById('chk_bulk_dry_run').checked) form.append('dry_run', '1');
+
+        let enrolled = false;
+        try {
+            const response = await fetch('/api/administrators/import', { method: 'POST', body: form });
+            if (!response.ok) {
+                const result = await response.json().catch(() => ({}));
+                throw new Error(result.message || `HTTP error! status: ${response.status}`);
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+                const lines = buffered.split('\n');
+                buffered = lines.pop();
+                lines.filter(line => line.trim()).forEach(function (line) {
+                    const event = JSON.parse(line);
+                    if (event.type === 'summary' && event.enrolled > 0) enrolled = true;
+                    handleBulkEvent(event);
+                });
+                if (done) break;
+            }
+        } catch (error) {
+            console.error('Bulk import error:', error);
+            document.getElementById('bulk_import_summary').textContent = `Import failed: ${error.message}`;
+        } finally {
+            importBtn.disabled = false;
+            fileInput.disabled = false;
+            if (enrolled) loadAdmins();
+        }
+    });
+});
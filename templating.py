@@ -0,0 +1,113 @@
+import os
+import time
+
+from flask import Flask, Response, current_app, render_template, stream_with_context
+from jinja2 import FileSystemBytecodeCache
+
+import metrics
+import timing
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+# Jinja bytecode cache and streamed rendering of the grid pages.
+#
+# Compiled templates are written to JINJA_CACHE_DIR, so a new worker loads bytecode
+# instead of parsing users.html and home.html again. The Dockerfile fills it when the
+# image is built (python templating.py). Jinja checks each entry against the template
+# source, so an edited template is simply recompiled.
+#
+# stream_page() sends a page in chunks as it renders: the browser gets <head> and the
+# navbar, and starts fetching the bundles, while the grid rows are still being rendered.
+# The status and headers are sent before rendering, so an error part way through can
+# only be logged and ends the page early. For the same reason the render time is not in
+# the Server-Timing header (see timing.py); it goes to the template render histogram when
+# the page is done.
+#
+# Configuration (environment):
+#   JINJA_CACHE_DIR     bytecode directory, "" to disable (default .jinja_cache next to this file)
+#   STREAM_TEMPLATES    "0" to render the grid pages in one piece (default on)
+#   STREAM_CHUNK_SIZE   characters collected before a chunk is sent (default 8192)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.getenv('JINJA_CACHE_DIR', os.path.join(APP_DIR, ".jinja_cache"))
+STREAM_TEMPLATES = os.getenv('STREAM_TEMPLATES', '1') != '0'
+CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 8192))
+
+
+def _chunks(template_name, events):
+    buffered = []
+    size = 0
+    # Only the time spent rendering, not the time waiting on the client between chunks.
+    rendered = 0.0
+    started = time.perf_counter()
+    try:
+        for event in events:
+            buffered.append(event)
+            size += len(event)
+            if size >= CHUNK_SIZE:
+                rendered += time.perf_counter() - started
+                started = None
+                yield "".join(buffered)
+                started = time.perf_counter()
+                buffered = []
+                size = 0
+        if buffered:
+            rendered += time.perf_counter() - started
+            started = None
+            yield "".join(buffered)
+    except Exception:
+        logger.exception("Error while streaming template", extra={"template": template_name})
+    finally:
+        if started is not None:
+            rendered += time.perf_counter() - started
+        metrics.observe_render(template_name, rendered)
+
+
+def stream_page(template_name, **context):
+    if not STREAM_TEMPLATES:
+        started = time.perf_counter()
+        page = render_template(template_name, **context)
+        metrics.observe_render(template_name, time.perf_counter() - started)
+        return page
+
+    app = current_app._get_current_object()
+    template = app.jinja_env.get_or_select_template(template_name)
+    app.update_template_context(context)
+    timing.streamed("render")
+    return Response(stream_with_context(_chunks(template_name, template.generate(context))),
+                    mimetype="text/html")
+
+
+def init_app(app):
+    if not CACHE_DIR:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    except OSError:
+        pass
+    # Jinja fails the render when it cannot write a cache entry, so only use a writable one.
+    if not os.access(CACHE_DIR, os.W_OK):
+        logger.warning("Jinja bytecode cache directory is not writable, not caching",
+                       extra={"cache_dir": CACHE_DIR})
+        return
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(CACHE_DIR)
+
+
+def precompile(app):
+    compiled = 0
+    for name in app.jinja_env.list_templates(extensions=["html"]):
+        app.jinja_env.get_template(name)
+        compiled += 1
+    return compiled
+
+
+if __name__ == "__main__":
+    # Same template folder and Jinja options as app.py, without importing the app and its
+    # upstream clients.
+    build_app = Flask("app", root_path=APP_DIR)
+    init_app(build_app)
+    if build_app.jinja_env.bytecode_cache is None:
+        raise SystemExit("JINJA_CACHE_DIR is disabled or not writable")
+    print(f"Compiled {precompile(build_app)} templates into {CACHE_DIR}")
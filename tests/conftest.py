@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+
+# The application modules live at the repository root rather than in a package.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# functions.py resolves its API key and builds its upstream clients on import: use the
+# bench Secret Manager stand-in, and point the clients at a port nothing listens on so a
+# test that forgets to stub a call fails fast instead of reaching a real service.
+os.environ.setdefault("SECRETS_CACHE_DIR", "")
+os.environ.setdefault("EP_PROJECT_ID", "test-project")
+os.environ.setdefault("secret_id", "test-secret")
+os.environ.setdefault("CONTROL_CENTER_DOMAIN", "http://127.0.0.1:9/control_center")
+os.environ.setdefault("AUDIT_LOG_URL", "http://127.0.0.1:9/job_logs")
+os.environ.setdefault("AUDIT_SPILL_PATH", os.path.join(tempfile.mkdtemp(), "audit_spill.jsonl"))
+
+from bench.fake_services import install_fake_secrets  # noqa: E402
+
+install_fake_secrets()
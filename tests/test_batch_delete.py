@@ -0,0 +1,147 @@
+import time
+
+import pytest
+
+import auth
+import fanout
+import functions
+from bench.fake_services import BENCH_USER, login_cookie
+
+
+@pytest.fixture
+def audit(monkeypatch):
+    records = []
+    monkeypatch.setattr(functions, "log_api_activity",
+                        lambda start, title, status, error, remarks: records.append((title, status, remarks)))
+    return records
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    # app_id/user_id -> what the fake upstream delete answers; "slow" misses the deadline
+    # and "raise" fails the call.
+    answers = {}
+
+    def delete(item_id, *args):
+        answer = answers[item_id]
+        if answer == "slow":
+            time.sleep(0.3)
+            return {"status": "success"}
+        if answer == "raise":
+            raise ConnectionError("control_center unreachable")
+        return answer
+
+    monkeypatch.setattr(functions, "_delete_app_upstream", delete)
+    monkeypatch.setattr(functions, "_delete_admin_upstream", delete)
+    monkeypatch.setattr(fanout, "FANOUT_DEADLINE", 0.1)
+    return answers
+
+
+def outcomes(result, id_key):
+    return {item[id_key]: item["status"] for item in result["results"]}
+
+
+def test_delete_outcome():
+    assert functions._delete_outcome({"status": "success", "message": "Deleted"}, "x") == ("deleted", "Deleted")
+    assert functions._delete_outcome({"status": "error", "message": "In use"}, "x") == ("failed", "In use")
+    assert functions._delete_outcome({"status": "error"}, "fallback") == ("failed", "fallback")
+    assert functions._delete_outcome(None, "fallback") == ("failed", "fallback")
+
+
+def test_batch_summary_status():
+    def summary(*statuses):
+        return functions._batch_delete_summary([{"status": status} for status in statuses])
+
+    assert summary("deleted", "deleted")["status"] == "success"
+    assert summary("deleted", "failed")["status"] == "partial"
+    assert summary("failed", "unknown")["status"] == "partial"
+    assert summary("failed", "failed")["status"] == "error"
+    assert summary("deleted", "failed", "unknown") == {
+        "requested": 3, "deleted": 1, "failed": 1, "unknown": 1, "status": "partial"}
+
+
+def test_delete_applications_classifies_every_id(upstream, audit):
+    upstream.update({"1": {"status": "success"}, "2": {"status": "error", "message": "In use"},
+                     "3": "raise", "4": "slow"})
+
+    result = functions.delete_applications(["1", "2", "3", "4", "1"])
+
+    assert outcomes(result, "app_id") == {"1": "deleted", "2": "failed", "3": "failed", "4": "unknown"}
+    assert (result["requested"], result["status"]) == (4, "partial")
+    assert len(audit) == 1
+    title, status, remarks = audit[0]
+    assert status == "Failed"
+    assert "Deleted IDs: 1." in remarks
+    assert "2 (failed: In use)" in remarks
+    assert "4 (unknown: " in remarks
+
+
+def test_deleted_apps_are_patched_out_of_the_cache(upstream, audit):
+    functions.master_data_cache.set(functions.MASTER_DATA_KEY, [{"app_id": "1"}, {"app_id": "2"}])
+    upstream.update({"1": {"status": "success"}, "2": {"status": "error"}})
+
+    functions.delete_applications(["1", "2"])
+
+    assert functions.master_data_cache.peek(functions.MASTER_DATA_KEY) == [{"app_id": "2"}]
+
+
+def test_unknown_outcome_drops_the_cached_grid(upstream, audit):
+    functions.master_data_cache.set(functions.MASTER_DATA_KEY, [{"app_id": "1"}])
+    upstream.update({"1": "slow"})
+
+    result = functions.delete_applications(["1"])
+
+    assert result["status"] == "partial"
+    assert functions.master_data_cache.peek(functions.MASTER_DATA_KEY) is None
+
+
+def test_delete_administrators_invalidates_claims_once(upstream, audit):
+    upstream.update({"a": {"status": "success"}, "b": {"status": "success"}, "c": None})
+    generation = auth._generation["value"]
+
+    result = functions.delete_administrators(["a", "b", "c"], "Left the team", {"email": "boss@example.com"})
+
+    assert outcomes(result, "user_id") == {"a": "deleted", "b": "deleted", "c": "failed"}
+    assert auth._generation["value"] == generation + 1
+    assert len(audit) == 1
+    assert "by boss@example.com (Left the team): 2 deleted, 1 failed, 0 unknown" in audit[0][2]
+
+
+def test_failed_batch_keeps_claims(upstream, audit):
+    upstream.update({"a": {"status": "error", "message": "Not found"}})
+    generation = auth._generation["value"]
+
+    result = functions.delete_administrators(["a"], "reason", {"email": "boss@example.com"})
+
+    assert result["status"] == "error"
+    assert auth._generation["value"] == generation
+
+
+@pytest.fixture
+def client():
+    import app as app_module
+
+    def signed_in(role_type):
+        auth.cache_admin(BENCH_USER["email"], {"hcm_id": "100001", "role_type": role_type})
+        test_client = app_module.app.test_client()
+        test_client.set_cookie("session", login_cookie(app_module.app))
+        return test_client
+
+    yield signed_in
+    auth.invalidate_admin()
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/applications/delete", {"app_ids": ["1"]}),
+    ("/api/administrators/delete", {"user_ids": ["a"], "deletion_reason": "reason"}),
+])
+def test_batch_deletes_need_a_super_administrator(client, upstream, audit, path, body):
+    upstream.update({"1": {"status": "success"}, "a": {"status": "success"}})
+
+    response = client("Administrator").post(path, json=body)
+    assert response.status_code == 403
+    assert audit == []
+
+    response = client("Super Administrator").post(path, json=body)
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "success"
@@ -0,0 +1,163 @@
+import io
+import time
+from datetime import date
+
+import pytest
+from werkzeug.exceptions import RequestEntityTooLarge
+
+import bulk_import
+
+HEADER = "hcm_id,full_name,email,sbu,job_position,ticket_number,role_type,access_start_date,access_end_date\n"
+
+
+def row(hcm_id, **fields):
+    values = {"hcm_id": hcm_id, "full_name": "Ana Reyes", "email": "ana@example.com", "sbu": "IT",
+              "job_position": "Analyst", "ticket_number": "123", "role_type": "Administrator",
+              "access_start_date": "2026-01-01", "access_end_date": "2099-01-01"}
+    values.update(fields)
+    return values
+
+
+def rows(*items):
+    return ((line, item) for line, item in enumerate(items, 2))
+
+
+def run(items, enroll=None, enrolled=(), dry_run=False):
+    enroll = enroll or (lambda item: {"status": "success", "message": "Enrolled"})
+    return list(bulk_import.run_import(rows(*items), enroll, lambda hcm_id: hcm_id in enrolled,
+                                       dry_run=dry_run))
+
+
+def statuses(events):
+    return {event["hcm_id"]: event["status"] for event in events if event["type"] == "row"}
+
+
+def test_read_rows_maps_headers_and_skips_blank_lines():
+    data = ("\ufeffHCM ID,Full Name,Email Address,Role\n"
+            "100001, Ana Reyes ,ana@example.com,Administrator\n"
+            ",,,\n"
+            "\n"
+            "100002,Ben Cruz,ben@example.com,Super Administrator\n").encode("utf-8")
+
+    result = list(bulk_import.read_rows(io.BytesIO(data)))
+
+    assert [line for line, _ in result] == [2, 5]
+    assert result[0][1] == {"hcm_id": "100001", "full_name": "Ana Reyes", "email": "ana@example.com",
+                            "role_type": "Administrator"}
+
+
+def test_validate_reports_every_problem():
+    errors = bulk_import.validate(row("1", role_type="Owner", ticket_number="T-1", email="ana",
+                                      access_start_date="2026-02-01", access_end_date="2026-01-01"),
+                                  today=date(2025, 1, 1))
+
+    assert errors == ["role_type must be one of: Administrator, Super Administrator",
+                      "ticket_number must contain only digits",
+                      "email is not a valid email address",
+                      "access_end_date is before access_start_date"]
+    expired = row("1", sbu="", access_start_date="2019-01-01", access_end_date="2020-01-01")
+    assert bulk_import.validate(expired, today=date(2025, 1, 1)) == [
+        "sbu is required", "access_end_date is already past"]
+    assert bulk_import.validate(row("1", access_end_date="01/01/2099")) == [
+        "access_end_date must be a YYYY-MM-DD date"]
+
+
+def test_duplicates_and_existing_administrators_are_invalid():
+    events = run([row("1"), row("2"), row("1"), row("3", role_type="Owner")], enrolled={"2"})
+
+    assert [(event["line"], event["status"]) for event in events if event["type"] == "row"] == [
+        (3, "invalid"), (4, "invalid"), (5, "invalid"), (2, "enrolled")]
+    messages = [event["message"] for event in events if event["type"] == "row"]
+    assert messages[0] == "already an administrator"
+    assert messages[1] == "duplicate of the HCM ID on line 2"
+    summary = events[-1]
+    assert (summary["type"], summary["rows"], summary["valid"], summary["invalid"], summary["enrolled"]) == (
+        "summary", 4, 1, 3, 1)
+
+
+def test_dry_run_validates_without_enrolling():
+    calls = []
+    events = run([row("1"), row("2", email="")], enroll=calls.append, dry_run=True)
+
+    assert statuses(events) == {"1": "valid", "2": "invalid"}
+    assert calls == []
+    assert events[-1]["dry_run"] is True
+
+
+def test_enroll_outcomes_are_classified(monkeypatch):
+    monkeypatch.setattr(bulk_import, "CONCURRENCY", 4)
+
+    def enroll(item):
+        return {"1": {"status": "success"},
+                "2": {"status": "error", "message": "Please input a VALID HCM ID..."},
+                "3": False,
+                "4": None}[item["hcm_id"]]
+
+    events = run([row("1"), row("2"), row("3"), row("4")], enroll=enroll)
+
+    assert statuses(events) == {"1": "enrolled", "2": "failed", "3": "failed", "4": "unknown"}
+    assert [event["message"] for event in events if event.get("hcm_id") == "2"] == [
+        "Please input a VALID HCM ID..."]
+    summary = events[-1]
+    assert (summary["enrolled"], summary["failed"], summary["unknown"]) == (1, 2, 1)
+
+
+def test_rows_past_the_deadline_are_unknown(monkeypatch):
+    monkeypatch.setattr(bulk_import, "DEADLINE", 0.05)
+
+    def enroll(item):
+        if item["hcm_id"] == "2":
+            time.sleep(0.3)
+        return {"status": "success"}
+
+    events = run([row("1"), row("2")], enroll=enroll)
+
+    assert statuses(events) == {"1": "enrolled", "2": "unknown"}
+    assert events[-1]["unknown"] == 1
+
+
+def test_rows_are_sent_in_batches_with_progress(monkeypatch):
+    monkeypatch.setattr(bulk_import, "CONCURRENCY", 2)
+
+    events = run([row(str(hcm_id)) for hcm_id in range(1, 6)])
+
+    assert [event["type"] for event in events] == [
+        "row", "row", "progress", "row", "row", "progress", "row", "summary"]
+    assert events[-1]["enrolled"] == 5
+
+
+def test_rows_past_max_rows_are_rejected(monkeypatch):
+    monkeypatch.setattr(bulk_import, "MAX_ROWS", 2)
+    calls = []
+
+    events = run([row("1"), row("2"), row("3")], enroll=lambda item: calls.append(item) or {"status": "success"})
+
+    assert {"type": "error", "line": 4, "message": "Only the first 2 rows of a file are imported"} in events
+    assert len(calls) == 2
+    assert events[-1]["rows"] == 2
+
+
+def test_unreadable_file_keeps_the_rows_read_before_it(monkeypatch):
+    monkeypatch.setattr(bulk_import, "CONCURRENCY", 1)
+    data = (HEADER + ",".join(row("1").values()) + "\n").encode("utf-8") + b"\xff\xfe broken\n"
+
+    events = list(bulk_import.run_import(bulk_import.read_rows(io.BytesIO(data)),
+                                         lambda item: {"status": "success"}, lambda hcm_id: False))
+
+    assert statuses(events) == {"1": "enrolled"}
+    assert events[-2]["type"] == "error"
+    assert events[-2]["message"].startswith("Could not read the rest of the file")
+
+
+def test_spool_copies_the_upload_up_to_max_bytes(monkeypatch):
+    monkeypatch.setattr(bulk_import, "MAX_BYTES", 100)
+
+    spooled = bulk_import.spool(io.BytesIO(b"x" * 100))
+    assert spooled.read() == b"x" * 100
+
+    with pytest.raises(RequestEntityTooLarge):
+        bulk_import.spool(io.BytesIO(b"x" * 101))
+
+
+def test_ndjson_writes_one_event_per_line():
+    assert "".join(bulk_import.ndjson([{"a": 1}, {"b": "c"}])) == '{"a":1}\n{"b":"c"}\n'
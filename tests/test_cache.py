@@ -0,0 +1,127 @@
+import time
+
+from cache import StaleWhileRevalidateCache
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_fresh_value_is_served_without_reloading():
+    cache = StaleWhileRevalidateCache("test_fresh", ttl=60, stale_ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "v%d" % len(calls)
+
+    assert cache.get_or_load("k", loader) == "v1"
+    assert cache.get_or_load("k", loader) == "v1"
+    assert len(calls) == 1
+
+
+def test_failed_load_is_not_cached():
+    cache = StaleWhileRevalidateCache("test_failed", ttl=60, stale_ttl=60)
+    results = iter([None, "v"])
+
+    assert cache.get_or_load("k", lambda: next(results)) is None
+    assert cache.get_or_load("k", lambda: next(results)) == "v"
+
+
+def test_empty_list_is_cached():
+    cache = StaleWhileRevalidateCache("test_empty", ttl=60, stale_ttl=60)
+
+    assert cache.get_or_load("k", lambda: []) == []
+    assert cache.get_or_load("k", lambda: ["reloaded"]) == []
+
+
+def test_stale_value_is_served_while_one_refresh_runs():
+    cache = StaleWhileRevalidateCache("test_stale", ttl=0, stale_ttl=60)
+    cache.get_or_load("k", lambda: "old")
+
+    assert cache.get_or_load("k", lambda: "new") == "old"
+    assert wait_for(lambda: cache.peek("k") == "new")
+
+
+def test_load_started_before_a_write_does_not_overwrite_it():
+    cache = StaleWhileRevalidateCache("test_epoch_set", ttl=60, stale_ttl=60)
+
+    def loader():
+        cache.set("k", "written")
+        return "loaded"
+
+    assert cache.get_or_load("k", loader) == "loaded"
+    assert cache.peek("k") == "written"
+
+
+def test_load_started_before_an_invalidate_is_not_stored():
+    cache = StaleWhileRevalidateCache("test_epoch_invalidate", ttl=60, stale_ttl=60)
+
+    def loader():
+        cache.invalidate("k")
+        return "loaded"
+
+    assert cache.get_or_load("k", loader) == "loaded"
+    assert cache.peek("k") is None
+
+
+def test_update_patches_the_cached_value():
+    cache = StaleWhileRevalidateCache("test_update", ttl=60, stale_ttl=60)
+    cache.get_or_load("k", lambda: [1, 2])
+
+    assert cache.update("k", lambda rows: rows + [3])
+    assert cache.get_or_load("k", lambda: None) == [1, 2, 3]
+    assert not cache.update("missing", lambda rows: rows)
+
+
+def test_failed_load_falls_back_to_the_last_good_value():
+    cache = StaleWhileRevalidateCache("test_fallback", ttl=0, stale_ttl=0, fallback_ttl=60)
+    cache.get_or_load("k", lambda: "good")
+
+    assert cache.get_or_load("k", lambda: None) == "good"
+
+
+def test_fallback_expires():
+    cache = StaleWhileRevalidateCache("test_fallback_expiry", ttl=0, stale_ttl=0, fallback_ttl=0.01)
+    cache.get_or_load("k", lambda: "good")
+    time.sleep(0.02)
+
+    assert cache.get_or_load("k", lambda: None) is None
+
+
+def test_invalidate_drops_the_fallback_copy():
+    cache = StaleWhileRevalidateCache("test_fallback_invalidate", ttl=0, stale_ttl=0, fallback_ttl=60)
+    cache.get_or_load("k", lambda: "good")
+    cache.invalidate("k")
+
+    assert cache.get_or_load("k", lambda: None) is None
+
+
+def test_failure_is_remembered_for_failure_ttl():
+    cache = StaleWhileRevalidateCache("test_failure_ttl", ttl=60, stale_ttl=60, failure_ttl=60)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load("k", failing) is None
+    assert cache.get_or_load("k", failing) is None
+    assert len(calls) == 1
+
+    # A write clears the failure, so the next read loads again.
+    cache.invalidate("k")
+    assert cache.get_or_load("k", lambda: "v") == "v"
+
+
+def test_version_is_stable_for_equal_content():
+    cache = StaleWhileRevalidateCache("test_version", ttl=60, stale_ttl=60)
+    value = cache.get_or_load("k", lambda: {"rows": [1, 2]})
+
+    assert cache.version("k", value) == cache.version("k", {"rows": [1, 2]})
+    assert cache.version("k", value) != cache.version("k", {"rows": [2, 1]})
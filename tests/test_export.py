@@ -0,0 +1,74 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+import export
+
+COLUMNS = (("Name", lambda row: row.get("name")), ("Count", lambda row: row.get("count")))
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("=SUM(A1)", "'=SUM(A1)"),
+    ("@cmd", "'@cmd"),
+    ("\t=1", "'\t=1"),
+    ("\r=1", "'\r=1"),
+    ("+cmd|' /C calc'!A0", "'+cmd|' /C calc'!A0"),
+    ("-2+3", "'-2+3"),
+    ("-12.5", "-12.5"),
+    ("+63", "+63"),
+    ("-", "-"),
+    ("plain", "plain"),
+    (None, ""),
+    (True, "Yes"),
+    (7, 7),
+])
+def test_csv_cell_guards_formulas(value, expected):
+    assert export._csv_cell(value) == expected
+
+
+def test_csv_stream_has_bom_header_and_every_row(monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)
+    rows = [{"name": f"app {number}", "count": number} for number in range(5)]
+
+    chunks = list(export.csv_stream(COLUMNS, rows))
+
+    assert len(chunks) == 3
+    text = b"".join(chunks).decode("utf-8")
+    assert text.startswith("\ufeffName,Count\r\n")
+    assert list(csv.reader(io.StringIO(text[1:])))[1:] == [[f"app {number}", str(number)] for number in range(5)]
+
+
+def test_xlsx_row_writes_only_finite_numbers_as_numbers():
+    row = export._xlsx_row(2, [1, 2.5, float("nan"), float("inf"), True, "a\x00<b>"], "ABCDEF")
+
+    assert '<c r="A2"><v>1</v></c>' in row
+    assert '<c r="B2"><v>2.5</v></c>' in row
+    assert '<c r="C2" t="inlineStr"><is><t xml:space="preserve">nan</t></is></c>' in row
+    assert '<c r="D2" t="inlineStr"><is><t xml:space="preserve">inf</t></is></c>' in row
+    assert '<t xml:space="preserve">True</t>' in row
+    assert '<t xml:space="preserve">a&lt;b&gt;</t>' in row
+
+
+def test_multiline_cells_wrap():
+    assert ' s="2"' in export._xlsx_row(2, ["one\ntwo"], "A")
+
+
+def test_xlsx_stream_is_a_readable_workbook(monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)
+    rows = [{"name": f"=app {number}", "count": number} for number in range(5)]
+
+    data = b"".join(export.xlsx_stream(COLUMNS, rows, sheet_name="Applications & more"))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+        assert workbook.testzip() is None
+        assert "Applications &amp; more" in workbook.read("xl/workbook.xml").decode("utf-8")
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert sheet.count("<row ") == 6
+    assert '<t xml:space="preserve">=app 4</t>' in sheet
+
+
+def test_column_letters():
+    assert [export._column_letter(index) for index in (0, 25, 26, 51, 52, 701, 702)] == [
+        "A", "Z", "AA", "AZ", "BA", "ZZ", "AAA"]
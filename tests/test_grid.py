@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import grid
+
+
+def apps():
+    return [
+        {"app_id": 1, "app_name": "beta", "app_owner": "Ana", "status": True, "module_count": 10,
+         "date_created": "2024-03-01T10:00:00Z"},
+        {"app_id": 2, "app_name": "Alpha", "app_owner": "Ben", "status": False, "module_count": 9,
+         "date_created": "02/15/2024"},
+        {"app_id": 3, "app_name": "gamma", "app_owner": "ana", "status": "true", "module_count": None,
+         "date_created": "not a date"},
+        {"app_id": 4, "app_name": "Delta", "app_owner": "Cy", "status": "inactive", "module_count": 2,
+         "date_created": "Fri, 05 Jan 2024 08:00:00 GMT"},
+    ]
+
+
+def ids(rows):
+    return [row["app_id"] for row in rows]
+
+
+def test_sorts_text_case_insensitively():
+    assert ids(grid.select_apps(apps(), {"sort": "name"})) == [2, 1, 4, 3]
+    assert ids(grid.select_apps(apps(), {"sort": "name", "order": "desc"})) == [3, 4, 1, 2]
+
+
+def test_sorts_numbers_numerically_with_missing_values_last():
+    assert ids(grid.select_apps(apps(), {"sort": "modules"})) == [4, 2, 1, 3]
+
+
+def test_sorts_dates_by_parsed_date_with_unparsed_text_after():
+    assert ids(grid.select_apps(apps(), {"sort": "created"})) == [4, 2, 1, 3]
+
+
+def test_unknown_sort_column_keeps_upstream_order():
+    rows = apps()
+    assert ids(grid.select_apps(rows, {"sort": "permissions"})) == [1, 2, 3, 4]
+    assert ids(grid.select_apps(rows, {"sort": "__class__"})) == [1, 2, 3, 4]
+
+
+def test_mixed_and_nested_values_sort_without_error():
+    rows = [{"modules": [1]}, {"modules": {"a": 1}}, {"modules": "x"}, {"modules": 3}, {}]
+    columns = {"modules": "modules"}
+
+    result = grid.select_rows(rows, sort="modules", columns=columns)
+
+    assert [row.get("modules") for row in result] == [3, "x", [1], {"a": 1}, None]
+
+
+def test_search_and_status_filter():
+    assert ids(grid.select_apps(apps(), {"q": "ANA"})) == [1, 3]
+    assert ids(grid.select_apps(apps(), {"status": "active"})) == [1, 3]
+    assert ids(grid.select_apps(apps(), {"status": "false"})) == [2, 4]
+
+
+def test_paging_clamps_page_and_limit():
+    page = grid.query_apps(apps(), {"page": "9", "limit": "3"})
+    assert (page["page"], page["pages"], page["total"]) == (2, 2, 4)
+    assert ids(page["items"]) == [4]
+
+    page = grid.query_apps(apps(), {"limit": "100000"})
+    assert page["limit"] == grid.MAX_LIMIT
+
+    page = grid.query_apps(apps(), {"page": "x", "limit": "0"})
+    assert (page["page"], page["limit"]) == (1, 1)
+
+
+def test_parse_date_formats():
+    assert grid.parse_date("2024-03-01T10:00:00+02:00") == datetime(2024, 3, 1, 8, 0)
+    assert grid.parse_date("03/01/2024") == datetime(2024, 3, 1)
+    assert grid.parse_date("01-Mar-2024") == datetime(2024, 3, 1)
+    assert grid.parse_date("") is None
+    assert grid.parse_date("soon") is None
+
+
+def admins():
+    return [
+        {"id": "a", "HCM ID": "100001", "Full Name": "Ana Reyes", "Email Address": "ana@example.com",
+         "SBU": "Finance", "Role Type": "Administrator", "Access End Date": "2026-01-01"},
+        {"id": "b", "HCM ID": "100002", "Full Name": "Ben Cruz", "Email Address": "ben@example.com",
+         "SBU": "IT", "Role Type": "Super Administrator", "Access End Date": "2025-06-30"},
+        {"id": "c", "HCM ID": "100003", "Full Name": "Cy Lim", "Email Address": "cy@example.com",
+         "SBU": "it", "Role Type": "Administrator", "Access End Date": None},
+        "not a row",
+    ]
+
+
+def test_admin_index_lookups():
+    index = grid.AdminIndex(admins())
+
+    assert len(index.rows) == 3
+    assert [row["id"] for row in index.search(hcm_id=" 100002 ")] == ["b"]
+    assert [row["id"] for row in index.search(sbu="IT")] == ["b", "c"]
+    assert [row["id"] for row in index.search(sbu="it", role="administrator")] == ["c"]
+    assert [row["id"] for row in index.search(q="REYES")] == ["a"]
+    assert index.sbus == ["Finance", "IT", "it"]
+
+
+def test_query_admins_sorts_and_pages():
+    index = grid.AdminIndex(admins())
+
+    result = grid.query_admins(index, {"sort": "end", "order": "asc"})
+    assert [row["id"] for row in result["items"]] == ["b", "a", "c"]
+    assert result["count"] == 3
+
+    result = grid.query_admins(index, {"sort": "name", "limit": "2", "page": "2"})
+    assert [row["id"] for row in result["items"]] == ["c"]
+    assert (result["sort"], result["pages"]) == ("name", 2)
@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+
+import pytest
+
+import upstream
+from singleflight import SingleFlight
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def run_concurrently(group, key, fn, callers):
+    # Starts `callers` threads calling group.do(key, fn). Returns the threads and the
+    # list each one writes its result (or exception) to.
+    outcomes = [None] * callers
+
+    def call(position):
+        try:
+            outcomes[position] = group.do(key, fn)
+        except Exception as e:
+            outcomes[position] = e
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight("test_share")
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(2)
+        return "result"
+
+    threads, outcomes = run_concurrently(group, "k", fn, 5)
+    assert wait_for(lambda: group.shared == 4)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert sorted(outcomes, key=lambda outcome: outcome[1]) == [("result", False)] + [("result", True)] * 4
+    assert group.stats() == {"calls": 1, "shared": 4, "in_flight": 0}
+
+
+def test_error_is_raised_to_every_caller():
+    group = SingleFlight("test_error")
+    release = threading.Event()
+
+    def fn():
+        release.wait(2)
+        raise ValueError("upstream down")
+
+    threads, outcomes = run_concurrently(group, "k", fn, 3)
+    assert wait_for(lambda: group.shared == 2)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert group.stats()["in_flight"] == 0
+
+
+def test_different_keys_do_not_share():
+    group = SingleFlight("test_keys")
+
+    assert group.do("a", lambda: 1) == (1, False)
+    assert group.do("b", lambda: 2) == (2, False)
+    assert group.stats()["shared"] == 0
+
+
+def test_result_is_not_kept_after_the_call():
+    group = SingleFlight("test_not_cached")
+    results = iter(["first", "second"])
+
+    assert group.do("k", lambda: next(results)) == ("first", False)
+    assert group.do("k", lambda: next(results)) == ("second", False)
+
+
+def test_failed_call_does_not_block_the_next_one():
+    group = SingleFlight("test_after_error")
+
+    with pytest.raises(RuntimeError):
+        group.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert group.do("k", lambda: "ok") == ("ok", False)
+
+
+class Session:
+
+    def __init__(self, release):
+        self.release = release
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs.get("json")))
+        self.release.wait(2)
+        response = type("Response", (), {})()
+        response.status_code = 200
+        return response
+
+
+def test_client_read_coalesces_identical_requests_only():
+    release = threading.Event()
+    session = Session(release)
+    client = upstream.UpstreamClient("test_read", "http://upstream.invalid")
+    client._session = session
+    client._pid = os.getpid()
+
+    threads = [threading.Thread(target=client.read, args=("POST", "ep"), kwargs={"json": {"a": 1}})
+               for _ in range(3)]
+    threads.append(threading.Thread(target=client.read, args=("POST", "ep"), kwargs={"json": {"a": 2}}))
+    for thread in threads:
+        thread.start()
+    assert wait_for(lambda: client._flight.shared == 2 and len(session.calls) == 2)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert sorted(call[2]["a"] for call in session.calls) == [1, 2]
@@ -0,0 +1,187 @@
+import os
+
+import pytest
+import requests
+
+import upstream
+from upstream import CircuitBreaker, CircuitOpenError, HeaderAuth, UpstreamClient
+
+
+class Response:
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = ""
+
+
+class Session:
+    # Stands in for requests.Session: answers from `outcomes` in order (a status code or
+    # an exception instance to raise) and remembers what it was called with.
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return Response(outcome)
+
+
+def client_with(session, **kwargs):
+    client = UpstreamClient("test", "http://upstream.invalid/api", **kwargs)
+    client._session = session
+    client._pid = os.getpid()
+    return client
+
+
+class Aborted(BaseException):
+    # Like gevent.Timeout or GreenletExit: not an Exception subclass.
+    pass
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    breaker = CircuitBreaker("test", "ep", failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("test", "ep", failure_threshold=2, reset_timeout=60)
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker("test", "ep", failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker("test", "ep", failure_threshold=5, reset_timeout=0)
+    open_breaker(breaker)
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_zero_threshold_disables_the_breaker():
+    breaker = CircuitBreaker("test", "ep", failure_threshold=0, reset_timeout=60)
+    for _ in range(10):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_aborted_probe_releases_the_half_open_slot():
+    client = client_with(Session(Aborted(), 200))
+    breaker = client.breaker_for("ep")
+    breaker.failure_threshold, breaker.reset_timeout = 1, 0
+    open_breaker(breaker)
+
+    with pytest.raises(Aborted):
+        client.get("ep")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker._probing
+
+    assert client.get("ep").status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_server_errors_count_as_failures_and_client_errors_do_not():
+    client = client_with(Session(500, 404, 502))
+    breaker = client.breaker_for("ep")
+
+    client.get("ep")
+    client.get("ep")
+    assert breaker.failures == 0
+    client.get("ep")
+    assert breaker.failures == 1
+
+
+def test_open_circuit_does_not_call_the_endpoint():
+    session = Session(requests.exceptions.ConnectionError("down"))
+    client = client_with(session)
+    breaker = client.breaker_for("ep")
+    breaker.failure_threshold, breaker.reset_timeout = 1, 60
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("ep")
+    with pytest.raises(CircuitOpenError):
+        client.get("ep")
+    assert len(session.calls) == 1
+
+
+def test_secret_failure_is_not_counted_against_the_endpoint():
+    def missing_secret():
+        raise TypeError("secret id is not set")
+
+    session = Session()
+    client = client_with(session, auth=HeaderAuth("X-API-KEY", missing_secret))
+    breaker = client.breaker_for("ep")
+    breaker.failure_threshold = 1
+
+    with pytest.raises(TypeError):
+        client.get("ep")
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert session.calls == []
+
+
+def test_auth_header_is_resolved_per_request():
+    keys = iter(["first", "rotated"])
+    session = Session(200, 200)
+    client = client_with(session, auth=HeaderAuth("X-API-KEY", lambda: next(keys)))
+
+    client.get("ep")
+    client.get("ep")
+
+    headers = []
+    for _, _, kwargs in session.calls:
+        prepared = requests.Request("GET", "http://upstream.invalid/").prepare()
+        headers.append(kwargs["auth"](prepared).headers["X-API-KEY"])
+    assert headers == ["first", "rotated"]
+
+
+def test_timeouts_and_urls():
+    client = client_with(Session(200))
+    client.get("/ep/")
+
+    method, url, kwargs = client._session.calls[0]
+    assert (method, url) == ("GET", "http://upstream.invalid/api/ep")
+    assert kwargs["timeout"] == upstream.DEFAULT_TIMEOUT
+    assert upstream._parse_timeout("3:10", (5, 60)) == (3.0, 10.0)
+    assert upstream._parse_timeout("7", (5, 60)) == (5, 7.0)
+    assert upstream._parse_timeout("x", (5, 60)) == (5, 60)
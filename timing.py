@@ -0,0 +1,109 @@
+import functools
+import os
+import threading
+import time
+
+from flask import before_render_template, g, has_app_context, template_rendered
+
+from logs import get_logger
+
+logger = get_logger(__name__)
+
+
+# Per-request latency breakdown sent back as a Server-Timing header.
+#
+# Components: upstream-<endpoint> (time spent waiting on each upstream endpoint),
+# audit (queueing audit records), auth (session/admin guard), render (Jinja) and
+# total. Concurrent upstream calls each count their own time, so components can
+# add up to more than total.
+#
+# A streamed page (templating.stream_page) is rendered after the headers are sent, so
+# its render time cannot be in the header: it is listed as render;desc="streamed", and
+# total stops before rendering. The time is in the control_center_template_render_seconds
+# metric instead.
+#
+# Configuration (environment):
+#   SERVER_TIMING      "0" to stop sending the header (default on)
+#   SERVER_TIMING_LOG  "1" to also log one record per request with the breakdown
+
+_lock = threading.Lock()
+
+
+def record(component, elapsed):
+    if not has_app_context():
+        return
+    timings = g.get("server_timing")
+    if timings is None:
+        return
+    with _lock:
+        timings[component] = timings.get(component, 0.0) + elapsed
+
+
+def timed(component):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(component, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def streamed(component):
+    # Named in the header without a duration: it runs after the headers are sent.
+    if has_app_context() and "server_timing" in g:
+        g.setdefault("server_timing_streamed", set()).add(component)
+
+
+def _start():
+    g.server_timing = {}
+    g.server_timing_started = time.perf_counter()
+
+
+def _template_started(sender, template, context, **extra):
+    if has_app_context() and "server_timing" in g:
+        g.server_timing_render_started = time.perf_counter()
+
+
+def _template_done(sender, template, context, **extra):
+    if has_app_context() and "server_timing" in g:
+        started = g.pop("server_timing_render_started", None)
+        if started is not None:
+            record("render", time.perf_counter() - started)
+
+
+def _header_value(timings, total, streamed=()):
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in sorted(timings.items())]
+    parts.extend(f'{name};desc="streamed"' for name in sorted(streamed))
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _finish(response):
+    timings = g.pop("server_timing", None)
+    started = g.pop("server_timing_started", None)
+    streamed = g.pop("server_timing_streamed", ())
+    if timings is None or started is None:
+        return response
+
+    total = time.perf_counter() - started
+    with _lock:
+        timings = dict(timings)
+    value = _header_value(timings, total, streamed)
+
+    if os.getenv('SERVER_TIMING', '1') != '0':
+        response.headers['Server-Timing'] = value
+    if os.getenv('SERVER_TIMING_LOG') == '1':
+        logger.info("server-timing", extra={
+            "status_code": response.status_code, "server_timing": value})
+    return response
+
+
+def init_app(app):
+    app.before_request(_start)
+    app.after_request(_finish)
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_done, app)
@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+
+from cache import digest
+from metrics import observe_circuit_rejected, observe_coalesced, observe_upstream, set_circuit_state
+from singleflight import SingleFlight
+from timing import record
+
+
+# Shared, pooled HTTP client for the control_center API and the job-logs service.
+# One client per base URL per process keeps TCP/TLS connections alive between calls
+# instead of paying a fresh handshake on every wrapper in functions.py.
+#
+# Configuration (environment):
+#   UPSTREAM_POOL_SIZE        connections kept alive per upstream host (default 10)
+#   UPSTREAM_POOL_BLOCK       "1" to wait for a free connection instead of opening extra ones
+#   UPSTREAM_CONNECT_TIMEOUT  default connect timeout in seconds (default 5)
+#   UPSTREAM_READ_TIMEOUT     default read timeout in seconds (default 60)
+#   UPSTREAM_TIMEOUTS         per-endpoint overrides, e.g. "admin=3:10,get_app_master_data=3:30"
+#   UPSTREAM_POOL_SIZES       per-host pool overrides keyed by client name, e.g. "control_center=20,job_logs=4"
+#   UPSTREAM_BREAKER_FAILURES consecutive failures (errors, timeouts, 5xx) that open an endpoint's
+#                             circuit, 0 to disable (default 5)
+#   UPSTREAM_BREAKER_RESET    seconds an open circuit fails fast before one probe call is let
+#                             through (default 30)
+#   UPSTREAM_SINGLEFLIGHT     "0" to stop coalescing identical concurrent reads
+#
+# Each endpoint of each client has its own circuit breaker, per worker process. While it is
+# open, calls raise CircuitOpenError immediately instead of tying up the worker until the
+# timeout; after UPSTREAM_BREAKER_RESET one call probes the endpoint (half-open) and its
+# result closes or re-opens the circuit.
+#
+# read() is request() for calls without side effects: concurrent reads of the same
+# endpoint with the same params/JSON body share one upstream call and its response.
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return int(default)
+
+
+def _parse_mapping(raw):
+    mapping = {}
+    for item in (raw or '').split(','):
+        if '=' not in item:
+            continue
+        name, value = item.split('=', 1)
+        mapping[name.strip().strip('/')] = value.strip()
+    return mapping
+
+
+def _parse_timeout(value, default):
+    try:
+        if ':' in value:
+            connect, read = value.split(':', 1)
+            return (float(connect), float(read))
+        return (default[0], float(value))
+    except ValueError:
+        return default
+
+
+DEFAULT_TIMEOUT = (_env_float('UPSTREAM_CONNECT_TIMEOUT', 5),
+                   _env_float('UPSTREAM_READ_TIMEOUT', 60))
+ENDPOINT_TIMEOUTS = {
+    endpoint: _parse_timeout(value, DEFAULT_TIMEOUT)
+    for endpoint, value in _parse_mapping(os.getenv('UPSTREAM_TIMEOUTS')).items()
+}
+POOL_SIZES = _parse_mapping(os.getenv('UPSTREAM_POOL_SIZES'))
+BREAKER_FAILURES = _env_int('UPSTREAM_BREAKER_FAILURES', 5)
+BREAKER_RESET = _env_float('UPSTREAM_BREAKER_RESET', 30)
+SINGLEFLIGHT = os.getenv('UPSTREAM_SINGLEFLIGHT', '1') != '0'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, upstream, endpoint, failure_threshold=BREAKER_FAILURES,
+                 reset_timeout=BREAKER_RESET):
+        self.upstream = upstream
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        self.state = state
+        set_circuit_state(self.upstream, self.endpoint, state)
+
+    def before_call(self):
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self._reject()
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                # Only one probe at a time; everyone else keeps failing fast meanwhile.
+                if self._probing:
+                    self._reject()
+                self._probing = True
+
+    def _reject(self):
+        observe_circuit_rejected(self.upstream, self.endpoint)
+        raise CircuitOpenError(f"Circuit open for {self.upstream} /{self.endpoint}")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (
+                    self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+class HeaderAuth(AuthBase):
+    # Sets a header from a callable on every request, so a rotated key is picked up
+    # without rebuilding the client. UpstreamClient calls resolve() before each request,
+    # outside the circuit breaker, so a secrets failure never counts against the endpoint.
+
+    def __init__(self, header, get_value):
+        self.header = header
+        self.get_value = get_value
+
+    def resolve(self):
+        value = self.get_value()
+        return HeaderAuth(self.header, lambda: value)
+
+    def __call__(self, request):
+        request.headers[self.header] = self.get_value()
+        return request
+
+
+class UpstreamClient:
+
+    def __init__(self, name, base_url, headers=None, pool_size=None, auth=None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.headers = dict(headers or {})
+        self.auth = auth
+        if pool_size is None:
+            pool_size = int(POOL_SIZES.get(
+                name, _env_int('UPSTREAM_POOL_SIZE', 10)))
+        self.pool_size = pool_size
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._flight = SingleFlight(f"upstream-{name}")
+
+    def _build_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=os.getenv('UPSTREAM_POOL_BLOCK') == '1')
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    @property
+    def session(self):
+        # Re-create the session after a fork so gunicorn workers never share sockets.
+        pid = os.getpid()
+        if self._session is None or self._pid != pid:
+            with self._lock:
+                if self._session is None or self._pid != pid:
+                    self._session = self._build_session()
+                    self._pid = pid
+        return self._session
+
+    def url_for(self, endpoint):
+        endpoint = endpoint.strip('/')
+        return f"{self.base_url}/{endpoint}" if endpoint else self.base_url
+
+    def timeout_for(self, endpoint):
+        return ENDPOINT_TIMEOUTS.get(endpoint.strip('/'), DEFAULT_TIMEOUT)
+
+    def breaker_for(self, endpoint):
+        endpoint = endpoint.strip('/')
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(endpoint, CircuitBreaker(self.name, endpoint))
+        return breaker
+
+    def request(self, method, endpoint, **kwargs):
+        kwargs.setdefault('timeout', self.timeout_for(endpoint))
+        if self.auth is not None and 'auth' not in kwargs:
+            resolve = getattr(self.auth, 'resolve', None)
+            kwargs['auth'] = resolve() if resolve else self.auth
+        breaker = self.breaker_for(endpoint)
+        breaker.before_call()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.url_for(endpoint), **kwargs)
+        except BaseException as e:
+            # BaseException too: a gevent.Timeout or GreenletExit that aborts a half-open
+            # probe must still release it, or the breaker would reject every call after.
+            elapsed = time.perf_counter() - started
+            breaker.record_failure()
+            observe_upstream(self.name, endpoint, elapsed, error=e)
+            record(f"upstream-{endpoint.strip('/') or self.name}", elapsed)
+            raise
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        observe_upstream(self.name, endpoint, elapsed,
+                         status=response.status_code)
+        record(f"upstream-{endpoint.strip('/') or self.name}", elapsed)
+        return response
+
+    def read(self, method, endpoint, **kwargs):
+        # The shared Response has its body loaded already, so every caller can read it.
+        if not SINGLEFLIGHT:
+            return self.request(method, endpoint, **kwargs)
+        key = (method, endpoint.strip('/'), digest(kwargs.get('params')), digest(kwargs.get('json')))
+        started = time.perf_counter()
+        response, shared = self._flight.do(key, lambda: self.request(method, endpoint, **kwargs))
+        if shared:
+            observe_coalesced(self.name, endpoint)
+            record(f"upstream-{endpoint.strip('/') or self.name}", time.perf_counter() - started)
+        return response
+
+    def get(self, endpoint, **kwargs):
+        return self.request('GET', endpoint, **kwargs)
+
+    def post(self, endpoint, **kwargs):
+        return self.request('POST', endpoint, **kwargs)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None